@@ -0,0 +1,266 @@
+"""
+	AssetManager.py
+	---------------
+
+	This file/module provides a class to load & share our images (and fonts) in one place.
+
+	Before this, every class loaded its own PNGs with pygame.image.load, so:
+		- the same file could be loaded more than once
+		- nothing was converted to the display's pixel format, so every blit had to convert on the fly
+
+	Now, images are loaded once, converted with convert_alpha() (or convert()) as soon as there's a display
+	to convert for, and handed out to whoever asks, by path or by a short name (see get()).
+
+	Decoding PNGs is the slow part of loading, so we can also do that on a background thread ahead of time
+	(see preload_async()). Converting still happens on the main thread, the first time an image is asked for.
+
+	Once an image is converted we let go of the surface it was loaded as, so we don't hold every image twice.
+	Images only read once (like level maps) can be let go of entirely with unload().
+"""
+
+# for normalizing paths & making names
+import os
+
+# for background loading
+import threading
+
+# pygame for images & etc
+import pygame
+
+# main asset manager class
+class AssetManager:
+
+	# images are named by their path relative to this folder, minus the extension
+	IMAGE_ROOT = './img'
+
+	# constructor
+	def __init__(self):
+		"""Constructs an empty AssetManager
+		"""
+
+		# maps normalized path to the surface as it was loaded from disk, until it's converted
+		self._raw = {}
+
+		# maps (normalized path, alpha) to the surface converted for the display
+		self._converted = {}
+
+		# maps short name to normalized path, for get()
+		self._names = {}
+
+		# maps (normalized path, size) to a loaded font
+		self._fonts = {}
+
+		# paths currently being loaded on a background thread, mapped to an Event that's set when they're done
+		self._pending = {}
+
+		# guards _raw & _pending, since our background thread writes to them
+		self._lock = threading.Lock()
+
+
+	# turns a path into the key we store it under
+	@staticmethod
+	def _normalize(path):
+		return os.path.normpath(path)
+
+
+	# turns a path into a short name, like 'player/char_head'
+	@staticmethod
+	def _name_for(path):
+		relativePath = os.path.relpath(path, AssetManager._normalize(AssetManager.IMAGE_ROOT))
+		return os.path.splitext(relativePath)[0].replace(os.sep, '/')
+
+
+	# gets an image's surface straight from disk (or our raw cache)
+	def _load_raw(self, path):
+		"""Gets the unconverted surface for an image, loading it if it hasn't been yet.
+		   If it's currently being loaded on our background thread, waits for that instead of loading it twice.
+
+		Args:
+			path (str): normalized path of the image
+
+		Returns:
+			Surface: the image, as loaded from disk
+		"""
+
+		with self._lock:
+			raw = self._raw.get(path)
+			pending = self._pending.get(path)
+
+		# already have it
+		if raw is not None:
+			return raw
+
+		# being loaded in the background, wait for it
+		if pending is not None:
+			pending.wait()
+			with self._lock:
+				raw = self._raw.get(path)
+			if raw is not None:
+				return raw
+
+		# otherwise load it ourselves
+		raw = pygame.image.load(path)
+		with self._lock:
+			self._raw[path] = raw
+
+		return raw
+
+
+	# public method to get an image, ready for blitting
+	def load_image(self, path, alpha=True, convert=True):
+		"""Gets an image, loading it only the first time it's asked for.
+
+		Args:
+			path (str): path to the image
+			alpha (bool, optional): keep per-pixel alpha (convert_alpha) rather than not (convert). Defaults to True.
+			convert (bool, optional): set false to get the image exactly as loaded, for reading pixels from. Defaults to True.
+
+		Returns:
+			Surface: the image
+		"""
+
+		path = AssetManager._normalize(path)
+		self._names[AssetManager._name_for(path)] = path
+
+		# if we've already converted it, hand that out
+		converted = self._converted.get((path, alpha))
+		if converted is not None and convert is True:
+			return converted
+
+		# we can only convert once a display mode is set. If there isn't one yet, hand out the raw image
+		# (& don't remember it as converted, so we try again next time)
+		if convert is False or pygame.display.get_surface() is None:
+			return self._load_raw(path)
+
+		# we don't keep the raw image once it's converted, but we can convert from the alpha version just as well
+		# (not the other way round though, that one's lost its alpha)
+		source = self._converted.get((path, True)) if alpha is False else None
+		if source is None:
+			source = self._load_raw(path)
+
+		converted = source.convert_alpha() if alpha is True else source.convert()
+		self._converted[(path, alpha)] = converted
+
+		# done with the raw image now
+		with self._lock:
+			self._raw.pop(path, None)
+
+		return converted
+
+
+	# public method to forget an image
+	def unload(self, path):
+		"""Lets go of an image (raw & converted), for things that are only needed once, like level maps.
+		   It'll be loaded again from disk if it's asked for again
+
+		Args:
+			path (str): path to the image
+		"""
+
+		path = AssetManager._normalize(path)
+
+		with self._lock:
+			self._raw.pop(path, None)
+
+		self._converted.pop((path, True), None)
+		self._converted.pop((path, False), None)
+
+
+	# gets an image by it's short name
+	def get(self, name, alpha=True):
+		"""Gets an image by name, i.e. it's path relative to ./img without the extension (like 'player/char_head').
+
+		Args:
+			name (str): the image's name
+			alpha (bool, optional): keep per-pixel alpha. Defaults to True.
+
+		Returns:
+			Surface: the image
+		"""
+
+		# we know about names of images that were loaded or preloaded, but any image under ./img can be named
+		path = self._names.get(name) or os.path.join(AssetManager.IMAGE_ROOT, name + '.png')
+		return self.load_image(path, alpha)
+
+
+	# public method to get a font
+	def load_font(self, path, size):
+		"""Gets a font at a size, loading it only the first time it's asked for
+
+		Args:
+			path (str): path to the font file
+			size (int): font size
+
+		Returns:
+			Font: the pygame font
+		"""
+
+		key = (AssetManager._normalize(path), size)
+		font = self._fonts.get(key)
+		if font is None:
+
+			# inint font support (can be called more than once)
+			pygame.font.init()
+			font = pygame.font.Font(path, size)
+			self._fonts[key] = font
+
+		return font
+
+
+	# decodes a bunch of images on a background thread
+	def preload_async(self, paths):
+		"""Starts loading images from disk on a background thread, so they're ready by the time they're asked for
+
+		Args:
+			paths (List): paths of the images to load
+
+		Returns:
+			Thread: the thread doing the loading, already started
+		"""
+
+		# figure out which ones we don't have (raw or converted, since we drop raw once converted)
+		# & aren't already loading, & claim them
+		toLoad = []
+		with self._lock:
+			for path in paths:
+				path = AssetManager._normalize(path)
+				if path in self._raw or path in self._pending:
+					continue
+				if (path, True) in self._converted or (path, False) in self._converted:
+					continue
+
+				self._pending[path] = threading.Event()
+				toLoad.append(path)
+
+		thread = threading.Thread(target=self._preload, args=(toLoad,), daemon=True)
+		thread.start()
+
+		return thread
+
+
+	# the body of our background thread
+	def _preload(self, paths):
+		"""Loads images from disk, one at a time, letting anyone waiting on them know when each is done
+
+		Args:
+			paths (List): normalized paths to load
+		"""
+
+		for path in paths:
+			try:
+				raw = pygame.image.load(path)
+				with self._lock:
+					self._raw[path] = raw
+
+			# if it fails here, the main thread will try again (& get the error) when it's asked for
+			except Exception:
+				pass
+
+			finally:
+				with self._lock:
+					self._names[AssetManager._name_for(path)] = path
+					self._pending.pop(path).set()
+
+
+# one asset manager shared by everything, so assets are shared across scenes
+sharedAssetManager = AssetManager()
@@ -0,0 +1,284 @@
+"""
+	BatchRunner.py
+	--------------
+
+	This file/module runs lots of scripted, headless play sessions at once, one per CPU core, and adds up the results.
+
+	Each session is a HeadlessMazeGame on some level, driven by a seeded script (so the same level & seed always
+	plays out the same way), for up to some number of frames. While it runs we count:
+		- frames simulated
+		- wall collisions (Player's onHitWall)
+		- shots fired (Player's onFire)
+		- how long it took to reach the exit (the gap in the bottom wall), if it got there
+
+	Sessions are run in a process pool (so they really do run in parallel, rather than taking turns on the GIL),
+	and each session's metrics are sent back to the parent as soon as it's done, so big runs show progress
+	as they go. Sessions share nothing, so more cores means proportionally more sessions per second.
+
+	Usage, from the root of the repo (since our asset paths are relative):
+
+		python BatchRunner.py [--levels ./levels/level_01/map.png ...] [--seeds 8] [--frames 3600]
+							  [--script seek] [--workers N] [--output batch_results.json]
+"""
+
+# for our command line
+import argparse
+
+# our process pool
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# for writing results
+import json
+
+# for steering our scripted player
+import math
+
+# seeded scripted input
+import random
+
+# wall clock timing
+import time
+
+# tile ids & sizes
+from Map import Map
+
+# the levels we run by default, same as our benchmarks
+from Benchmarks import LEVELS
+
+# scripts our sessions can be driven by, see _make_script
+SCRIPTS = ["wander", "seek"]
+
+
+# builds the function that drives the player for a session
+def _make_script(name, seed, scene):
+	"""Makes a script(frameIndex, scene) function for HeadlessMazeGame.run
+
+		wander: walks forward, turning randomly now and then, & fires every few frames
+		seek: walks towards the exit along a flow field (see Pathfinding.py), with a little random wobble,
+			  & fires every few frames
+
+	Args:
+		name (str): one of SCRIPTS
+		seed (int): seed for the script's randomness
+		scene (GameScreen): the scene the script will drive
+
+	Returns:
+		function: the script
+	"""
+
+	rng = random.Random(seed)
+
+	if name == "wander":
+		def script(frameIndex, scene):
+			if rng.random() < 0.1:
+				scene.player.rotate(rng.choice([-1, 1]) * rng.randint(1, 18))
+			scene.player.move(1)
+			if frameIndex % 5 == 0:
+				scene.player.fire()
+
+		return script
+
+	# only needed for seeking
+	from Pathfinding import Pathfinder
+	pathfinder = Pathfinder(scene.map)
+	exitTile = _find_exit_tile(scene.map)
+
+	def script(frameIndex, scene):
+		player = scene.player
+
+		# find the next tile towards the exit, and face the middle of it
+		# (player.rot 0 faces up, & moving forward subtracts (sin, cos) of it from our position)
+		if exitTile is not None:
+			nextTile = pathfinder.next_step(Pathfinder.tile_at_pixel_pos(player.pos), exitTile)
+			if nextTile is not None:
+				target = Pathfinder.path_to_pixels([nextTile])[0]
+				player.rot = math.degrees(math.atan2(player.pos.x - target[0], player.pos.y - target[1])) + rng.uniform(-10, 10)
+
+		player.move(1)
+		if frameIndex % 5 == 0:
+			player.fire()
+
+	return script
+
+
+# finds the way out
+def _find_exit_tile(map):
+	"""Finds the exit, i.e. the first ground tile in the bottom row of the map
+
+	Args:
+		map (Map): the map to search
+
+	Returns:
+		Tuple|None: (x, y) tile of the exit, or None if there isn't one
+	"""
+
+	bottomRow = map.height_in_tiles - 1
+	for x in range(0, map.width_in_tiles):
+		if map.get_tile_at_map_pos((x, bottomRow)) == Map.GROUND:
+			return (x, bottomRow)
+
+	return None
+
+
+# runs one session, in a worker process
+def run_session(levelPath, seed, frames, scriptName="seek"):
+	"""Plays one scripted, headless session. Module level (rather than a method) so our process pool can pickle it
+
+	Args:
+		levelPath (str): level to play
+		seed (int): seed for the script, & the game screen's own randomness
+		frames (int): most frames to simulate, sessions end early if the player reaches the exit
+		scriptName (str, optional): one of SCRIPTS. Defaults to "seek".
+
+	Returns:
+		dict: the session's metrics
+	"""
+
+	# imported here, so the parent process never has to set up pygame
+	from HeadlessGame import HeadlessMazeGame
+
+	startTime = time.perf_counter()
+
+	game = HeadlessMazeGame(levelPath, seed=seed)
+	scene = game.scene
+	map = scene.map
+
+	# count things as they happen
+	counts = {"collisions": 0, "shots": 0}
+	def handle_hit_wall(player):
+		counts["collisions"] += 1
+	def handle_fire(player):
+		counts["shots"] += 1
+	scene.player.events.onHitWall.add_listener(handle_hit_wall)
+	scene.player.events.onFire.add_listener(handle_fire)
+
+	# once we're in the exit's row of tiles, we're out
+	exitY = (map.height_in_tiles - 1) * Map.TILE_SIZE
+	exitFrame = [None]
+	script = _make_script(scriptName, seed, scene)
+	def run_script(frameIndex, scene):
+		if scene.player.pos.y >= exitY:
+			exitFrame[0] = frameIndex
+			game.quit_game()
+			return
+		script(frameIndex, scene)
+
+	framesRun = game.run(frames, run_script)
+	game.close()
+
+	return {
+		"level": levelPath,
+		"seed": seed,
+		"script": scriptName,
+		"frames": framesRun,
+		"collisions": counts["collisions"],
+		"shots": counts["shots"],
+		"exited": exitFrame[0] is not None,
+		"time_to_exit_frames": exitFrame[0],
+		"time_to_exit_ms": (exitFrame[0] * 1000 / 60) if exitFrame[0] is not None else None,
+		"wall_time_s": time.perf_counter() - startTime,
+	}
+
+
+# main batch runner class
+class BatchRunner:
+
+	# constructor
+	def __init__(self, workers=None):
+		"""Constructs the batch runner
+
+		Args:
+			workers (int, optional): how many processes to run sessions in. Defaults to None, one per CPU core.
+		"""
+
+		self.workers = workers
+
+
+	# runs a bunch of sessions
+	def run(self, sessions, onResult=None):
+		"""Runs sessions in parallel, across our worker processes
+
+		Args:
+			sessions (List): (levelPath, seed, frames, scriptName) tuples, one per session
+			onResult (function, optional): called with each session's metrics as soon as it finishes. Defaults to None.
+
+		Returns:
+			List: every session's metrics, in the order they finished
+		"""
+
+		results = []
+		with ProcessPoolExecutor(max_workers=self.workers) as pool:
+			futures = [pool.submit(run_session, *session) for session in sessions]
+
+			for future in as_completed(futures):
+				result = future.result()
+				results.append(result)
+				if onResult is not None:
+					onResult(result)
+
+		return results
+
+
+	# adds up a bunch of session results
+	@staticmethod
+	def aggregate(results):
+		"""Totals & averages session metrics, overall & per level
+
+		Args:
+			results (List): session metrics, as returned by run()
+
+		Returns:
+			dict: maps "all" & each level path to its totals & averages
+		"""
+
+		groups = {"all": results}
+		for result in results:
+			groups.setdefault(result["level"], []).append(result)
+
+		summary = {}
+		for name, group in groups.items():
+			exits = [result["time_to_exit_frames"] for result in group if result["exited"] is True]
+			frames = sum(result["frames"] for result in group)
+			wallTime = sum(result["wall_time_s"] for result in group)
+
+			summary[name] = {
+				"sessions": len(group),
+				"frames": frames,
+				"collisions": sum(result["collisions"] for result in group),
+				"shots": sum(result["shots"] for result in group),
+				"exits": len(exits),
+				"mean_time_to_exit_frames": (sum(exits) / len(exits)) if len(exits) > 0 else None,
+				"frames_per_second_per_worker": (frames / wallTime) if wallTime > 0 else None,
+			}
+
+		return summary
+
+
+# run from the command line
+if __name__ == "__main__":
+
+	parser = argparse.ArgumentParser(description="Runs scripted headless MazeGame sessions in parallel & aggregates their metrics")
+	parser.add_argument("--levels", nargs="+", default=LEVELS, help="levels to play")
+	parser.add_argument("--seeds", type=int, default=8, help="sessions per level, with seeds 0 to N-1")
+	parser.add_argument("--frames", type=int, default=3600, help="most frames per session")
+	parser.add_argument("--script", default="seek", choices=SCRIPTS, help="how the player is driven")
+	parser.add_argument("--workers", type=int, default=None, help="processes to use, defaults to one per core")
+	parser.add_argument("--output", default="batch_results.json", help="file to write results to")
+	args = parser.parse_args()
+
+	sessions = [(level, seed, args.frames, args.script) for level in args.levels for seed in range(0, args.seeds)]
+
+	# print each session as it comes in
+	def handle_result(result):
+		exitText = f"exited at frame {result['time_to_exit_frames']}" if result["exited"] else "didn't exit"
+		print(f"{result['level']} seed {result['seed']}: {result['frames']} frames, {result['collisions']} collisions, {result['shots']} shots, {exitText}")
+
+	startTime = time.perf_counter()
+	results = BatchRunner(args.workers).run(sessions, handle_result)
+	elapsed = time.perf_counter() - startTime
+
+	summary = BatchRunner.aggregate(results)
+	with open(args.output, "w") as file:
+		json.dump({"summary": summary, "sessions": results, "elapsed_s": elapsed}, file, indent=2)
+
+	print(f"Ran {len(results)} sessions ({summary['all']['frames']} frames) in {elapsed:.2f}s, saved to {args.output}")
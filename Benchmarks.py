@@ -0,0 +1,392 @@
+"""
+	Benchmarks.py
+	-------------
+
+	This file/module is a reproducible benchmark harness for the hot parts of the game.
+
+	It runs everything on SDL's dummy video driver (via HeadlessMazeGame), so no window or display is needed,
+	and writes the results to a JSON file so runs can be compared before & after a change.
+
+	What we measure:
+		- Map.get_tile_at_map_pos throughput
+		- Map.draw_map at a few resolutions & camera positions (cold, i.e. building chunks, & warm)
+		- player wall collision (Player._move_and_collide / Map.resolve_circle) under scripted movement
+		- ParticleSystem update & draw at 10 / 100 / 1,000 / 10,000 particles, both Particle objects & batched
+		- whole GameScreen frames (update + render) on each level
+		- optionally, whole frames of a recorded play session, replayed exactly (see InputSource.py)
+
+	Usage (from the root of the repo, since our asset paths are relative):
+
+		python Benchmarks.py [--output bench_results.json] [--quick] [--replay recording.input [--replay-level level.png]]
+"""
+
+# for our command line
+import argparse
+
+# for writing results
+import json
+
+# for describing the machine we ran on
+import platform
+import sys
+
+# high resolution timer & timestamps
+import time
+
+# reproducible scripted input
+import random
+
+# we're gonna use pygame for our rendering, etc
+import pygame
+
+# runs the game without a window
+from HeadlessGame import HeadlessMazeGame
+
+# particle types
+from ParticleSystem import ParticleSystem
+
+# for replaying recorded sessions
+from InputSource import InputPlayback
+
+# the levels we benchmark whole frames on
+LEVELS = [
+	'./levels/level_01/map.png',
+	'./levels/level_02/map.png',
+	'./levels/level_03/map.png',
+	'./levels/level_04/map.png',
+]
+
+# resolutions we benchmark map drawing at
+RESOLUTIONS = [(640, 480), (900, 650), (1280, 720), (1920, 1080)]
+
+# particle counts we benchmark the particle system at
+PARTICLE_COUNTS = [10, 100, 1000, 10000]
+
+# main benchmark class
+class BenchmarkSuite:
+
+	# constructor
+	def __init__(self, quick=False, seed=1234, replayPath=None, replayLevel=LEVELS[1]):
+		"""Constructs the benchmark suite
+
+		Args:
+			quick (bool, optional): set true to run fewer iterations, for a fast smoke test. Defaults to False.
+			seed (int, optional): seed for our scripted input. Defaults to 1234.
+			replayPath (str, optional): an input recording to replay & time frame by frame. Defaults to None.
+			replayLevel (str, optional): the level the recording was made on. Defaults to level 02.
+		"""
+
+		# recorded session to replay, if any
+		self._replayPath = replayPath
+		self._replayLevel = replayLevel
+
+		# quick runs do a tenth of the work
+		self._scale = 0.1 if quick else 1.0
+		self._seed = seed
+
+		# maps benchmark name to its results
+		self.results = {}
+
+
+	# scales an iteration count, but never below 1
+	def _iterations(self, count):
+		return max(1, int(count * self._scale))
+
+
+	# times a function a number of times
+	@staticmethod
+	def _time(func, iterations):
+		"""Calls func() iterations times, timing each call
+
+		Args:
+			func (function): the thing to time
+			iterations (int): how many times to call it
+
+		Returns:
+			dict: median/mean/min/max time per call in ms, plus the iteration count
+		"""
+
+		times = []
+		perfCounter = time.perf_counter
+		for i in range(0, iterations):
+			start = perfCounter()
+			func()
+			times.append((perfCounter() - start) * 1000)
+
+		times.sort()
+		return {
+			"median_ms": times[len(times) // 2],
+			"mean_ms": sum(times) / len(times),
+			"min_ms": times[0],
+			"max_ms": times[-1],
+			"iterations": iterations,
+		}
+
+
+	# runs everything
+	def run(self):
+		"""Runs every benchmark
+
+		Returns:
+			dict: all results, keyed by benchmark name
+		"""
+
+		self.bench_tile_lookup()
+		self.bench_draw_map()
+		self.bench_wall_collision()
+		self.bench_particles()
+		self.bench_full_frames()
+
+		if self._replayPath is not None:
+			self.bench_replay()
+
+		return self.results
+
+
+	# how fast can we look up tiles
+	def bench_tile_lookup(self):
+		"""Times Map.get_tile_at_map_pos over every tile of the biggest level, including a border out of bounds
+		"""
+
+		game = HeadlessMazeGame(LEVELS[-1], fog=False, minimap=False)
+		map = game.scene.map
+
+		# every tile on the map, plus a ring out of bounds
+		positions = [(x, y) for y in range(-1, map._mapH + 1) for x in range(-1, map._mapW + 1)]
+		getTile = map.get_tile_at_map_pos
+
+		def lookupAll():
+			for pos in positions:
+				getTile(pos)
+
+		timing = BenchmarkSuite._time(lookupAll, self._iterations(200))
+		timing["lookups_per_call"] = len(positions)
+		timing["lookups_per_sec"] = len(positions) / (timing["median_ms"] / 1000)
+
+		self.results["map.get_tile_at_map_pos"] = timing
+
+
+	# how fast can we draw the map
+	def bench_draw_map(self):
+		"""Times Map.draw_map at several resolutions & camera positions, both cold (empty chunk cache) & warm
+		"""
+
+		results = {}
+		for resolution in RESOLUTIONS:
+
+			game = HeadlessMazeGame(LEVELS[-1], resolution, fog=False, minimap=False)
+			scene = game.scene
+			mapSizeInPixels = scene.map._mapW * scene.map.TILE_SIZE
+
+			# a few spots: top left corner (mostly out of bounds), where the player spawns, the middle, & a far corner
+			cameraPositions = {
+				"origin": (0, 0),
+				"spawn": (512, 396),
+				"center": (mapSizeInPixels // 2, mapSizeInPixels // 2),
+				"far_corner": (mapSizeInPixels - 200, mapSizeInPixels - 200),
+			}
+
+			for name, pos in cameraPositions.items():
+				scene.camera.move_to(pygame.Vector2(pos))
+
+				# cold, every chunk has to be built first
+				def drawCold():
+					scene.map._chunkCache.clear()
+					scene.map.draw_map()
+
+				# warm, chunks are already cached
+				warm = scene.map.draw_map
+
+				key = f"{resolution[0]}x{resolution[1]}/{name}"
+				results[key] = {
+					"cold": BenchmarkSuite._time(drawCold, self._iterations(50)),
+					"warm": BenchmarkSuite._time(warm, self._iterations(500)),
+				}
+
+		self.results["map.draw_map"] = results
+
+
+	# how fast is wall collision
+	def bench_wall_collision(self):
+		"""Times Player._move_and_collide (sub-stepped Map.resolve_circle) on moves recorded from scripted random
+		   movement through a level, replayed from where each move started, so the walls are actually hit
+		"""
+
+		game = HeadlessMazeGame(LEVELS[-1], fog=False, minimap=False)
+		player = game.scene.player
+		moveAndCollide = player._move_and_collide
+		rng = random.Random(self._seed)
+
+		# record every attempted move, before it's resolved: where we were, & how far we tried to go
+		moves = []
+		def record_move(moveX, moveY):
+			moves.append((player.pos.x, player.pos.y, moveX, moveY))
+			moveAndCollide(moveX, moveY)
+		player._move_and_collide = record_move
+
+		# walk the player around randomly
+		for i in range(0, self._iterations(5000)):
+
+			# turn now and then, & always walk forward
+			if rng.random() < 0.1:
+				player.rotate(rng.choice([-1, 1]) * rng.randint(1, 18))
+
+			player.move(1)
+
+		del player._move_and_collide
+
+		# how many of them ran into a wall
+		radius = player.COLLISION_RADIUS
+		resolveCircle = game.scene.map.resolve_circle
+		hits = sum(resolveCircle(x + moveX, y + moveY, radius)[2] for x, y, moveX, moveY in moves)
+
+		# now replay them through the collision alone
+		def collideAll():
+			for x, y, moveX, moveY in moves:
+				player.pos.update(x, y)
+				moveAndCollide(moveX, moveY)
+			player.colPoints = []
+
+		timing = BenchmarkSuite._time(collideAll, self._iterations(20))
+		timing["checks_per_call"] = len(moves)
+		timing["checks_per_sec"] = len(moves) / (timing["median_ms"] / 1000)
+		timing["hit_fraction"] = hits / len(moves)
+
+		self.results["player._move_and_collide"] = timing
+
+
+	# how fast are particles
+	def bench_particles(self):
+		"""Times ParticleSystem update & draw with a fixed number of live particles, for both
+		   Particle objects & batched particles
+		"""
+
+		results = {}
+		rng = random.Random(self._seed)
+
+		for mode in ["objects", "batched"]:
+			for count in PARTICLE_COUNTS:
+
+				game = HeadlessMazeGame(LEVELS[1], fog=False, minimap=False)
+				scene = game.scene
+				particles = scene.particles
+				center = scene.camera.pos
+
+				# spawn particles scattered on screen that never move, expire or go out of bounds,
+				# so the count stays fixed for the whole benchmark
+				for i in range(0, count):
+					pos = pygame.Vector2(center.x + rng.uniform(-400, 400), center.y + rng.uniform(-300, 300))
+					angle = rng.random() * 360
+					type = rng.choice([ParticleSystem.TYPES.BULLET, ParticleSystem.TYPES.POOF])
+
+					if mode == "batched":
+						particles.spawn_batched_particle(type, pos, angle, 0, 0, 1000, 0, False)
+					else:
+						particle = particles.spawn_particle(type, pos, angle, 0)
+						particle.set_cycle_settings(0, 1000)
+						particle.killWhenOOB = False
+
+				# fewer iterations the more particles we have, so each run takes roughly the same time
+				iterations = self._iterations(max(5, 20000 // count))
+				results[f"{mode}/{count}"] = {
+					"update": BenchmarkSuite._time(particles.update, iterations),
+					"draw": BenchmarkSuite._time(particles.draw, iterations),
+				}
+
+		self.results["particle_system"] = results
+
+
+	# how fast is a whole frame
+	def bench_full_frames(self):
+		"""Times whole GameScreen frames (update + render) on each level, with the player scripted to
+		   wander around & fire
+		"""
+
+		results = {}
+		for levelPath in LEVELS:
+
+			game = HeadlessMazeGame(levelPath, render=True, fog=False, minimap=False)
+			rng = random.Random(self._seed)
+
+			# wander & shoot
+			def script(frameIndex, scene):
+				if rng.random() < 0.1:
+					scene.player.rotate(rng.choice([-1, 1]) * rng.randint(1, 18))
+				scene.player.move(1)
+				if frameIndex % 5 == 0:
+					scene.player.fire()
+
+			# warm up, so we're not timing first-frame setup (chunks, rotation caches, etc)
+			game.run(60, script)
+
+			# then time frames one at a time
+			frameIndex = [60]
+			def frame():
+				script(frameIndex[0], game.scene)
+				game.step()
+				frameIndex[0] += 1
+
+			results[levelPath] = BenchmarkSuite._time(frame, self._iterations(600))
+
+		self.results["game_screen.frame"] = results
+
+
+	# how fast is a recorded session
+	def bench_replay(self):
+		"""Times every frame of a recorded play session, replayed on a simulated clock at the framerate it was
+		   recorded at, so the exact same workload runs every time
+		"""
+
+		playback = InputPlayback(self._replayPath)
+		game = HeadlessMazeGame(self._replayLevel, targetFPS=playback.fps, render=True, inputSource=playback, fog=False, minimap=False, seed=playback.seed)
+
+		# one timed step per recorded frame
+		timing = BenchmarkSuite._time(game.step, len(playback))
+		timing["recording"] = self._replayPath
+		timing["level"] = self._replayLevel
+
+		self.results["replay.frame"] = timing
+
+
+	# writes results out with some info about where they came from
+	def save(self, path):
+		"""Saves our results, & details about the machine they were run on, as JSON
+
+		Args:
+			path (str): file to write
+		"""
+
+		data = {
+			"meta": {
+				"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+				"python": sys.version,
+				"pygame": pygame.version.ver,
+				"platform": platform.platform(),
+				"seed": self._seed,
+				"quick": self._scale != 1.0,
+				"fog": False,
+				"minimap": False,
+			},
+			"results": self.results,
+		}
+
+		with open(path, "w") as file:
+			json.dump(data, file, indent=2)
+
+
+# run from the command line
+if __name__ == "__main__":
+
+	parser = argparse.ArgumentParser(description="Runs the MazeGame benchmark suite headless & saves results as JSON")
+	parser.add_argument("--output", default="bench_results.json", help="file to write results to")
+	parser.add_argument("--quick", action="store_true", help="run fewer iterations, for a quick smoke test")
+	parser.add_argument("--seed", type=int, default=1234, help="seed for scripted input")
+	parser.add_argument("--replay", default=None, help="input recording to replay & time, see PlayMazeGame.py --record")
+	parser.add_argument("--replay-level", default=LEVELS[1], help="level the recording was made on")
+	args = parser.parse_args()
+
+	suite = BenchmarkSuite(args.quick, args.seed, args.replay, args.replay_level)
+	suite.run()
+	suite.save(args.output)
+
+	print(f"Saved benchmark results to {args.output}")
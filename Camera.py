@@ -18,9 +18,6 @@
 # pygame for Vector 2 & etc
 import pygame
 
-# useful
-from Util import dotdict
-
 # we gonna extend this
 from WorldEntity import WorldEntity
 
@@ -54,6 +51,9 @@ class Camera(WorldEntity):
 		# not sure if I plan on supporting this, but ill leave it here just in case
 		# how much we are zooming
 		self.zoom = 1
+
+		# work out our bounds for our starting position
+		self._update_bounds()
 	
 
 	# public method to update camera position to some pixels
@@ -64,8 +64,36 @@ class Camera(WorldEntity):
 			newPos (Vector2): new pos, as pygame Vector2
 		"""
 
-		# update our position
-		self.pos = newPos
+		# update our position (a copy, so whatever we're following can't move us without us knowing)
+		self.pos = pygame.Vector2(newPos)
+
+		# our bounds only change when we move, so work them out once here, rather than every time they're asked for
+		self._update_bounds()
+
+
+	# caches everything about our bounds, called whenever we move
+	def _update_bounds(self):
+		"""Works out our top left & bottom right corners, and bounds dict, for our current position.
+		   Many things ask for these every frame (often once per particle), so we only compute them when we move
+		"""
+
+		# corners as vectors
+		self._topLeft = self.pos - self.center
+		self._bottomRight = self.pos + self.center
+
+		# and as plain numbers, for our hot paths
+		self._left = self._topLeft.x
+		self._top = self._topLeft.y
+		self._right = self._bottomRight.x
+		self._bottom = self._bottomRight.y
+
+		# see get_camera_bounds
+		self._bounds = {
+			"topLeft": self._topLeft,
+			"bottomRight": self._bottomRight,
+			"width": self._winW,
+			"height": self._winH,
+		}
 
 
 	# helper function to get screen coordinates of a vector2 from our camera position
@@ -81,7 +109,7 @@ class Camera(WorldEntity):
 
 		# we want to think of our x/y position as the center of the screen, so we should subtract
 		# center to get what would be the top-left pixel of the window:
-		windowTopLeft = self.top_left_in_pixels
+		windowTopLeft = self._topLeft
 
 		# now we should get the vector from top left TO object pos
 		# tip-minus-tail:
@@ -101,8 +129,8 @@ class Camera(WorldEntity):
 			Vector2: the world pos of the top left of the camera
 		"""
 
-		# ez-pz
-		return (self.pos - self.center)
+		# ez-pz (copy of our cached corner, so callers can't change it)
+		return pygame.Vector2(self._topLeft)
 	
 
 	# gets the bottom of the camera in screen/world pixels
@@ -115,24 +143,35 @@ class Camera(WorldEntity):
 			Vector2: the world pos of the bottom-right of the camera
 		"""
 
-		# ez-pz
-		return (self.pos + self.center)
+		# ez-pz (copy of our cached corner, so callers can't change it)
+		return pygame.Vector2(self._bottomRight)
 	
 
 	# helper function to get the bounds of the camera
 	def get_camera_bounds(self):
 		"""Gets the top/bottom/left/right postion of the camera in world units
 
+			NOTE: this is cached between moves, so treat it (and the vectors in it) as read only
+
 		Returns:
 			dict: a dictionary with top/bottom/left/right values
 		"""
 
-		return {
-			"topLeft": self.top_left_in_pixels,
-			"bottomRight": self.bottom_right_in_pixels,
-			"width": self._winW,
-			"height": self._winH,
-		}
+		return self._bounds
+
+
+	# helper function to get the bounds of the camera, grown by some margin, as plain numbers
+	def get_bounds_with_margin(self, margin):
+		"""Gets the left/top/right/bottom edges of the camera in world pixels, grown by a margin on every side
+
+		Args:
+			margin (Number): how far to grow the bounds by
+
+		Returns:
+			Tuple: (left, top, right, bottom)
+		"""
+
+		return (self._left - margin, self._top - margin, self._right + margin, self._bottom + margin)
 
 
 	@property
@@ -153,34 +192,17 @@ class Camera(WorldEntity):
 			bool: True if we're off screen
 		"""
 
-		# reuse our handle function to get bounds
-		bounds = dotdict(self.get_camera_bounds())
-		
-		# def printBounds():
-		# 	print(f"{bounds.topLeft.x}, {bounds.topLeft.y}, {bounds.bottomRight.x}, {bounds.bottomRight.y}")
-		# 	print(f"player pos {self._scene.player.pos.x}, {self._scene.player.pos.y}")
-		# 	print(f"Particle pos {pos.x}, {pos.y}")
-
 		# basically, just add margin to the bounds and check if the passed pos component is outside
-		if pos.x < (bounds.topLeft.x - margin):
-			# print('oob left')
-			# printBounds()
+		if pos.x < (self._left - margin):
 			return True
 
-		if pos.x > (bounds.bottomRight.x + margin):
-			# print('oob right')
-			# printBounds()
+		if pos.x > (self._right + margin):
 			return True
 
-		if pos.y < (bounds.topLeft.y - margin):
-			# print(f'x: {pos.y} oob-top {bounds.topLeft.y}  m:{bounds.topLeft.y-margin}')
-			# print('oob top')
-			# printBounds()
+		if pos.y < (self._top - margin):
 			return True
 
-		if pos.y > (bounds.bottomRight.y + margin):
-			# printBounds()
-			# print('oob bottom')
+		if pos.y > (self._bottom + margin):
 			return True
 
 		# if we got past all four gaurd clauses, we must be in bounds:
@@ -202,3 +224,32 @@ class Camera(WorldEntity):
 
 		# inverse
 		return not self.is_off_screen(pos, margin)
+
+
+	# batch version of get_screen_pos & is_on_screen, for lots of things at once
+	def get_screen_positions(self, xs, ys, margin=0):
+		"""Converts a bunch of world positions to screen positions, and works out which are on screen, all at once
+
+		Args:
+			xs (List): world x positions
+			ys (List): world y positions
+			margin (Number, optional): how much overlap off screen to allow when checking visibility. Defaults to 0.
+
+		Returns:
+			Tuple: (screenXs, screenYs, visible) lists, where visible[i] is True if position i is on screen
+		"""
+
+		left = self._left
+		top = self._top
+
+		# on screen is between 0 & our window size, plus margin
+		minX = -margin
+		minY = -margin
+		maxX = self._winW + margin
+		maxY = self._winH + margin
+
+		screenXs = [x - left for x in xs]
+		screenYs = [y - top for y in ys]
+		visible = [(minX <= sx <= maxX) and (minY <= sy <= maxY) for sx, sy in zip(screenXs, screenYs)]
+
+		return (screenXs, screenYs, visible)
@@ -0,0 +1,371 @@
+"""
+	EntityRegistry.py
+	-----------------
+
+	This file/module provides a home for the many small things in a level (enemies, pickups, doors, etc).
+
+	The player & particle system each have their own update() & draw(), which is fine for one of each.
+	But with dozens or hundreds of enemies, an object per enemy, each with its own update() & draw() called
+	every frame, is mostly Python method-call & attribute overhead.
+
+	So instead, entities are grouped by type, and each group keeps its entities' data (positions, rotations,
+	velocities) in parallel lists, the same way ParticleBatch does for particles. Then a handful of systems
+	(movement & wall collision, rendering) each loop over a whole group at a time.
+
+	Types are described by subclassing Entity & setting its class constants, like IMAGE_PATH & RADIUS.
+	No Entity is ever actually constructed, the class is just the type's description.
+	Types can have their own per-frame logic by overriding Entity.update_group, which gets the whole group at once.
+
+	Entities are referred to by id, which stays the same for as long as they live.
+	Their ids are also kept in a SpatialHash, so finding the entities near somewhere is quick (see query_radius).
+
+	This file/module provides three classes:
+
+	Entity, the base class to describe types of entity with,
+
+	EntityGroup, the parallel lists for all the entities of one type,
+
+	and EntityRegistry, which owns the groups & runs the systems over them.
+"""
+
+# for dat geometry
+import math
+
+# so others can find out when entities hit walls
+from Events import Events
+
+# shared, pre-converted images
+from AssetManager import sharedAssetManager
+
+# rotating images is expensive, so we share a cache of rotated images
+from RotationCache import sharedRotationCache
+
+# for drawing rotated images
+from Util import blit_rotate_center
+
+# for finding entities near somewhere
+from SpatialHash import SpatialHash
+
+# base entity type
+class Entity:
+
+	# image to draw entities of this type with, or None to not draw them
+	IMAGE_PATH = None
+
+	# radius of the circle they collide with walls as
+	RADIUS = 24
+
+	# set false for things that don't move or can go through walls
+	COLLIDES = True
+
+	# set false to keep sliding along walls, rather than stopping dead when touching one
+	STOP_ON_WALL = True
+
+	# per-type logic, run once per frame for the whole group
+	@classmethod
+	def update_group(cls, group, registry):
+		"""Overload this to give a type of entity its own behaviour, like chasing the player.
+		   Runs before movement, every frame, with every entity of the type at once
+
+		Args:
+			group (EntityGroup): all the entities of this type
+			registry (EntityRegistry): the registry they belong to
+		"""
+		pass
+
+
+# all the entities of one type
+class EntityGroup:
+
+	# constructor
+	def __init__(self, entityType):
+		"""Constructs an empty group for a type of entity
+
+		Args:
+			entityType (class): the Entity subclass describing the type
+		"""
+
+		self.type = entityType
+
+		# the type's image, loaded once for the whole group
+		self.image = None
+		if entityType.IMAGE_PATH is not None:
+			self.image = sharedAssetManager.load_image(entityType.IMAGE_PATH)
+			sharedRotationCache.prebake(self.image)
+
+		# per-entity data, as parallel lists, index i is the same entity in all of them
+		self.ids = []
+		self.xs = []
+		self.ys = []
+		self.rots = []
+		self.dxs = []
+		self.dys = []
+
+
+	# how many entities we have
+	def __len__(self):
+		return len(self.ids)
+
+
+	# every one of our lists, so we can do the same thing to all of them
+	def _columns(self):
+		return (self.ids, self.xs, self.ys, self.rots, self.dxs, self.dys)
+
+
+	# sets an entity's velocity from an angle & speed
+	def set_heading(self, index, angle, speed):
+		"""Points an entity in a direction & sets how fast it moves that way
+
+		Args:
+			index (int): the entity's index in this group
+			angle (Number): direction in degrees (the same as WorldEntity.rot, 0 is up)
+			speed (Number): world pixels per frame
+		"""
+
+		# same direction WorldEntity.move_by_angle_and_magnitude moves in
+		angleInRadians = angle * (math.pi/180.0)
+		self.rots[index] = angle
+		self.dxs[index] = -math.sin(angleInRadians) * speed
+		self.dys[index] = -math.cos(angleInRadians) * speed
+
+
+# main registry class
+class EntityRegistry:
+
+	# constructor
+	def __init__(self, scene, win):
+		"""Constructs the registry, with no entities
+
+		Args:
+			scene (Scene): the scene we live in
+			win (Surface): pygame window surface we render to
+		"""
+
+		# save reference to the scene we live in & render window
+		self._scene = scene
+		self._win = win
+
+		# maps Entity subclass to its group, in the order types were first spawned (which is also draw order)
+		self._groups = {}
+
+		# maps entity id to (group, index in group)
+		self._locations = {}
+
+		# abitrary counter for handing out ids
+		self._idCounter = 0
+
+		# every entity's id, by where it is
+		self.spatialHash = SpatialHash()
+
+		# public events, queued so handlers can spawn & remove entities without upsetting our loops
+		self.events = Events(["onEntityHitWall"], queued=True)
+
+
+	# how many entities we have
+	def __len__(self):
+		return len(self._locations)
+
+
+	# gets the group for a type, making it if we need to
+	def get_group(self, entityType):
+		"""Gets the group of every entity of a type
+
+		Args:
+			entityType (class): the Entity subclass
+
+		Returns:
+			EntityGroup: its group
+		"""
+
+		group = self._groups.get(entityType)
+		if group is None:
+			group = EntityGroup(entityType)
+			self._groups[entityType] = group
+
+		return group
+
+
+	# public method to add an entity
+	def spawn(self, entityType, pos, rot=0, speed=0):
+		"""Adds an entity to the world
+
+		Args:
+			entityType (class): the Entity subclass describing what it is
+			pos (Vector2|Tuple): where it starts, in world pixels
+			rot (Number, optional): direction it faces (& moves in), in degrees. Defaults to 0.
+			speed (Number, optional): world pixels it moves per frame. Defaults to 0.
+
+		Returns:
+			int: the new entity's id
+		"""
+
+		group = self.get_group(entityType)
+
+		self._idCounter += 1
+		id = self._idCounter
+
+		index = len(group.ids)
+		group.ids.append(id)
+		group.xs.append(pos[0])
+		group.ys.append(pos[1])
+		group.rots.append(0)
+		group.dxs.append(0)
+		group.dys.append(0)
+		group.set_heading(index, rot, speed)
+
+		self._locations[id] = (group, index)
+		self.spatialHash.insert(id, pos, entityType.RADIUS)
+
+		return id
+
+
+	# public method to remove an entity
+	def remove(self, id):
+		"""Removes an entity from the world. Does nothing if it's already gone
+
+		Args:
+			id (int): the entity's id
+		"""
+
+		location = self._locations.pop(id, None)
+		if location is None:
+			return
+
+		group, index = location
+		self.spatialHash.remove(id)
+
+		# move the last entity of the group into the hole, so nothing else has to shift down
+		lastIndex = len(group.ids) - 1
+		if index != lastIndex:
+			for values in group._columns():
+				values[index] = values[lastIndex]
+			self._locations[group.ids[index]] = (group, index)
+
+		for values in group._columns():
+			values.pop()
+
+
+	# looks an entity up
+	def find(self, id):
+		"""Finds where an entity's data lives
+
+		Args:
+			id (int): the entity's id
+
+		Returns:
+			Tuple|None: (group, index) or None if there's no such entity
+		"""
+
+		return self._locations.get(id)
+
+
+	# runs all our per-frame systems
+	def update(self):
+		"""Runs every type's own logic, then moves everything (sliding along walls, for things that collide),
+		   then updates where everything is in our spatial hash
+		"""
+
+		for entityType, group in list(self._groups.items()):
+			entityType.update_group(group, self)
+
+		self.update_movement()
+		self.update_collision()
+		self.update_spatial_hash()
+
+
+	# movement system
+	def update_movement(self):
+		"""Moves every entity that doesn't collide by its velocity (update_collision moves the rest)
+		"""
+
+		for entityType, group in self._groups.items():
+			if entityType.COLLIDES is True:
+				continue
+
+			group.xs[:] = [x + dx for x, dx in zip(group.xs, group.dxs)]
+			group.ys[:] = [y + dy for y, dy in zip(group.ys, group.dys)]
+
+
+	# wall collision system
+	def update_collision(self):
+		"""Moves every entity that collides by its velocity, pushing it out of any walls on the way.
+		   Fast movers are sub-stepped, the same as the player, so they can't tunnel through walls (see Map.move_circle)
+		"""
+
+		moveCircle = self._scene.map.move_circle
+		hitWall = self.events.onEntityHitWall
+
+		for entityType, group in self._groups.items():
+			if entityType.COLLIDES is False:
+				continue
+
+			radius = entityType.RADIUS
+			stopOnWall = entityType.STOP_ON_WALL
+			xs = group.xs
+			ys = group.ys
+			dxs = group.dxs
+			dys = group.dys
+
+			for i in range(0, len(xs)):
+				xs[i], ys[i], hit = moveCircle(xs[i], ys[i], dxs[i], dys[i], radius)
+				if hit is False:
+					continue
+
+				if stopOnWall is True:
+					group.dxs[i] = 0
+					group.dys[i] = 0
+
+				hitWall.fire(entityType, group.ids[i])
+
+
+	# spatial hash system
+	def update_spatial_hash(self):
+		"""Tells our spatial hash where every entity is now
+		"""
+
+		move = self.spatialHash.move
+		for group in self._groups.values():
+			for id, x, y in zip(group.ids, group.xs, group.ys):
+				move(id, (x, y))
+
+
+	# public method to find entities near somewhere
+	def query_radius(self, pos, radius):
+		"""Finds every entity touching a circle, as of the last update()
+
+		Args:
+			pos (Vector2|Tuple): center of the circle, in world pixels
+			radius (Number): radius of the circle
+
+		Returns:
+			List: ids of the entities touching it (use find() to get their data)
+		"""
+
+		return self.spatialHash.query_radius(pos, radius)
+
+
+	# render system
+	def draw(self):
+		"""Draws every entity that's on screen, a group at a time
+		"""
+
+		cam = self._scene.camera
+		win = self._win
+		markDirty = self._scene.mark_dirty
+
+		for group in self._groups.values():
+			image = group.image
+			if image is None or len(group) == 0:
+				continue
+
+			# every entity's screen position, & which are on screen, in one go (allowing for our image's size)
+			halfW = image.get_width() / 2
+			halfH = image.get_height() / 2
+			screenXs, screenYs, visible = cam.get_screen_positions(group.xs, group.ys, max(halfW, halfH) * 2)
+			rots = group.rots
+
+			for i in range(0, len(screenXs)):
+				if visible[i] is False:
+					continue
+
+				markDirty(blit_rotate_center(win, image, (screenXs[i] - halfW, screenYs[i] - halfH), rots[i]))
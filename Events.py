@@ -4,6 +4,9 @@
 
 	Suuuper simple system to collect callbacks in named lists & fires them arbitraitly.
 
+	Events can either call their listeners straight away when fired, or (in queued mode)
+	hold on to what was fired and call their listeners later, all at once, when drained.
+
 	This file/module provides two classes:
 
 	One for event contains, called EventsEvent,
@@ -16,15 +19,39 @@
 class EventsEvent:
 
 	# constructor
-	def __init__(self):
+	def __init__(self, queued=False):
 		"""Constructs the EventEvent, which is a container to hold/add/remove call back functions
+
+		Args:
+			queued (bool, optional): set true to hold fired events until drain() is called,
+									 instead of calling listeners straight away. Defaults to False.
 		"""
 		
 		# abitrary counter for indexing events as they're added
 		self.listenerCoutner = 0
 
-		# array to add listeners to
-		self.listeners = []
+		# maps listener ID to callback. Dicts keep insertion order, so listeners are still called in the order added
+		self._listeners = {}
+
+		# tuple of (id, callback) pairs we loop over in fire(), rebuilt only after listeners are added/removed
+		# (this also means listeners can be added/removed while we're firing, without messing up our loop)
+		self._snapshot = None
+
+		# queued mode settings & the list of parameter tuples waiting for drain()
+		self.queued = queued
+		self._queue = []
+
+
+	# backwards compatible view of our listeners, as a list of dicts like we used to store them
+	@property
+	def listeners(self):
+		"""List of our listeners, as {"id": ..., "func": ...} dicts, in the order they were added
+
+		Returns:
+			List: the listeners
+		"""
+
+		return [{"id": id, "func": func} for id, func in self._listeners.items()]
 
 	
 	# adds a listener callback to this event
@@ -42,34 +69,76 @@ class EventsEvent:
 		self.listenerCoutner += 1
 		newID = self.listenerCoutner
 
-		# make new basic dict for event
-		eventInfo = {
-			"id": newID,
-			"func": callback,
-		}
-
-		# add it to our list of listeners
-		self.listeners.append(eventInfo)
+		# add it to our listeners & make sure our next fire() sees it
+		self._listeners[newID] = callback
+		self._snapshot = None
 
 		# return the ID of this listener, incase we want to remove it via ID later
-		return eventInfo["id"]
+		return newID
 
 
 	# fires the event, i.e. calls all our listeners with paramers
 	def fire(self, *params):
 		"""Fires all the callbacks we have in our array, with whatever arbitrary params are passed into fire(...)
+		   In queued mode, the params are saved & the callbacks are called on the next drain() instead.
 		"""
 
+		# in queued mode, just hold on to it for later
+		if self.queued is True:
+			self._queue.append(params)
+			return
+
+		self._dispatch(params)
+
+
+	# calls all our listeners with some parameters
+	def _dispatch(self, params):
+		"""Calls every listener with the given parameters
+
+		Args:
+			params (Tuple): the parameters to pass
+		"""
+
+		# rebuild our snapshot of listeners, if they changed since last time
+		snapshot = self._snapshot
+		if snapshot is None:
+			snapshot = self._snapshot = tuple(self._listeners.items())
+
 		# loop over all our callbacks and pass the exact same parameters we got in, to them
-		for listener in self.listeners:
-			
-			# call listener with identical params
-			listener["func"](*params)
+		# (skipping any that were removed by an earlier listener during this same fire)
+		listeners = self._listeners
+		for id, func in snapshot:
+			if id in listeners:
+				func(*params)
+
+
+	# fires everything that was queued up
+	def drain(self):
+		"""Calls our listeners for every event fired since the last drain(), in the order they were fired.
+		   Events fired by listeners while we drain are held for the next drain().
+
+		Returns:
+			Number: how many queued events were dispatched
+		"""
+
+		# nothing to do, which is most of the time
+		if len(self._queue) == 0:
+			return 0
+
+		# swap the queue out first, so anything fired while we're draining waits for next time
+		queue = self._queue
+		self._queue = []
+
+		for params in queue:
+			self._dispatch(params)
+
+		return len(queue)
 
 
 	# removes a listern so it doesn't get called in the future
 	def remove_listener(self, listenerToRemove):
-		"""Removes a listener from this event, so it wont get called in the future
+		"""Removes a listener from this event, so it wont get called in the future.
+		   Safe to call while the event is firing, in which case the removed listener won't be called again.
 
 		Args:
 			listenerToRemove (Number|function): EITHER the ID number of the listener, or the function reference itself
@@ -78,18 +147,16 @@ class EventsEvent:
 			function|False: returns either the call back removed, or False if none found
 		"""
 
-		# there's probably some pythonic way to do this, but for simplicity, gonna use a good ol' fashion for loop
-		for listener in self.listeners:
-
-			# check if the id matches or the func matches:
-			if(listener["id"]==listenerToRemove or listener["func"]==listenerToRemove):
-
-				# remove this listener from the list
-				self.listeners.remove(listener)
-
-				# return just the function in case called wants ref of removed item,
-				return listener["func"]
+		# by ID is just a dictionary look up
+		if listenerToRemove in self._listeners:
+			self._snapshot = None
+			return self._listeners.pop(listenerToRemove)
 
+		# otherwise, look for the first listener with this function
+		for id, func in self._listeners.items():
+			if func == listenerToRemove:
+				self._snapshot = None
+				return self._listeners.pop(id)
 
 		# if nothing was found, return false isntead
 		return False
@@ -99,7 +166,19 @@ class EventsEvent:
 class Events:
 
 	# constrcutor
-	def __init__(self, eventsList = None):
+	def __init__(self, eventsList = None, queued = False):
+		"""Constructs the Events object with some named events
+
+		Args:
+			eventsList (List, optional): List of event names to add. Defaults to None.
+			queued (bool, optional): default mode for our events, see EventsEvent. Defaults to False.
+		"""
+
+		# the mode new events get, unless told otherwise
+		self.queued = queued
+
+		# our events in the order they were added, so we can drain them all
+		self._events = []
 
 		# handle optional mutable parameter
 		eventsList = eventsList or []
@@ -127,18 +206,36 @@ class Events:
 
 
 	# adds a named event to ourself as an attr
-	def add_event(self, eventName):
+	def add_event(self, eventName, queued = None):
 		"""Adds named event to ourself
 
 		Args:
 			eventName (str): name of event
+			queued (bool, optional): set true/false to override our default mode for this event. Defaults to None.
 		"""
 
 		# create a new EventsEvnt object
-		newEvent = EventsEvent()
+		newEvent = EventsEvent(self.queued if queued is None else queued)
 
 		# set it as an attribute of ourself, with the eventName passed in as the event
 		setattr(self, eventName, newEvent)
+		self._events.append(newEvent)
+
+
+	# fires everything that was queued on all our events
+	def drain(self):
+		"""Calls drain() on all our events, in the order they were added. Meant to be called once per frame
+
+		Returns:
+			Number: how many queued events were dispatched in total
+		"""
+
+		# just drain 'em all
+		total = 0
+		for event in self._events:
+			total += event.drain()
+
+		return total
 
 
 	# simple helper method to see if we have an event with a given name
@@ -0,0 +1,280 @@
+"""
+	FieldOfView.py
+	--------------
+
+	This file/module provides a class to work out which tiles of the map the player can see, for fog of war.
+
+	We use shadow casting: the area around the player is split into 8 wedges (octants), and each is scanned
+	row by row outwards from the player. Walls cast shadows (ranges of slopes) that rows further out skip over,
+	so we only ever look at tiles that might be visible, out to some radius. Since it never looks further
+	than that radius, how long it takes doesn't depend on how big the map is.
+
+	The classic version recurses for each new shadow, we keep a stack of rows to scan instead.
+
+	The player moves a few pixels a frame, but only sees anything different when they step onto a new tile,
+	so we only re-cast then. And since mazes mean a lot of walking back & forth, we keep what was visible from
+	recently visited tiles around too.
+
+	Every tile that's ever been visible is "explored", the map only draws explored tiles (see Map.set_fog).
+"""
+
+# for our least-recently-used book keeping
+from collections import OrderedDict
+
+# tile ids & sizes
+from Map import Map
+
+# so the map (& others) can find out when tiles are explored
+from Events import Events
+
+# main field of view class
+class FieldOfView:
+
+	# how many tiles out we can see, by default
+	DEFAULT_RADIUS = 8
+
+	# how each octant's (column, row) maps onto the map's (x, y), as (xx, xy, yx, yy)
+	OCTANTS = [
+		(1, 0, 0, 1),
+		(0, 1, 1, 0),
+		(0, -1, 1, 0),
+		(-1, 0, 0, 1),
+		(-1, 0, 0, -1),
+		(0, -1, -1, 0),
+		(0, 1, -1, 0),
+		(1, 0, 0, -1),
+	]
+
+	# constructor
+	def __init__(self, map, radius=DEFAULT_RADIUS, maxCached=256):
+		"""Constructs the field of view, with nothing explored yet
+
+		Args:
+			map (Map): the map we see
+			radius (int, optional): how far we can see, in tiles. Defaults to DEFAULT_RADIUS.
+			maxCached (int, optional): how many tiles' worth of visible tiles to keep around. Defaults to 256.
+		"""
+
+		# save reference to the map we see
+		self._map = map
+
+		self.radius = radius
+		self.maxCached = maxCached
+
+		# public events, onExplored fires with a list of the tile indices (y * width + x) explored for the first time
+		self.events = Events(["onExplored"])
+
+		# the grid we explore, see _get_grid
+		self._tiles = None
+		self._mapW = 0
+		self._mapH = 0
+
+		# one byte per tile, 1 once it's been seen
+		self.explored = None
+
+		# tile indices visible right now
+		self.visible = ()
+
+		# tile index we were last cast from, None to re-cast next update
+		self._originIndex = None
+
+		# maps tile index to what's visible from it, ordered from least to most recently used
+		self._cache = OrderedDict()
+
+		# walls opening & closing changes what can be seen
+		map.events.onTileChanged.add_listener(self.handle_tile_changed)
+
+
+	# makes sure we're set up for the map's current grid
+	def _get_grid(self):
+		"""Gets the map's tile grid, starting over (nothing explored) if a different map was loaded since last time
+
+		Returns:
+			bytearray|None: the tile grid, or None if there isn't one (nothing loaded, or streamed)
+		"""
+
+		tiles = self._map.tiles
+		if tiles is not self._tiles:
+			self._tiles = tiles
+			self._mapW = self._map.width_in_tiles
+			self._mapH = self._map.height_in_tiles
+			self.explored = bytearray(self._mapW * self._mapH) if tiles is not None else None
+			self.visible = ()
+			self._originIndex = None
+			self._cache.clear()
+
+		return tiles
+
+
+	# gets every tile's explored flag
+	def get_explored(self):
+		"""Gets what's been explored of the map's current grid (so nothing, if it's only just been loaded)
+
+		Returns:
+			bytearray|None: one byte per tile (y * width + x), 1 once it's been seen, or None if there's no grid
+		"""
+
+		self._get_grid()
+		return self.explored
+
+
+	# checks if a tile has been seen
+	def is_explored(self, x, y):
+		"""Checks if a tile has ever been visible
+
+		Args:
+			x (int): x position on the map, in tiles
+			y (int): y position on the map, in tiles
+
+		Returns:
+			bool: True if it has. Tiles outside the map never are
+		"""
+
+		if self.explored is None or x < 0 or x >= self._mapW or y < 0 or y >= self._mapH:
+			return False
+
+		return self.explored[y * self._mapW + x] == 1
+
+
+	# per-move upkeep
+	def update(self, pos):
+		"""Works out what's visible from a position, if it's on a different tile to last time
+
+		Args:
+			pos (Vector2|Tuple): where we're looking from, in world pixels
+
+		Returns:
+			bool: True if we re-cast (or got a different tile's visible tiles from our cache)
+		"""
+
+		tiles = self._get_grid()
+		if tiles is None:
+			return False
+
+		x = int(pos[0] // Map.TILE_SIZE)
+		y = int(pos[1] // Map.TILE_SIZE)
+		if x < 0 or x >= self._mapW or y < 0 or y >= self._mapH:
+			return False
+
+		# same tile, same view
+		index = y * self._mapW + x
+		if index == self._originIndex:
+			return False
+		self._originIndex = index
+
+		# if we were here recently we've already worked it out
+		visible = self._cache.get(index)
+		if visible is not None:
+			self._cache.move_to_end(index)
+		else:
+			visible = self.compute(x, y)
+			self._cache[index] = visible
+			while len(self._cache) > self.maxCached:
+				self._cache.popitem(last=False)
+
+		self.visible = visible
+
+		# remember anything we haven't seen before
+		explored = self.explored
+		newlyExplored = [index for index in visible if explored[index] == 0]
+		if len(newlyExplored) > 0:
+			for index in newlyExplored:
+				explored[index] = 1
+			self.events.onExplored.fire(newlyExplored)
+
+		return True
+
+
+	# the actual shadow casting
+	def compute(self, originX, originY):
+		"""Casts out from a tile to find every tile visible from it (walls included, but not what's behind them)
+
+		Args:
+			originX (int): x position on the map, in tiles
+			originY (int): y position on the map, in tiles
+
+		Returns:
+			Tuple: indices (y * width + x) of the visible tiles
+		"""
+
+		tiles = self._get_grid()
+		mapW = self._mapW
+		mapH = self._mapH
+		GROUND = Map.GROUND
+		radius = self.radius
+		radiusSquared = radius * radius
+
+		visible = {originY * mapW + originX}
+
+		for xx, xy, yx, yy in FieldOfView.OCTANTS:
+
+			# rows still to scan, as (row, start slope, end slope), row 1 is right next to us
+			stack = [(1, 1.0, 0.0)]
+			while len(stack) > 0:
+				row, start, end = stack.pop()
+				if start < end:
+					continue
+
+				for j in range(row, radius + 1):
+					dy = -j
+					blocked = False
+					newStart = start
+
+					for dx in range(-j, 1):
+
+						# slopes of this tile's far corners, skip it if it's entirely outside what we can see
+						leftSlope = (dx - 0.5) / (dy + 0.5)
+						rightSlope = (dx + 0.5) / (dy - 0.5)
+						if start < rightSlope:
+							continue
+						if end > leftSlope:
+							break
+
+						# anything off the map blocks sight, like our walls do
+						mapX = originX + dx * xx + dy * xy
+						mapY = originY + dx * yx + dy * yy
+						if 0 <= mapX < mapW and 0 <= mapY < mapH:
+							index = mapY * mapW + mapX
+							opaque = tiles[index] != GROUND
+							if (dx * dx) + (dy * dy) < radiusSquared:
+								visible.add(index)
+						else:
+							opaque = True
+
+						if blocked is True:
+
+							# still in shadow, it starts at least this far over
+							if opaque is True:
+								newStart = rightSlope
+
+							# out of the shadow, carry on from where it ended
+							else:
+								blocked = False
+								start = newStart
+
+						# a new shadow, scan the rows beyond it up to where it starts, later
+						elif opaque is True and j < radius:
+							blocked = True
+							stack.append((j + 1, start, leftSlope))
+							newStart = rightSlope
+
+					# the row ended in shadow, so nothing further out is visible
+					if blocked is True:
+						break
+
+		return tuple(visible)
+
+
+	# event handler for when the map changes
+	def handle_tile_changed(self, x, y, oldTile, newTile):
+		"""Forgets everything we worked out, since a wall opening or closing could change any of it
+
+		Args:
+			x (int): x position on the map, in tiles
+			y (int): y position on the map, in tiles
+			oldTile (Number): what it was
+			newTile (Number): what it is now
+		"""
+
+		self._cache.clear()
+		self._originIndex = None
@@ -0,0 +1,321 @@
+"""
+	FrameProfiler.py
+	----------------
+
+	This file/module provides a small profiler to see where each frame's 16.6ms goes.
+
+	You tell it which methods on which objects to time (see instrument()), and while it's enabled
+	it swaps those methods out for timed wrappers. When it's disabled, the wrappers are removed again,
+	so the game runs the exact same code it would without a profiler at all.
+
+	Timings are added up per frame, and we keep the last few hundred frames around so we can
+	show rolling percentiles on screen, or dump them to JSON / CSV for comparing runs.
+
+	The on screen overlay only works its stats out & renders its text a few times a second, & the time it takes
+	to draw is left out of the frame's time, so showing the numbers doesn't skew them.
+"""
+
+# for rolling windows of samples
+from collections import deque
+
+# for dumping
+import csv
+import json
+
+# high resolution timer
+import time
+
+# for drawing our overlay
+import pygame
+
+# shared fonts
+from AssetManager import sharedAssetManager
+
+# main profiler class
+class FrameProfiler:
+
+	# label we use for the time of the whole frame
+	FRAME = "frame"
+
+	# constructor
+	def __init__(self, windowSize=300):
+		"""Constructs the FrameProfiler, disabled
+
+		Args:
+			windowSize (int, optional): how many frames of samples to keep for our percentiles. Defaults to 300.
+		"""
+
+		# how many frames we keep samples for
+		self.windowSize = windowSize
+
+		# false until enable() is called
+		self.enabled = False
+
+		# set true to draw our stats on screen while enabled
+		self.overlay = False
+
+		# the methods we're asked to time, as (object, methodName, label) tuples
+		self._targets = []
+
+		# maps label to a deque of per-frame times in ms, we always time the whole frame
+		self._samples = {FrameProfiler.FRAME: deque(maxlen=windowSize)}
+
+		# maps label to the time spent in it so far this frame, in seconds
+		self._frameTotals = {}
+
+		# when the current frame started, None if we're not in a frame
+		self._frameStart = None
+
+		# time spent drawing our overlay this frame, in seconds, which we leave out of the frame's time
+		self._overlayTime = 0.0
+
+		# font for our overlay, loaded the first time we need it
+		self._font = None
+
+		# how often our overlay re-renders its stats, in ms
+		self.overlayRefreshInMS = 250
+
+		# our overlay's last rendered table, & when we rendered it (from time.perf_counter), None till the first
+		self._overlaySurface = None
+		self._overlayRenderedAt = None
+
+
+	# registers a method to be timed
+	def instrument(self, obj, methodName, label=None):
+		"""Registers a method on an object to be timed while the profiler is enabled
+
+		Args:
+			obj (Object): the object that owns the method
+			methodName (str): the name of the method to time
+			label (str, optional): name to report the timings under. Defaults to ClassName.methodName.
+		"""
+
+		# default label is the class & method name
+		label = label or f"{type(obj).__name__}.{methodName}"
+
+		self._targets.append((obj, methodName, label))
+		self._samples.setdefault(label, deque(maxlen=self.windowSize))
+
+		# if we're already running, wrap it now
+		if self.enabled is True:
+			self._wrap(obj, methodName, label)
+
+
+	# turns the profiler on
+	def enable(self):
+		"""Starts timing all our instrumented methods
+		"""
+
+		# already on
+		if self.enabled is True:
+			return
+
+		self.enabled = True
+		for obj, methodName, label in self._targets:
+			self._wrap(obj, methodName, label)
+
+
+	# turns the profiler off
+	def disable(self):
+		"""Stops timing our instrumented methods and restores the originals
+		"""
+
+		# already off
+		if self.enabled is False:
+			return
+
+		self.enabled = False
+		self._frameStart = None
+
+		# our wrappers are set on the instance, so deleting them reveals the class's method again
+		for obj, methodName, label in self._targets:
+			if methodName in vars(obj):
+				delattr(obj, methodName)
+
+
+	# replaces a method on an object with a timed version
+	def _wrap(self, obj, methodName, label):
+		"""Shadows a method on an object with a wrapper that adds its run time to this frame's totals
+
+		Args:
+			obj (Object): the object that owns the method
+			methodName (str): the name of the method to time
+			label (str): name to report the timings under
+		"""
+
+		original = getattr(obj, methodName)
+		frameTotals = self._frameTotals
+		perfCounter = time.perf_counter
+
+		def timed(*args, **kwargs):
+			start = perfCounter()
+			try:
+				return original(*args, **kwargs)
+			finally:
+				frameTotals[label] = frameTotals.get(label, 0.0) + (perfCounter() - start)
+
+		setattr(obj, methodName, timed)
+
+
+	# marks the start of a frame
+	def begin_frame(self):
+		"""Call at the start of every frame while enabled
+		"""
+
+		self._frameTotals.clear()
+		self._overlayTime = 0.0
+		self._frameStart = time.perf_counter()
+
+
+	# marks the end of a frame & saves this frame's samples
+	def end_frame(self):
+		"""Call at the end of every frame while enabled, saves this frame's timings to our rolling windows
+		"""
+
+		# frame wasn't started (for instance, we were enabled mid-frame)
+		if self._frameStart is None:
+			return
+
+		self._frameTotals[FrameProfiler.FRAME] = time.perf_counter() - self._frameStart - self._overlayTime
+		self._frameStart = None
+
+		# save a sample for every label, even if it wasn't called this frame, so the windows stay in sync
+		for label, samples in self._samples.items():
+			samples.append(self._frameTotals.get(label, 0.0) * 1000)
+
+
+	# works out stats for all our labels
+	def summary(self):
+		"""Gets rolling stats for every label we time
+
+		Returns:
+			dict: maps label to a dict of p50/p95/p99/mean/max (in ms) and sample count
+		"""
+
+		stats = {}
+		for label, samples in self._samples.items():
+
+			# nothing to report yet
+			if len(samples) == 0:
+				continue
+
+			ordered = sorted(samples)
+			stats[label] = {
+				"p50": FrameProfiler._percentile(ordered, 50),
+				"p95": FrameProfiler._percentile(ordered, 95),
+				"p99": FrameProfiler._percentile(ordered, 99),
+				"mean": sum(ordered) / len(ordered),
+				"max": ordered[-1],
+				"samples": len(ordered),
+			}
+
+		return stats
+
+
+	# nearest-rank percentile of a sorted list
+	@staticmethod
+	def _percentile(ordered, percent):
+		index = int(round((percent / 100) * (len(ordered) - 1)))
+		return ordered[index]
+
+
+	# writes our stats & raw samples out as JSON
+	def dump_json(self, path):
+		"""Writes our summary & raw per-frame samples to a JSON file
+
+		Args:
+			path (str): file to write
+		"""
+
+		data = {
+			"summary": self.summary(),
+			"samples": {label: list(samples) for label, samples in self._samples.items()},
+		}
+
+		with open(path, "w") as file:
+			json.dump(data, file, indent=2)
+
+
+	# writes our stats out as CSV
+	def dump_csv(self, path):
+		"""Writes our summary to a CSV file, one row per label
+
+		Args:
+			path (str): file to write
+		"""
+
+		columns = ["p50", "p95", "p99", "mean", "max", "samples"]
+
+		with open(path, "w", newline="") as file:
+			writer = csv.writer(file)
+			writer.writerow(["label"] + columns)
+			for label, stats in self.summary().items():
+				writer.writerow([label] + [stats[column] for column in columns])
+
+
+	# draws our stats on screen
+	def draw_overlay(self, surface):
+		"""Draws a little table of our rolling stats in the top left of a surface.
+		   The table is only re-rendered every overlayRefreshInMS, in between we blit the last one
+
+		Args:
+			surface (Surface): the surface to draw on
+
+		Returns:
+			Rect|None: the area drawn to, or None if there was nothing to draw
+		"""
+
+		start = time.perf_counter()
+
+		# time for a fresh table?
+		if self._overlayRenderedAt is None or (start - self._overlayRenderedAt) * 1000 >= self.overlayRefreshInMS:
+			self._overlaySurface = self._render_overlay(surface)
+			self._overlayRenderedAt = start
+
+		area = None
+		if self._overlaySurface is not None:
+			area = surface.blit(self._overlaySurface, (0, 0))
+
+		# don't count ourselves in the frame's time
+		self._overlayTime += time.perf_counter() - start
+
+		return area
+
+
+	# renders our stats table
+	def _render_overlay(self, surface):
+		"""Renders a table of our rolling stats onto a new surface
+
+		Args:
+			surface (Surface): the surface it'll be drawn on, so we can match its pixel format
+
+		Returns:
+			Surface|None: the table, or None if there was nothing to render
+		"""
+
+		stats = self.summary()
+		if len(stats) == 0:
+			return None
+
+		# load our font once
+		if self._font is None:
+			self._font = sharedAssetManager.load_font("./fonts/framd.ttf", 14)
+
+		# one row per label, each column rendered on its own since our font isn't monospaced
+		rows = [["label", "p50", "p95", "p99"]]
+		for label, stat in stats.items():
+			rows.append([label, f"{stat['p50']:.2f}", f"{stat['p95']:.2f}", f"{stat['p99']:.2f}"])
+
+		# where each column starts, the label column is the widest
+		columnXs = [5, 225, 285, 345]
+		lineHeight = self._font.get_linesize()
+		table = pygame.Surface((400, (lineHeight * len(rows)) + 10), 0, surface)
+
+		# draw the text over a dark box so it's readable
+		table.fill((0, 0, 0))
+		for rowIndex, row in enumerate(rows):
+			for columnIndex, cell in enumerate(row):
+				text = self._font.render(cell, True, (0, 255, 0))
+				table.blit(text, (columnXs[columnIndex], 5 + (rowIndex * lineHeight)))
+
+		return table
@@ -0,0 +1,110 @@
+"""
+	GameClock.py
+	------------
+
+	This file/module provides the clocks our game reads the time from.
+
+	Things like particle life times and the player's breathing animation need to know what time it is.
+
+	Rather than asking pygame directly, they ask the game's clock. That way, we can swap in a clock
+	that isn't tied to the wall at all, for instance to run the game headless as fast as the CPU allows.
+
+	This file/module provides two classes:
+
+	GameClock, which is the real-time clock the normal game uses,
+
+	and SimulatedClock, which only moves forward when it's told to.
+"""
+
+# for real time
+import pygame
+
+# the real-time clock
+class GameClock:
+
+	# constructor
+	def __init__(self):
+		"""Constructs the real-time GameClock
+		"""
+
+		# pygame clock, for it's framerate timing logic
+		self._pygameClock = pygame.time.Clock()
+
+
+	# gets the time in ms
+	def get_ticks(self):
+		"""Gets the time in milliseconds since pygame was initialized
+
+		Returns:
+			Number: time in ms
+		"""
+
+		return pygame.time.get_ticks()
+
+
+	# waits until its time for the next frame
+	def tick(self, targetFPS):
+		"""Sleeps as long as needed to target a framerate
+		   (FYI pygame clocks will automatically sleep the amount required to target a FPS)
+
+		Args:
+			targetFPS (Number): the framerate we're aiming for
+
+		Returns:
+			Number: ms since the last tick
+		"""
+
+		return self._pygameClock.tick(targetFPS)
+
+
+# the clock for simulations
+class SimulatedClock:
+
+	# constructor
+	def __init__(self, startTimeInMS=0):
+		"""Constructs a SimulatedClock
+
+		Args:
+			startTimeInMS (int, optional): what time it is when we start. Defaults to 0.
+		"""
+
+		# the current time, can be fractional since 1000/60 isn't a whole number
+		self._timeInMS = startTimeInMS
+
+
+	# gets the time in ms
+	def get_ticks(self):
+		"""Gets the simulated time in whole milliseconds, just like pygame.time.get_ticks()
+
+		Returns:
+			int: time in ms
+		"""
+
+		return int(self._timeInMS)
+
+
+	# moves time forward
+	def advance(self, ms):
+		"""Moves the simulated time forward
+
+		Args:
+			ms (Number): how many milliseconds to move forward
+		"""
+
+		self._timeInMS += ms
+
+
+	# moves time forward by one frame, without sleeping
+	def tick(self, targetFPS):
+		"""Moves the simulated time forward by exactly one frame, and returns straight away
+
+		Args:
+			targetFPS (Number): the framerate we're simulating
+
+		Returns:
+			Number: ms the clock moved forward
+		"""
+
+		frameTime = 1000 / targetFPS
+		self.advance(frameTime)
+		return frameTime
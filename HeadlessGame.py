@@ -0,0 +1,182 @@
+"""
+	HeadlessGame.py
+	---------------
+
+	This file/module provides a stand-in for our MazeGame class that runs the game play scene without a window.
+
+	MazeGame opens a window, and then runs its main loop in real-time, at 60 FPS, until someone quits.
+
+	That's great for playing, but not for running thousands of scripted sessions on a box with no display.
+
+	So instead, this class:
+		- uses SDL's "dummy" video driver, so no window is ever opened
+		- runs the game on a SimulatedClock, that moves forward exactly one frame per step
+		- steps as fast as the CPU allows, for as many frames as we ask
+		- optionally skips rendering entirely, so only the simulation (player, particles, collision) runs
+
+	It has the same bits of interface our scenes expect from the game (clock, quit_game, start_game),
+	so the GameScreen doesn't know the difference.
+"""
+
+# we need to pick the video driver before pygame's display gets initialized
+import os
+
+# we're gonna use pygame for our rendering, etc
+import pygame
+
+# the clock that only moves when we tell it to
+from GameClock import SimulatedClock
+
+# the scene we simulate
+from SceneGame import GameScreen
+
+# for seeing where our frames go
+from FrameProfiler import FrameProfiler
+
+# where our player's input comes from
+from InputSource import InputSource
+
+# headless game class
+class HeadlessMazeGame:
+
+	# constructor
+	def __init__(self, levelPath='./levels/level_02/map.png', resolution=(900, 650), targetFPS=60, render=False, dirtyRects=False, inputSource=None, fog=False, minimap=False, seed=0):
+		"""Constructor for the HeadlessMazeGame
+
+		Args:
+			levelPath (str, optional): path to the map image of the level to play. Defaults to level 02.
+			resolution (Tuple, optional): size of the (invisible) window. Defaults to (900, 650).
+			targetFPS (int, optional): the framerate we simulate, i.e. how far the clock moves per step. Defaults to 60.
+			render (bool, optional): set true to also render every step. Defaults to False.
+			dirtyRects (bool, optional): set true to use dirty rectangle rendering in the game screen. Defaults to False.
+			inputSource (InputSource, optional): where the player's input comes from, like an InputPlayback.
+												 Defaults to None, for no input at all (so scripts can drive the player).
+			fog (bool, optional): set true for fog of war, like the real game has. Defaults to False.
+			minimap (bool, optional): set true to draw the minimap, like the real game does. Defaults to False.
+			seed (int, optional): seed for the game screen's randomness, pass a recording's seed to replay it exactly. Defaults to 0.
+		"""
+
+		# save our settings
+		self._resolution = resolution
+		self._targetFPS = targetFPS
+		self.render = render
+
+		# true until something tells us to quit
+		self._run = True
+
+		# how many steps we've simulated
+		self.frameCount = 0
+
+		# our time only moves forward when we step
+		self.clock = SimulatedClock()
+
+		# frame profiler, disabled until someone enables it
+		self.profiler = FrameProfiler()
+
+		# no keyboard here, so our input comes from whatever we were given
+		self.input = inputSource or InputSource()
+
+		# set up pygame without a window
+		self._win = self._setup_pygame()
+
+		# build the game play scene, & enter it like our scene manager would
+		self.scene = GameScreen(self, self._win, levelPath, dirtyRects, fog=fog, minimap=minimap, seed=seed)
+		self.scene.instrument(self.profiler)
+		self.scene.scene_enter()
+
+
+	# set up pygame
+	def _setup_pygame(self):
+		"""Sets up pygame with the dummy video driver, so we get a surface to render to, but no window
+
+		Returns:
+			Surface: the pygame (off-screen) window surface for rendering
+		"""
+
+		# unless someone already picked a driver, use the one that doesn't need a display
+		os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+		# with the dummy driver, this just gives us an off screen surface
+		# (we still want the display initialized, since our scenes poll events & keys)
+		return pygame.display.set_mode(self._resolution)
+
+
+	# public method to let the game be quit
+	def quit_game(self):
+		"""Stops run() after the current step
+		"""
+
+		# set our loop condition variable false
+		self._run = False
+
+
+	# the title screen would call this, we're always in the game scene so nothing to do
+	def start_game(self):
+		"""Does nothing, we're always in the game scene
+		"""
+		pass
+
+
+	# simulates exactly one frame
+	def step(self):
+		"""Moves the clock forward one frame, then updates (and optionally renders) the scene
+		"""
+
+		# move time forward by one frame, without sleeping
+		self.clock.tick(self._targetFPS)
+
+		# time this frame, if we're profiling
+		profiling = self.profiler.enabled
+		if profiling:
+			self.profiler.begin_frame()
+
+		# update scene logic
+		self.scene.update()
+
+		# render scene, if we were asked to
+		if self.render is True:
+			self.scene.render()
+
+		if profiling:
+			self.profiler.end_frame()
+
+		self.frameCount += 1
+
+
+	# simulates a bunch of frames as fast as we can
+	def run(self, frames, script=None):
+		"""Steps the simulation for a number of frames, or until quit_game() is called
+
+		Args:
+			frames (int): how many frames to simulate
+			script (function, optional): called as script(frameIndex, scene) before every step,
+										 so it can drive the player or whatever else. Defaults to None.
+
+		Returns:
+			int: how many frames were actually simulated
+		"""
+
+		# allow us to run again after a previous quit
+		self._run = True
+
+		framesRun = 0
+		while self._run and framesRun < frames:
+
+			# let the script do its thing
+			if script is not None:
+				script(framesRun, self.scene)
+
+			self.step()
+			framesRun += 1
+
+		return framesRun
+
+
+	# shut down pygame when we're done
+	def close(self):
+		"""Exits the scene and shuts down pygame
+		"""
+
+		self.scene.scene_exit()
+		self.input.close()
+		pygame.quit()
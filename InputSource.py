@@ -0,0 +1,247 @@
+"""
+	InputSource.py
+	--------------
+
+	This file/module provides where our player's input comes from, so it doesn't have to come from the keyboard.
+
+	Rather than asking pygame which keys are down, the player asks the game's input source which actions are down.
+	Once per frame the source is polled, and it boils whatever it reads down to a bitmask of actions (see ACTIONS).
+
+	That way, we can record exactly what was held each frame to a file, and play it back later, frame for frame.
+	Played back on a SimulatedClock (see GameClock.py & HeadlessGame.py), a session plays out exactly the same
+	every time, which makes for a fair before & after when benchmarking an optimization.
+
+	Recordings are tiny: a 16 byte header (magic b"MZIN", version, fps, frame count, seed), then one byte per frame.
+	The seed is the game screen's (see GameScreen.rng), so anything random, like which way particles face, replays the same too.
+
+	This file/module provides four classes:
+
+	InputSource, the base class, which never has anything held down (handy for headless runs driven by scripts),
+
+	KeyboardInput, which reads the keyboard,
+
+	InputRecorder, which passes another source's input through, saving every frame of it to a file,
+
+	and InputPlayback, which plays a recording back.
+"""
+
+# for our recording header
+import struct
+
+# we're gonna use pygame for reading keys
+import pygame
+
+# base input source, nothing is ever held
+class InputSource:
+
+	# action bits, a frame's input is these OR'd together
+	LEFT = 1
+	RIGHT = 2
+	UP = 4
+	DOWN = 8
+	STRAFE = 16
+	FIRE = 32
+
+	# constructor
+	def __init__(self):
+		"""Constructs the input source, with nothing held
+		"""
+
+		# bitmask of the actions held this frame
+		self.state = 0
+
+
+	# reads this frame's input
+	def poll(self):
+		"""Reads the input for a new frame. Call once per frame, before anything checks is_down()
+
+		Returns:
+			int: bitmask of the actions held this frame
+		"""
+
+		self.state = self._read()
+		return self.state
+
+
+	# gets the actions held right now, overloaded by child classes
+	def _read(self):
+		return 0
+
+
+	# checks an action
+	def is_down(self, action):
+		"""Checks if an action was held this frame
+
+		Args:
+			action (int): one of our action bits
+
+		Returns:
+			bool: True if it's held
+		"""
+
+		return (self.state & action) != 0
+
+
+	# let go of anything we're holding on to, overloaded by child classes
+	def close(self):
+		pass
+
+
+# keyboard input
+class KeyboardInput(InputSource):
+
+	# which keys map to which actions
+	KEYS = {
+		InputSource.LEFT: [pygame.K_LEFT, pygame.K_a],
+		InputSource.RIGHT: [pygame.K_RIGHT, pygame.K_d],
+		InputSource.UP: [pygame.K_UP, pygame.K_w],
+		InputSource.DOWN: [pygame.K_DOWN, pygame.K_s],
+		InputSource.STRAFE: [pygame.K_LSHIFT, pygame.K_RSHIFT],
+		InputSource.FIRE: [pygame.K_SPACE],
+	}
+
+	# reads the keyboard
+	def _read(self):
+		"""Turns the keys held right now into a bitmask of actions
+
+		Returns:
+			int: bitmask of actions
+		"""
+
+		activeKeys = pygame.key.get_pressed()
+
+		state = 0
+		for action, keys in KeyboardInput.KEYS.items():
+			for key in keys:
+				if activeKeys[key]:
+					state |= action
+					break
+
+		return state
+
+
+# records another source
+class InputRecorder(InputSource):
+
+	# first 4 bytes of every recording
+	MAGIC = b"MZIN"
+
+	# bump this if the layout changes
+	VERSION = 2
+
+	# magic, version, fps, frame count, seed
+	HEADER = struct.Struct("<4sHHII")
+
+	# version 1 didn't have the seed
+	HEADER_V1 = struct.Struct("<4sHHI")
+
+	# constructor
+	def __init__(self, source, path, fps=60, seed=0):
+		"""Starts recording another input source to a file
+
+		Args:
+			source (InputSource): where the input actually comes from
+			path (str): file to record to
+			fps (int, optional): the framerate we're recorded at, so playback can run at the same. Defaults to 60.
+			seed (int, optional): the seed the game screen was made with, so playback can use the same. Defaults to 0.
+		"""
+
+		super().__init__()
+
+		self._source = source
+		self._fps = fps
+		self.seed = seed
+		self.frameCount = 0
+
+		# write a header now, we'll fill in the frame count when we're closed
+		self._file = open(path, "wb")
+		self._file.write(InputRecorder.HEADER.pack(InputRecorder.MAGIC, InputRecorder.VERSION, fps, 0, seed))
+
+
+	# reads our source, & saves what it read
+	def _read(self):
+		state = self._source.poll()
+		self._file.write(bytes((state,)))
+		self.frameCount += 1
+		return state
+
+
+	# finishes the recording
+	def close(self):
+		"""Fills in the frame count & closes the file. Safe to call more than once
+		"""
+
+		if self._file.closed:
+			return
+
+		self._file.seek(0)
+		self._file.write(InputRecorder.HEADER.pack(InputRecorder.MAGIC, InputRecorder.VERSION, self._fps, self.frameCount, self.seed))
+		self._file.close()
+		self._source.close()
+
+
+# plays back a recording
+class InputPlayback(InputSource):
+
+	# constructor
+	def __init__(self, path):
+		"""Loads a recording made by InputRecorder
+
+		Args:
+			path (str): the recording to play back
+		"""
+
+		super().__init__()
+
+		with open(path, "rb") as file:
+			data = file.read()
+
+		header = InputRecorder.HEADER_V1
+		if len(data) < header.size:
+			raise ValueError(f"{path} is too short to be an input recording")
+
+		magic, version, fps, frameCount = header.unpack_from(data)
+		if magic != InputRecorder.MAGIC:
+			raise ValueError(f"{path} is not an input recording")
+
+		# version 1 recordings didn't save a seed, so they get the default
+		seed = 0
+		if version == InputRecorder.VERSION:
+			header = InputRecorder.HEADER
+			if len(data) < header.size:
+				raise ValueError(f"{path} is too short to be an input recording")
+			magic, version, fps, frameCount, seed = header.unpack_from(data)
+		elif version != 1:
+			raise ValueError(f"{path} is input recording version {version}, we only read versions 1 to {InputRecorder.VERSION}")
+
+		# the framerate it was recorded at, & the seed the game screen was made with, play back with these for the same results
+		self.fps = fps
+		self.seed = seed
+
+		# one byte per frame
+		# (if the game quit without closing the recorder, the count was never filled in, so trust the file instead)
+		self._frames = data[header.size:header.size + frameCount] if frameCount > 0 else data[header.size:]
+		self._frameIndex = 0
+
+
+	# how many frames we have
+	def __len__(self):
+		return len(self._frames)
+
+
+	# true once we've played every frame
+	@property
+	def finished(self):
+		return self._frameIndex >= len(self._frames)
+
+
+	# plays the next frame
+	def _read(self):
+
+		# after the end, nothing is held
+		if self.finished:
+			return 0
+
+		state = self._frames[self._frameIndex]
+		self._frameIndex += 1
+		return state
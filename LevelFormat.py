@@ -0,0 +1,203 @@
+"""
+	LevelFormat.py
+	--------------
+
+	This file/module provides our compact binary level format (.maze files), and a converter from our PNG levels.
+
+	PNG levels have to be decoded, and then classified pixel by pixel, every time they're loaded.
+	A .maze file is just the tiles, already classified, one byte each, behind a small header:
+
+		header     magic b"MAZE", version, flags, width, height, spawn count, metadata length
+		           (little-endian, see LevelFormat.HEADER)
+		spawns     spawn count pairs of (x, y) in world pixels, as signed 32 bit ints
+		metadata   metadata length bytes of UTF-8 JSON, for things like the level's name
+		tiles      width * height tile ids, one byte each, row-major, the same layout as Map's grid
+
+	So loading one is reading a few bytes of header, and then reading the tiles straight into our grid.
+	And since the tiles are raw & row-major, huge levels can be streamed straight from the file (see MapStream.py).
+
+	Usage, to convert a PNG level (from the root of the repo):
+
+		python LevelFormat.py levels/level_02/map.png [--output levels/level_02/map.maze] [--spawn 512 396]
+"""
+
+# for our command line
+import argparse
+
+# for our metadata
+import json
+
+# for making output paths
+import os
+
+# for packing our header
+import struct
+
+# main level format class
+class LevelFormat:
+
+	# extension of level files
+	EXTENSION = ".maze"
+
+	# first 4 bytes of every level file
+	MAGIC = b"MAZE"
+
+	# bump this if the layout changes
+	VERSION = 1
+
+	# magic, version, flags, width, height, spawn count, metadata length
+	HEADER = struct.Struct("<4sHHIIII")
+
+	# a spawn point, x & y in world pixels
+	SPAWN = struct.Struct("<ii")
+
+
+	# checks if a path is one of our level files
+	@staticmethod
+	def is_level_file(path):
+		return path.lower().endswith(LevelFormat.EXTENSION)
+
+
+	# writes a level file
+	@staticmethod
+	def save(path, width, height, tiles, spawns=None, metadata=None):
+		"""Writes a level to disk in our binary format
+
+		Args:
+			path (str): file to write
+			width (int): width of the map, in tiles
+			height (int): height of the map, in tiles
+			tiles (bytes|bytearray): width * height tile ids, row-major
+			spawns (List, optional): (x, y) spawn points in world pixels. Defaults to None.
+			metadata (dict, optional): anything else worth saving, must be JSON-able. Defaults to None.
+		"""
+
+		if len(tiles) != width * height:
+			raise ValueError(f"expected {width * height} tiles for a {width}x{height} map, got {len(tiles)}")
+
+		spawns = spawns or []
+		metadataBytes = json.dumps(metadata or {}).encode("utf-8")
+
+		with open(path, "wb") as file:
+			file.write(LevelFormat.HEADER.pack(
+				LevelFormat.MAGIC,
+				LevelFormat.VERSION,
+				0,
+				width,
+				height,
+				len(spawns),
+				len(metadataBytes)))
+
+			for spawn in spawns:
+				file.write(LevelFormat.SPAWN.pack(int(spawn[0]), int(spawn[1])))
+
+			file.write(metadataBytes)
+			file.write(tiles)
+
+
+	# reads everything but the tiles
+	@staticmethod
+	def read_header(path):
+		"""Reads a level file's header, spawns & metadata, without reading its tiles
+
+		Args:
+			path (str): level file to read
+
+		Returns:
+			dict: width, height, spawns (list of (x, y) tuples), metadata (dict),
+				  and tileOffset (where the tiles start in the file)
+		"""
+
+		with open(path, "rb") as file:
+			return LevelFormat._read_header(file, path)
+
+
+	# reads a whole level
+	@staticmethod
+	def load(path):
+		"""Reads a level file, with its tiles read straight into a new bytearray
+
+		Args:
+			path (str): level file to read
+
+		Returns:
+			Tuple: (header, tiles) where header is as read_header() returns, and tiles is a row-major bytearray
+		"""
+
+		with open(path, "rb") as file:
+			header = LevelFormat._read_header(file, path)
+
+			# read the tiles straight into the grid we'll use, rather than into bytes & then copying
+			tiles = bytearray(header["width"] * header["height"])
+			if file.readinto(tiles) != len(tiles):
+				raise ValueError(f"{path} is truncated, expected {len(tiles)} tiles")
+
+		return (header, tiles)
+
+
+	# does the work for read_header & load
+	@staticmethod
+	def _read_header(file, path):
+		"""Reads the header, spawns & metadata from an open level file, leaving it positioned at the tiles
+
+		Args:
+			file (File): the open file, at the start
+			path (str): the file's path, for errors
+
+		Returns:
+			dict: see read_header()
+		"""
+
+		headerBytes = file.read(LevelFormat.HEADER.size)
+		if len(headerBytes) != LevelFormat.HEADER.size:
+			raise ValueError(f"{path} is too short to be a level file")
+
+		magic, version, flags, width, height, spawnCount, metadataLength = LevelFormat.HEADER.unpack(headerBytes)
+		if magic != LevelFormat.MAGIC:
+			raise ValueError(f"{path} is not a level file")
+		if version != LevelFormat.VERSION:
+			raise ValueError(f"{path} is level format version {version}, we only read version {LevelFormat.VERSION}")
+
+		spawnBytes = file.read(LevelFormat.SPAWN.size * spawnCount)
+		spawns = [spawn for spawn in LevelFormat.SPAWN.iter_unpack(spawnBytes)]
+
+		metadata = json.loads(file.read(metadataLength).decode("utf-8"))
+
+		return {
+			"width": width,
+			"height": height,
+			"spawns": spawns,
+			"metadata": metadata,
+			"tileOffset": LevelFormat.HEADER.size + len(spawnBytes) + metadataLength,
+		}
+
+
+# run from the command line, to convert PNG levels
+if __name__ == "__main__":
+
+	# only needed for converting
+	import pygame
+	from Map import Map
+
+	parser = argparse.ArgumentParser(description="Converts a PNG level to our binary .maze level format")
+	parser.add_argument("input", help="PNG level to convert")
+	parser.add_argument("--output", help="file to write, defaults to the input with a .maze extension")
+	parser.add_argument("--spawn", type=int, nargs=2, action="append", metavar=("X", "Y"),
+						help="spawn point in world pixels, can be given more than once")
+	args = parser.parse_args()
+
+	outputPath = args.output or (os.path.splitext(args.input)[0] + LevelFormat.EXTENSION)
+
+	# classify the image exactly like Map does when it loads a PNG
+	image = pygame.image.load(args.input)
+	tiles = Map.tiles_from_surface(image)
+
+	LevelFormat.save(
+		outputPath,
+		image.get_width(),
+		image.get_height(),
+		tiles,
+		args.spawn,
+		{"source": args.input})
+
+	print(f"Saved {image.get_width()}x{image.get_height()} level to {outputPath}")
@@ -13,13 +13,26 @@
 """
 
 # for dat geometry
-from email.iterators import typed_subpart_iterator
 import math
-from turtle import left
 
 # pygame for Vector 2 & etc
 import pygame
 
+# pre-rendered regions of the map, so we don't blit every tile every frame
+from MapChunkCache import MapChunkCache
+
+# shared, pre-converted images
+from AssetManager import sharedAssetManager
+
+# for maps too big to keep in memory
+from MapStream import TileStream
+
+# our binary level files
+from LevelFormat import LevelFormat
+
+# so others can find out when tiles change
+from Events import Events
+
 # main map class
 class Map:
 
@@ -31,6 +44,22 @@ class Map:
 	# for now our title size will be constant
 	TILE_SIZE = 128
 
+	# how many stream chunks out from the camera & player we keep loaded, when streaming
+	STREAM_PREFETCH_RADIUS = 1
+
+	# most times resolve_circle goes round pushing out of tiles
+	CIRCLE_RESOLVE_PASSES = 3
+
+	# level files with more tiles than this are streamed, rather than loaded into memory (16MB worth)
+	STREAM_THRESHOLD_IN_TILES = 4096 * 4096
+
+	# images for our tiles, indexed by tile id
+	IMAGE_PATHS = [
+		'./img/map/tiles_smol_stones.png',
+		'./img/map/tiles_beeg_stones.png',
+		'./img/map/tiles_dark_stone.png',
+	]
+
 
 	# constructor
 	def __init__(self, scene, win):	
@@ -45,12 +74,34 @@ class Map:
 		self._scene = scene
 		self._win = win
 
+		# public events for others to subscribe to
+		self.events = Events(["onTileChanged"])
+
 		# initialize the pygome stuff we'll need (like image tiles, etc)
 		self._setup_pygame()
 
 		# None until a map is loaded, after, reference to pygame image surface
 		self._mapImage = None
 
+		# None until a map is loaded, after, a flat row-major bytearray of tile ids (see _build_tile_grid)
+		self._tiles = None
+		self._mapW = 0
+		self._mapH = 0
+
+		# None unless we're streaming a map too big for memory, in which case we read tiles through this instead
+		self._stream = None
+
+		# where players can start, in world pixels, & anything else the level file told us (PNG maps have neither)
+		self.spawns = []
+		self.metadata = {}
+
+		# cache of pre-rendered chunks of tiles that draw_map() blits instead of individual tiles
+		self._chunkCache = MapChunkCache(self)
+		self._chunkCache.set_tile_size(Map.TILE_SIZE)
+
+		# None for no fog of war, otherwise the FieldOfView that decides which tiles we draw (see set_fog)
+		self.fog = None
+
 
 	# initialize pygame stuff in this method to  declutter constructor
 	def _setup_pygame(self):
@@ -58,26 +109,226 @@ class Map:
 		"""
 
 		# load the varius kinds of tiles we use, this time instead of named, we'll use indicies cuz y not
-		self._images = [
-			pygame.image.load('./img/map/tiles_smol_stones.png'),
-			pygame.image.load('./img/map/tiles_beeg_stones.png'),
-			pygame.image.load('./img/map/tiles_dark_stone.png'),
-		]
+		# (tiles are solid, so no need for per-pixel alpha)
+		self._images = [sharedAssetManager.load_image(path, False) for path in Map.IMAGE_PATHS]
 
 
 	# public method to load a maze png to use as our map
 	def load_map(self, pathToMapImage):
-		"""Loads image to use as map
+		"""Loads image to use as map. Also accepts our binary level files (see LevelFormat.py)
+
+		Args:
+			pathToMapImage (str): path to image (or .maze level file) to load
+		"""
+
+		# level files skip all the image business
+		if LevelFormat.is_level_file(pathToMapImage):
+			self._load_level_file(pathToMapImage)
+			return
+
+		# stop streaming the old map, if we were
+		self._close_stream()
+
+		# images don't have spawns or metadata
+		self.spawns = []
+		self.metadata = {}
+
+		# load the map image (unconverted, since we read its pixels rather than draw it):
+		self._mapImage = sharedAssetManager.load_image(pathToMapImage, convert=False)
+
+		# classify every pixel once up front, so tile lookups are just an index into a flat grid
+		self._build_tile_grid()
+
+		# that's all we needed the image for, so don't keep it (or let the asset manager keep it) around
+		self._mapImage = None
+		sharedAssetManager.unload(pathToMapImage)
+
+		# any chunks we pre-rendered belonged to the old map
+		self._chunkCache.clear()
+
+
+	# loads one of our binary level files
+	def _load_level_file(self, path):
+		"""Loads a .maze level file, reading its tiles straight into our grid,
+		   or streaming them from the file if the level is too big to keep in memory
+
+		Args:
+			path (str): level file to load
+		"""
+
+		header = LevelFormat.read_header(path)
+
+		# too big, stream it (tiles in level files are laid out exactly like a raw tile file, just after the header)
+		if header["width"] * header["height"] > Map.STREAM_THRESHOLD_IN_TILES:
+			self.load_stream(path, header["width"], header["height"], header["tileOffset"])
+
+		else:
+			header, tiles = LevelFormat.load(path)
+			self.load_grid(tiles, header["width"], header["height"])
+
+		self.spawns = header["spawns"]
+		self.metadata = header["metadata"]
+
+
+	# public method to use a grid of tiles we already have as our map, for instance from MazeGenerator
+	def load_grid(self, tiles, width, height, spawns=None):
+		"""Uses a flat, row-major grid of tile ids as our map, as is (it isn't copied)
+
+		Args:
+			tiles (bytearray): width * height tile ids
+			width (int): width of the map, in tiles
+			height (int): height of the map, in tiles
+			spawns (List, optional): (x, y) spawn points, in world pixels. Defaults to None.
+		"""
+
+		# stop streaming the old map, if we were
+		self._close_stream()
+
+		self._mapImage = None
+		self._tiles = tiles
+		self._mapW = width
+		self._mapH = height
+
+		self.spawns = spawns or []
+		self.metadata = {}
+
+		# any chunks we pre-rendered belonged to the old map
+		self._chunkCache.clear()
+
+
+	# public method to stream a map from a raw tile file, rather than loading it all
+	def load_stream(self, pathToTiles, width, height, offset=0, chunkSizeInTiles=64, maxChunks=64):
+		"""Streams the map from a raw tile file (see MapStream.py), for maps too big to keep in memory.
+		   Only the chunks around the camera & player (see update()) are kept loaded.
+
+		Args:
+			pathToTiles (str): path to the file of tiles, one byte per tile, row-major
+			width (int): width of the map, in tiles
+			height (int): height of the map, in tiles
+			offset (int, optional): where in the file the tiles start. Defaults to 0.
+			chunkSizeInTiles (int, optional): width & height of a streamed chunk, in tiles. Defaults to 64.
+			maxChunks (int, optional): how many streamed chunks to keep in memory at once. Defaults to 64.
+		"""
+
+		# stop streaming the old map, if we were
+		self._close_stream()
+
+		self._stream = TileStream(pathToTiles, width, height, offset, chunkSizeInTiles, maxChunks)
+
+		# we don't have an image or grid for streamed maps
+		self._mapImage = None
+		self._tiles = None
+		self._mapW = width
+		self._mapH = height
+
+		# any chunks we pre-rendered belonged to the old map
+		self._chunkCache.clear()
+
+
+	# stops streaming, if we were
+	def _close_stream(self):
+		if self._stream is not None:
+			self._stream.close()
+			self._stream = None
+
+
+	# per-frame upkeep
+	def update(self):
+		"""Keeps the streamed chunks around the camera & player loaded. Does nothing for maps in memory
+		"""
+
+		# nothing to stream
+		if self._stream is None:
+			return
+
+		tileSize = Map.TILE_SIZE
+		for pos in (self._scene.camera.pos, self._scene.player.pos):
+			self._stream.prefetch(int(pos[0] // tileSize), int(pos[1] // tileSize), Map.STREAM_PREFETCH_RADIUS)
+
+
+	# our tile grid, for things that want to walk over all of it (like pathfinding)
+	@property
+	def tiles(self):
+		"""The flat, row-major bytearray of tile ids, or None if no map is loaded or it's streamed
+		"""
+		return self._tiles
+
+	@property
+	def width_in_tiles(self):
+		return self._mapW
+
+	@property
+	def height_in_tiles(self):
+		return self._mapH
+
+
+	# public method to change a tile
+	def set_tile(self, x, y, tile):
+		"""Changes a tile on the map (i.e. to open or close a wall) & lets anyone listening know
+
+		Args:
+			x (int): x position on the map, in tiles
+			y (int): y position on the map, in tiles
+			tile (Number): the new tile id
+		"""
+
+		# streamed maps are read only
+		if self._tiles is None:
+			raise ValueError("can only change tiles on maps loaded into memory")
+
+		if x < 0 or x >= self._mapW or y < 0 or y >= self._mapH:
+			raise IndexError(f"tile {x}, {y} is outside the map")
+
+		index = y * self._mapW + x
+		oldTile = self._tiles[index]
+		if oldTile == tile:
+			return
+
+		self._tiles[index] = tile
+
+		# re-render the chunk it's in next time it's drawn
+		self._chunkCache.invalidate_tile(x, y)
+
+		self.events.onTileChanged.fire(x, y, oldTile, tile)
+
+
+	# converts our loaded map image into a compact grid of tile ids
+	def _build_tile_grid(self):
+		"""Samples the map image once and stores a tile id per pixel in a flat, row-major bytearray.
+
+			Sampling the surface with get_at() is slow, and we look up tiles for every drawn tile,
+			every collision probe and every bullet, every frame. So we pay for it once on load instead.
+		"""
+
+		# cache the dimensions of our map, in map pixels (i.e. tiles)
+		self._mapW = self._mapImage.get_width()
+		self._mapH = self._mapImage.get_height()
+
+		# one byte per tile, row-major
+		self._tiles = Map.tiles_from_surface(self._mapImage)
+
+
+	# classifies every pixel of a map image as a tile
+	@staticmethod
+	def tiles_from_surface(surface):
+		"""Converts a map image into a flat, row-major bytearray of tile ids, one per pixel
 
 		Args:
-			pathToMapImage (str): path to image to load
+			surface (Surface): the map image
+
+		Returns:
+			bytearray: tile ids
 		"""
 
-		# load the map image:
-		self._mapImage = pygame.image.load(pathToMapImage)
+		# for now, we'll just use the R channel:
+		# if it's less than, say 10, we'll assume its black (aka wall)
+		# (so rather than get_at() per pixel, we grab all the pixels at once, keep every red byte,
+		# & swap each for its tile id with a lookup table)
+		redToTile = bytes(Map.WALL if red < 10 else Map.GROUND for red in range(0, 256))
+		return bytearray(pygame.image.tostring(surface, "RGB")[0::3].translate(redToTile))
 
 
-	# checks our loaded map image for a pixel
+	# checks our tile grid for a pixel
 	def get_tile_at_map_pos(self, pos):
 		"""Checks what tile is at a point on the map.
 
@@ -91,35 +342,75 @@ class Map:
 			Number: tile id at that point
 		"""
 
-		# get x/y depending if a pygameVector2 was passed in, or a tuple
-		x = int(pos.x) if isinstance(pos, pygame.Vector2) else int(pos[0])
-		y = int(pos.y) if isinstance(pos, pygame.Vector2) else int(pos[1])
-		
-		# if map image is not define return ground (at least would be able to walk around infinately)
-		if self._mapImage is None:
-			return Map.DARK
+		# pygame Vector2s support indexing just like tuples, so no need to check the type
+		x = int(pos[0])
+		y = int(pos[1])
 
-		# make sure the position is in bounds of our image:
-		if(
-			x < 0
-			or x >= self._mapImage.get_width()
-			or y < 0
-			or y >= self._mapImage.get_height()):
+		# streamed maps do their own bounds checking
+		if self._stream is not None:
+			return self._stream.get_tile(x, y)
 
-			# if its out of bounds (OoB), we return solid wall
+		# if map is not loaded yet, everything is dark
+		if self._tiles is None:
 			return Map.DARK
-		
-		# otherwise, check the color. For now, we'll just yse the R channel:
-		pixelRGB = tuple(self._mapImage.get_at((x, y)))
-		redChannel = pixelRGB[0]
 
-		# if it's less than, say 10, we'll assume its black (aka wall)
-		if redChannel < 10:
-			return Map.WALL
-		elif redChannel>= 10:
-			return Map.GROUND
+		# make sure the position is in bounds of our map, if its out of bounds (OoB), we return dark
+		if x < 0 or x >= self._mapW or y < 0 or y >= self._mapH:
+			return Map.DARK
+
+		# otherwise, just read it from our grid
+		return self._tiles[y * self._mapW + x]
 			
 
+	# public method to turn on fog of war
+	def set_fog(self, fieldOfView):
+		"""Turns on fog of war: from now on, tiles that haven't been explored are drawn as DARK
+
+		Args:
+			fieldOfView (FieldOfView|None): decides what's been explored, or None to turn fog back off
+		"""
+
+		if self.fog is not None:
+			self.fog.events.onExplored.remove_listener(self.handle_explored)
+
+		self.fog = fieldOfView
+		if fieldOfView is not None:
+			fieldOfView.events.onExplored.add_listener(self.handle_explored)
+
+		# everything we've pre-rendered was drawn with the old fog
+		self._chunkCache.clear()
+
+
+	# event handler for when the fog reveals more of the map
+	def handle_explored(self, indices):
+		"""Re-renders the chunks that newly explored tiles are in, next time they're drawn
+
+		Args:
+			indices (List): tile indices (y * width + x) that were just explored
+		"""
+
+		mapW = self._mapW
+		for index in indices:
+			self._chunkCache.invalidate_tile(index % mapW, index // mapW)
+
+
+	# like get_tile_at_map_pos, but what we should draw there, i.e. DARK if it's hidden by fog
+	def get_visible_tile_at_map_pos(self, pos):
+		"""Checks what tile to draw at a point on the map, allowing for fog of war
+
+		Args:
+			pos (Tuple|Vector2): The pos to check, in map pixels (i.e. tiles)
+
+		Returns:
+			Number: tile id to draw at that point
+		"""
+
+		if self.fog is not None and self.fog.is_explored(int(pos[0]), int(pos[1])) is False:
+			return Map.DARK
+
+		return self.get_tile_at_map_pos(pos)
+
+
 	# similar to getTileAtMapPos function above, but in screen/wolrd coordinates first
 	def get_tile_at_pixel_pos(self, pos):
 		"""Simliar to the getTileAtMapPos above, but uses world pixel coordinates instead of our map coords
@@ -131,41 +422,298 @@ class Map:
 			Number: tile that belongs in thatt position
 		"""
 
-		# get x/y depending if a pygameVector2 was passed in, or a tuple
-		x = int(pos.x) if isinstance(pos, pygame.Vector2) else int(pos[0])
-		y = int(pos.y) if isinstance(pos, pygame.Vector2) else int(pos[1])
+		# get pos in map pixels (floor division, so negative positions stay out of bounds)
+		x = int(pos[0] // Map.TILE_SIZE)
+		y = int(pos[1] // Map.TILE_SIZE)
+
+		# streamed maps do their own bounds checking
+		if self._stream is not None:
+			return self._stream.get_tile(x, y)
+
+		# if map is not loaded yet, everything is dark
+		if self._tiles is None:
+			return Map.DARK
+
+		# bounds check, same as get_tile_at_map_pos, but inlined since this is called a lot
+		if x < 0 or x >= self._mapW or y < 0 or y >= self._mapH:
+			return Map.DARK
+
+		# read straight from our grid
+		return self._tiles[y * self._mapW + x]
+
+
+	# checks a whole bunch of line segments against the map at once
+	def cast_segments(self, startXs, startYs, endXs, endYs):
+		"""Finds the first non-ground tile each line segment touches, in world pixel coordinates.
+
+			This walks each segment through the grid one tile at a time (a DDA / "voxel traversal"),
+			so unlike sampling just the end point, fast things can't skip over the corner of a wall.
+
+			Takes parallel lists, rather than a list of Vector2s, so our batched particles can pass theirs straight in.
+
+		Args:
+			startXs (List): x positions each segment starts at
+			startYs (List): y positions each segment starts at
+			endXs (List): x positions each segment ends at
+			endYs (List): y positions each segment ends at
+
+		Returns:
+			List: one entry per segment, either None if it only touched ground,
+				  or a (tile, x, y) tuple of the first tile it hit & where it entered it
+		"""
+
+		# local copies for speed in the loop below
+		tiles = self._tiles
+		mapW = self._mapW
+		mapH = self._mapH
+		tileSize = Map.TILE_SIZE
+		GROUND = Map.GROUND
+		DARK = Map.DARK
+		infinity = float("inf")
+
+		# streamed maps look tiles up through the stream, which does its own bounds checking
+		stream = self._stream
+		getTile = stream.get_tile if stream is not None else None
+
+		# without a map, everything is dark
+		if tiles is None and stream is None:
+			return [(DARK, startXs[i], startYs[i]) for i in range(0, len(startXs))]
+
+		hits = []
+		for i in range(0, len(startXs)):
+
+			sx = startXs[i]
+			sy = startYs[i]
+			dx = endXs[i] - sx
+			dy = endYs[i] - sy
+
+			# the tiles we start & end in
+			tx = int(sx // tileSize)
+			ty = int(sy // tileSize)
+			endTx = int(endXs[i] // tileSize)
+			endTy = int(endYs[i] // tileSize)
+
+			# if we start in something solid, that's our hit
+			if getTile is not None:
+				tile = getTile(tx, ty)
+			else:
+				tile = tiles[ty * mapW + tx] if (0 <= tx < mapW and 0 <= ty < mapH) else DARK
+			if tile != GROUND:
+				hits.append((tile, sx, sy))
+				continue
+
+			# for each axis: which way we step, how far along the segment (0-1) till we cross
+			# the next tile edge, and how far along it is between edges
+			if dx > 0:
+				stepX, tMaxX, tDeltaX = 1, (((tx + 1) * tileSize) - sx) / dx, tileSize / dx
+			elif dx < 0:
+				stepX, tMaxX, tDeltaX = -1, ((tx * tileSize) - sx) / dx, -tileSize / dx
+			else:
+				stepX, tMaxX, tDeltaX = 0, infinity, infinity
+
+			if dy > 0:
+				stepY, tMaxY, tDeltaY = 1, (((ty + 1) * tileSize) - sy) / dy, tileSize / dy
+			elif dy < 0:
+				stepY, tMaxY, tDeltaY = -1, ((ty * tileSize) - sy) / dy, -tileSize / dy
+			else:
+				stepY, tMaxY, tDeltaY = 0, infinity, infinity
+
+			# step tile by tile, always across whichever edge is closest, until we hit something or reach the end
+			hit = None
+			while tx != endTx or ty != endTy:
+
+				if tMaxX < tMaxY:
+					t = tMaxX
+					tx += stepX
+					tMaxX += tDeltaX
+				else:
+					t = tMaxY
+					ty += stepY
+					tMaxY += tDeltaY
+
+				# shouldn't happen, but floating point is floating point
+				if t > 1:
+					break
+
+				if getTile is not None:
+					tile = getTile(tx, ty)
+				else:
+					tile = tiles[ty * mapW + tx] if (0 <= tx < mapW and 0 <= ty < mapH) else DARK
+				if tile != GROUND:
+					hit = (tile, sx + (dx * t), sy + (dy * t))
+					break
+
+			hits.append(hit)
+
+		return hits
+
+
+	# pushes a circle out of any walls it overlaps
+	def resolve_circle(self, x, y, radius, contacts=None):
+		"""Pushes a circle (like the player) out of every non-ground tile it overlaps, in world pixel coordinates.
+
+			For each tile the circle's bounding box touches (so at most 4 for anything smaller than a tile),
+			we find the closest point on the tile to the circle's center, and if that's inside the circle,
+			push the circle straight away from it until it just touches. This slides nicely along walls and
+			round corners, rather than catching on them.
+
+			Works on plain numbers, so nothing is allocated unless we hit something & were given a contacts list.
+
+		Args:
+			x (Number): x position of the circle's center
+			y (Number): y position of the circle's center
+			radius (Number): radius of the circle
+			contacts (List, optional): if given, the (x, y) point we touched on each tile we were pushed out of
+									   is appended to it. Defaults to None.
+
+		Returns:
+			Tuple: (x, y, hit) the pushed out center, and True if we were pushed out of anything
+		"""
+
+		tileSize = Map.TILE_SIZE
+		tiles = self._tiles
+		mapW = self._mapW
+		mapH = self._mapH
+		GROUND = Map.GROUND
+		radiusSquared = radius * radius
+		hit = False
+
+		# being pushed out of one tile can push us into another we already checked (like in a corner),
+		# so go round again while we're still being pushed, a couple of times at most
+		for resolvePass in range(0, Map.CIRCLE_RESOLVE_PASSES):
+			pushed = False
+
+			# the range of tiles our bounding box covers
+			left = int((x - radius) // tileSize)
+			right = int((x + radius) // tileSize)
+			top = int((y - radius) // tileSize)
+			bottom = int((y + radius) // tileSize)
+
+			for tileY in range(top, bottom + 1):
+				for tileX in range(left, right + 1):
+
+					# look the tile up straight from our grid if we can (same as get_tile_at_map_pos, but no tuple)
+					if tiles is not None:
+						tile = tiles[tileY * mapW + tileX] if (0 <= tileX < mapW and 0 <= tileY < mapH) else Map.DARK
+					elif self._stream is not None:
+						tile = self._stream.get_tile(tileX, tileY)
+					else:
+						tile = Map.DARK
+
+					if tile == GROUND:
+						continue
+
+					# closest point on the tile to our center
+					tileLeft = tileX * tileSize
+					tileTop = tileY * tileSize
+					closestX = min(max(x, tileLeft), tileLeft + tileSize)
+					closestY = min(max(y, tileTop), tileTop + tileSize)
+
+					dx = x - closestX
+					dy = y - closestY
+					distanceSquared = (dx * dx) + (dy * dy)
+
+					# not touching this one
+					if distanceSquared >= radiusSquared:
+						continue
+
+					if distanceSquared > 0:
+
+						# push straight away from the closest point, till we're just touching it
+						distance = distanceSquared ** 0.5
+						push = (radius - distance) / distance
+						x += dx * push
+						y += dy * push
+
+					else:
+
+						# our center is inside the tile, so push out through whichever edge is closest
+						toLeft = x - tileLeft
+						toRight = (tileLeft + tileSize) - x
+						toTop = y - tileTop
+						toBottom = (tileTop + tileSize) - y
+						nearest = min(toLeft, toRight, toTop, toBottom)
+
+						if nearest == toLeft:
+							x = tileLeft - radius
+						elif nearest == toRight:
+							x = tileLeft + tileSize + radius
+						elif nearest == toTop:
+							y = tileTop - radius
+						else:
+							y = tileTop + tileSize + radius
+
+					hit = True
+					pushed = True
+					if contacts is not None:
+						contacts.append((closestX, closestY))
+
+			if pushed is False:
+				break
+
+		return (x, y, hit)
+
+
+	# moves a circle, sliding along (and never through) walls
+	def move_circle(self, x, y, moveX, moveY, radius, contacts=None):
+		"""Moves a circle by some amount & pushes it out of any walls it touches on the way (see resolve_circle).
+
+			If it's moving more than half its radius in one go, the move is split up into smaller steps,
+			each resolved on its own, so it can't jump clean over a corner or through a thin wall.
+
+		Args:
+			x (Number): x position of the circle's center
+			y (Number): y position of the circle's center
+			moveX (Number): how far to move on x, in world pixels
+			moveY (Number): how far to move on y, in world pixels
+			radius (Number): radius of the circle
+			contacts (List, optional): passed on to resolve_circle. Defaults to None.
+
+		Returns:
+			Tuple: (x, y, hit) where the circle ended up, and True if it touched a wall on any step
+		"""
+
+		# enough steps that none is longer than half our radius
+		steps = max(1, math.ceil(math.hypot(moveX, moveY) / (radius / 2)))
+		stepX = moveX / steps
+		stepY = moveY / steps
+		hitWall = False
 
-		# get pos in map pixels
-		x //= Map.TILE_SIZE
-		y //= Map.TILE_SIZE
+		for step in range(0, steps):
+			x, y, hit = self.resolve_circle(x + stepX, y + stepY, radius, contacts)
+			hitWall = hitWall or hit
 
-		# just reuprose our other function at this point
-		return self.get_tile_at_map_pos((x, y))
+		return (x, y, hitWall)
 
 
 	# draws a tile at a specifc pos
-	def draw_tile(self, tileType, pos):
+	def draw_tile(self, tileType, pos, surface=None):
 		"""Draws a tile for our tile-based map on screen
 
 		Args:
 			tileType (Number): index of tile image to draw
-			pos (Vector2): position on screen to draw
+			pos (Vector2|Tuple): position on screen to draw
+			surface (Surface, optional): surface to draw on instead of our window. Defaults to None.
 		"""
 
 		# get tile image to draw from our list
 		tileImg = self._images[tileType]
 
 		# blit at point:
-		self._win.blit(tileImg, tuple(pos))
+		(surface or self._win).blit(tileImg, tuple(pos))
 
 
 	# draws the map based on the current camera positon (and maybe zoom someday)
-	def draw_map(self):
+	def draw_map(self, area=None):
 		"""Draws the map based on the camera's current scroll position, etc..
+
+		Args:
+			area (Rect, optional): only redraw this part of the screen (i.e. for dirty rects),
+								   touching just the chunks under it. Defaults to None, the whole screen.
 		"""
 
 		# if we don't have a map loaded yet, gtfo
-		if self._mapImage is None:
+		if self._tiles is None and self._stream is None:
 			return
 
 		"""
@@ -177,12 +725,10 @@ class Map:
 			3) 8)
 
 			So what we have to do is get the top-left of the camera, convert it to pixels in the map
-			then using the width and height of the camera figure out which tiles would be on screen
-			
-			Note that this math depends on tile-size.
+			then using the width and height of the camera figure out which chunks would be on screen
 
-			For now our tiles are 128x128 px, so we'll use that
-			Someday this comment may need to be updated if we go with dynamic tile sizes at a later date
+			Rather than drawing every tile, we draw pre-rendered chunks of tiles (see MapChunkCache.py)
+			so this math depends on the chunk size, which itself depends on tile-size.
 		"""		
 
 		# for ease of coding, get local copy of camera
@@ -194,47 +740,62 @@ class Map:
 		# decompose object for easier reading after
 		topPx = int(bounds["topLeft"].y)
 		leftPx = int(bounds["topLeft"].x)
-		RightPx = bounds["bottomRight"].x
-		bottomPx = bounds["bottomRight"].y
 		width = bounds["width"]
 		height = bounds["height"]
-		
-		# how many tiles could fit on the screen?
-		widthInTiles = width // Map.TILE_SIZE
-		heightInTiles = height // Map.TILE_SIZE
 
-		# add extra tiles so we can "overscan" whilst scrolling
-		widthInTiles += 1
-		heightInTiles += 1
+		# size of a chunk, in pixels
+		chunkSize = self._chunkCache.chunkSizeInPixels
+		
+		# how many chunks could fit on the screen?
+		# add extra chunks so we can "overscan" whilst scrolling
+		widthInChunks = (width // chunkSize) + 2
+		heightInChunks = (height // chunkSize) + 2
 
-		# what is the top left tile of the camera?
-		topLeftTileX = leftPx // Map.TILE_SIZE
-		topLeftTileY = topPx // Map.TILE_SIZE
+		# what is the top left chunk of the camera?
+		topLeftChunkX = leftPx // chunkSize
+		topLeftChunkY = topPx // chunkSize
 
-		# lastly, the camera can be scrolled to some fractional amount of a tile
-		# (i.e. 64, 64 would be halfway through tile, if tiles are 128x128, etc)
-		# so we need to calculate the scroll-offset for rendering tiles.
+		# lastly, the camera can be scrolled to some fractional amount of a chunk
+		# so we need to calculate the scroll-offset for rendering chunks.
 		# done with modulo!
-		cameraOffset = pygame.Vector2(
-			(-(leftPx % Map.TILE_SIZE)),
-		 	(-(topPx % Map.TILE_SIZE))			
-		)
-
-		# loop to draw tiles on x / y ranges
-		for x in range(0, widthInTiles):
-			for y in range(0, heightInTiles):
-
-				# calculate the position we should sample on the map-image:
-				samplePos = (topLeftTileX + x, topLeftTileY + y)
-
-				# check our pixel map and figure out which tile should render for this x/y position
-				tile = self.get_tile_at_map_pos(samplePos)
-
-				# get the screen position this tile should be drawn at:
-				tileScreenPos = cameraOffset.copy()
-				tileScreenPos.x += (x * Map.TILE_SIZE)
-				tileScreenPos.y += (y * Map.TILE_SIZE)
-
-				# draw the tile
-				self.draw_tile(tile, tileScreenPos)
-				
\ No newline at end of file
+		offsetX = -(leftPx % chunkSize)
+		offsetY = -(topPx % chunkSize)
+
+		# which of those chunks we draw, all of them unless we're only redrawing part of the screen
+		firstX = 0
+		firstY = 0
+		lastX = widthInChunks - 1
+		lastY = heightInChunks - 1
+		if area is not None:
+			area = pygame.Rect(area).clip((0, 0, width, height))
+			if area.width == 0 or area.height == 0:
+				return
+			firstX = (area.left - offsetX) // chunkSize
+			firstY = (area.top - offsetY) // chunkSize
+			lastX = min(lastX, (area.right - 1 - offsetX) // chunkSize)
+			lastY = min(lastY, (area.bottom - 1 - offsetY) // chunkSize)
+
+		# loop to draw chunks on x / y ranges
+		for x in range(firstX, lastX + 1):
+
+			# skip columns that would be entirely off screen
+			screenX = offsetX + (x * chunkSize)
+			if screenX >= width:
+				break
+
+			for y in range(firstY, lastY + 1):
+
+				# same for rows
+				screenY = offsetY + (y * chunkSize)
+				if screenY >= height:
+					break
+
+				# get (or build) the pre-rendered chunk
+				chunk = self._chunkCache.get_chunk(topLeftChunkX + x, topLeftChunkY + y)
+
+				# & draw it, or just the bit of it in our area
+				if area is None:
+					self._win.blit(chunk, (screenX, screenY))
+				else:
+					part = area.clip((screenX, screenY, chunkSize, chunkSize))
+					self._win.blit(chunk, part.topleft, part.move(-screenX, -screenY))
@@ -0,0 +1,143 @@
+"""
+	MapChunkCache.py
+	----------------
+
+	This file/module provides a class that pre-renders the map into big off-screen "chunks".
+
+	Our map is made of 128x128 tiles, and blitting every visible tile one at a time, every frame, adds up.
+
+	Since the map itself rarely changes while we play, we can instead render a square region of tiles
+	(a chunk) into its own surface once, and then just blit a handful of chunks each frame.
+
+	Chunks are built lazily the first time they're needed, and we only keep so many of them around,
+	throwing away whichever one was used least recently when we run out of room.
+"""
+
+# for our least-recently-used book keeping
+from collections import OrderedDict
+
+# pygame for surfaces & etc
+import pygame
+
+# main chunk cache class
+class MapChunkCache:
+
+	# constructor
+	def __init__(self, map, chunkSizeInTiles=4, maxChunks=32):
+		"""Constructs the chunk cache
+
+		Args:
+			map (Map): the map we pre-render chunks for
+			chunkSizeInTiles (int, optional): width & height of a chunk, in tiles. Defaults to 4.
+			maxChunks (int, optional): how many chunk surfaces we're allowed to keep around at once. Defaults to 32.
+		"""
+
+		# save reference to the map we render for
+		self._map = map
+
+		# save our sizing settings
+		self.chunkSizeInTiles = chunkSizeInTiles
+		self.maxChunks = maxChunks
+
+		# size of a chunk in world pixels, computed in set_tile_size()
+		self.chunkSizeInPixels = 0
+
+		# maps (chunkX, chunkY) to a pre-rendered surface, ordered from least to most recently used
+		self._chunks = OrderedDict()
+
+
+	# sets the tile size so we know how big our chunk surfaces need to be
+	def set_tile_size(self, tileSize):
+		"""Sets the size of a single tile, in pixels. Clears any existing chunks since they'd be the wrong size
+
+		Args:
+			tileSize (int): width/height of one tile in pixels
+		"""
+
+		# update our pixel size & toss anything we had
+		self.chunkSizeInPixels = self.chunkSizeInTiles * tileSize
+		self.clear()
+
+
+	# throws away all our chunks, for instance when a new map is loaded
+	def clear(self):
+		"""Removes all pre-rendered chunks from the cache
+		"""
+
+		# see ya
+		self._chunks.clear()
+
+
+	# throws away the chunk containing a specific tile, so it gets rebuilt next time it's drawn
+	def invalidate_tile(self, tileX, tileY):
+		"""Removes the chunk containing the given map position (in tiles) from the cache
+
+		Args:
+			tileX (int): x position on the map, in tiles
+			tileY (int): y position on the map, in tiles
+		"""
+
+		# find which chunk this tile lives in, and drop it if we have it
+		key = (tileX // self.chunkSizeInTiles, tileY // self.chunkSizeInTiles)
+		self._chunks.pop(key, None)
+
+
+	# gets the pre-rendered surface for a chunk, building it if we need to
+	def get_chunk(self, chunkX, chunkY):
+		"""Gets the surface for a chunk, rendering it first if it isn't in our cache
+
+		Args:
+			chunkX (int): x position of the chunk, in chunks
+			chunkY (int): y position of the chunk, in chunks
+
+		Returns:
+			Surface: pygame surface with the chunk's tiles drawn on it
+		"""
+
+		key = (chunkX, chunkY)
+
+		# if we already have it, mark it as most recently used and return it
+		chunk = self._chunks.get(key)
+		if chunk is not None:
+			self._chunks.move_to_end(key)
+			return chunk
+
+		# otherwise we gotta make it
+		chunk = self._build_chunk(chunkX, chunkY)
+		self._chunks[key] = chunk
+
+		# if we're over budget, evict whichever chunk was used the longest time ago
+		while len(self._chunks) > self.maxChunks:
+			self._chunks.popitem(last=False)
+
+		return chunk
+
+
+	# renders a chunk's tiles into a new surface
+	def _build_chunk(self, chunkX, chunkY):
+		"""Renders all the tiles in a chunk onto a fresh surface
+
+		Args:
+			chunkX (int): x position of the chunk, in chunks
+			chunkY (int): y position of the chunk, in chunks
+
+		Returns:
+			Surface: the newly rendered chunk
+		"""
+
+		# make a surface in the same pixel format as the window, so blitting it later is cheap
+		win = self._map._win
+		chunk = pygame.Surface((self.chunkSizeInPixels, self.chunkSizeInPixels), 0, win)
+
+		# the tile in the top left of this chunk
+		firstTileX = chunkX * self.chunkSizeInTiles
+		firstTileY = chunkY * self.chunkSizeInTiles
+		tileSize = self.chunkSizeInPixels // self.chunkSizeInTiles
+
+		# draw every tile in the chunk (as it should be seen, i.e. dark if it's under fog of war)
+		for x in range(0, self.chunkSizeInTiles):
+			for y in range(0, self.chunkSizeInTiles):
+				tile = self._map.get_visible_tile_at_map_pos((firstTileX + x, firstTileY + y))
+				self._map.draw_tile(tile, (x * tileSize, y * tileSize), chunk)
+
+		return chunk
@@ -0,0 +1,180 @@
+"""
+	MapStream.py
+	------------
+
+	This file/module provides a class to read a map's tiles from disk a chunk at a time, rather than all at once.
+
+	Normally, Map loads the whole level into one bytearray (one byte per tile). That's great for our little
+	levels, but a maze tens of thousands of cells on a side is billions of tiles, which won't fit in memory.
+
+	So instead, the tiles live in a raw file on disk (one byte per tile, row-major, the same layout as Map's grid),
+	which we memory-map & copy out in square chunks as they're needed. Only so many chunks are kept around,
+	throwing away whichever one was used least recently when we run out of room, so memory stays the same
+	no matter how big the map is.
+
+	Looking up a tile in a chunk we already have is just a dictionary lookup & an index.
+"""
+
+# for our least-recently-used book keeping
+from collections import OrderedDict
+
+# for reading the file without loading all of it
+import mmap
+
+# main tile stream class
+class TileStream:
+
+	# tile we hand out for anything outside the map, same as Map.DARK
+	# (not imported from Map, since Map imports us)
+	OUT_OF_BOUNDS = 2
+
+	# constructor
+	def __init__(self, path, width, height, offset=0, chunkSizeInTiles=64, maxChunks=64):
+		"""Opens a raw tile file for streaming
+
+		Args:
+			path (str): path to the file of tiles, one byte per tile, row-major
+			width (int): width of the map, in tiles
+			height (int): height of the map, in tiles
+			offset (int, optional): where in the file the tiles start, for files with a header. Defaults to 0.
+			chunkSizeInTiles (int, optional): width & height of a chunk, in tiles. Defaults to 64.
+			maxChunks (int, optional): how many chunks we're allowed to keep in memory at once. Defaults to 64.
+		"""
+
+		# save our settings
+		self.width = width
+		self.height = height
+		self.chunkSizeInTiles = chunkSizeInTiles
+		self.maxChunks = maxChunks
+		self._offset = offset
+
+		# map the file, the OS pages it in & out for us as we read it
+		self._file = open(path, "rb")
+		self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+		# make sure the file is actually big enough, rather than finding out half way through a level
+		if len(self._mmap) < offset + (width * height):
+			self.close()
+			raise ValueError(f"{path} is too small for a {width}x{height} map")
+
+		# maps (chunkX, chunkY) to a bytearray of its tiles, ordered from least to most recently used
+		self._chunks = OrderedDict()
+
+
+	# writes tiles out in the format we read
+	@staticmethod
+	def save(path, tiles):
+		"""Writes a flat, row-major grid of tile ids (like Map's) to a raw file we can stream
+
+		Args:
+			path (str): file to write
+			tiles (bytes|bytearray): one byte per tile, row-major
+		"""
+
+		with open(path, "wb") as file:
+			file.write(tiles)
+
+
+	# how much memory our chunks could take up
+	@property
+	def max_resident_bytes(self):
+		return self.maxChunks * self.chunkSizeInTiles * self.chunkSizeInTiles
+
+
+	# gets a tile
+	def get_tile(self, x, y):
+		"""Gets the tile at a position on the map, paging its chunk in if we don't have it
+
+		Args:
+			x (int): x position on the map, in tiles
+			y (int): y position on the map, in tiles
+
+		Returns:
+			Number: tile id at that point, or OUT_OF_BOUNDS if it's off the map
+		"""
+
+		if x < 0 or x >= self.width or y < 0 or y >= self.height:
+			return TileStream.OUT_OF_BOUNDS
+
+		size = self.chunkSizeInTiles
+		key = (x // size, y // size)
+
+		# most lookups land in a chunk we already have, which makes it the most recently used
+		chunk = self._chunks.get(key)
+		if chunk is not None:
+			self._chunks.move_to_end(key)
+		else:
+			chunk = self._page_in(key)
+
+		return chunk[((y % size) * size) + (x % size)]
+
+
+	# makes sure the chunks around a point are loaded
+	def prefetch(self, x, y, radiusInChunks=1):
+		"""Pages in the chunks around a position, so they're ready before we need them
+		   (and moves them to the front of the line, so they're the last to be thrown away)
+
+		Args:
+			x (int): x position on the map, in tiles
+			y (int): y position on the map, in tiles
+			radiusInChunks (int, optional): how many chunks out from the one containing x, y to load. Defaults to 1.
+		"""
+
+		size = self.chunkSizeInTiles
+		centerX = x // size
+		centerY = y // size
+
+		# chunks that are off the map entirely don't exist
+		lastChunkX = (self.width - 1) // size
+		lastChunkY = (self.height - 1) // size
+
+		for chunkY in range(max(0, centerY - radiusInChunks), min(lastChunkY, centerY + radiusInChunks) + 1):
+			for chunkX in range(max(0, centerX - radiusInChunks), min(lastChunkX, centerX + radiusInChunks) + 1):
+
+				key = (chunkX, chunkY)
+				if key in self._chunks:
+					self._chunks.move_to_end(key)
+				else:
+					self._page_in(key)
+
+
+	# reads a chunk from the file
+	def _page_in(self, key):
+		"""Copies a chunk's tiles out of the file, throwing away our least recently used chunk if we're full
+
+		Args:
+			key (Tuple): (chunkX, chunkY) of the chunk to load
+
+		Returns:
+			bytearray: the chunk's tiles, row-major
+		"""
+
+		size = self.chunkSizeInTiles
+		left = key[0] * size
+		top = key[1] * size
+
+		# chunks on the right & bottom edges can hang off the map, those tiles are out of bounds
+		chunk = bytearray([TileStream.OUT_OF_BOUNDS]) * (size * size)
+		rowLength = min(size, self.width - left)
+
+		# copy it row by row, each row is contiguous in the file
+		for row in range(0, min(size, self.height - top)):
+			start = self._offset + ((top + row) * self.width) + left
+			chunk[row * size:(row * size) + rowLength] = self._mmap[start:start + rowLength]
+
+		# make room, if we need to
+		if len(self._chunks) >= self.maxChunks:
+			self._chunks.popitem(last=False)
+
+		self._chunks[key] = chunk
+		return chunk
+
+
+	# lets go of the file
+	def close(self):
+		"""Closes our file & throws away all our chunks
+		"""
+
+		self._chunks.clear()
+		self._mmap.close()
+		self._file.close()
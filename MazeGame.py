@@ -19,12 +19,30 @@ from SceneEnd import EndScreen
 # for lazy hacks on debug keys
 import time
 
+# for picking a seed when we're not given one
+import random
+
+# the real-time clock our scenes read the time from
+from GameClock import GameClock
+
+# for seeing where our frames go
+from FrameProfiler import FrameProfiler
+
+# where our player's input comes from
+from InputSource import KeyboardInput, InputRecorder
+
 # main Game class
 class MazeGame:
 
 	# constructor
-	def __init__(self):
+	def __init__(self, profile=False, dirtyRects=False, recordInputPath=None, seed=None):
 		"""Constructor for the MazeGame
+
+		Args:
+			profile (bool, optional): set true to start with the frame profiler & its overlay on. Defaults to False.
+			dirtyRects (bool, optional): set true to use dirty rectangle rendering in the game screen. Defaults to False.
+			recordInputPath (str, optional): file to record the player's input to, for replaying later. Defaults to None.
+			seed (int, optional): seed for the game screen's randomness (saved in recordings). Defaults to None, for a random one.
 		"""
 
 		# welcome msg for debug and etc
@@ -36,17 +54,35 @@ class MazeGame:
 		# our target FPS, hard coded here for meow
 		self._targetFPS = 60
 
+		# save our render settings for when we build scenes
+		self._dirtyRects = dirtyRects
+
+		# & the seed our game screen gets, so a recording can be played back with it
+		self._seed = seed if seed is not None else random.randrange(0, 1 << 32)
+
 		# set up pygame lib to create a window and etc
 		self._win = self._setup_pygame()
 
+		# our player's input comes from the keyboard (public, since our scenes read it), recorded if we were asked to
+		self.input = KeyboardInput()
+		if recordInputPath is not None:
+			self.input = InputRecorder(self.input, recordInputPath, self._targetFPS, self._seed)
+
+		# frame profiler, F3 toggles it (& its overlay), F4 dumps its stats to disk
+		self.profiler = FrameProfiler()
+		self._profilerKeysWereDown = (False, False)
+
 		# create a scene manager for us to juggle the main sceens (title, game, ending)
-		self._sceneMgr = SceneManager(self)
+		# for debug: start on the game screen (skipping the title screen, which then isn't built unless we go back to it)
+		self._sceneMgr = SceneManager(self, startScene=1)
 
-		# build our scenes
+		# add our scenes (only the one we start on is built now)
 		self._setup_scenes()
 
-		# for debug: skip to game screen (past title screen)
-		self._sceneMgr.switch_scene(1)
+		# start profiling straight away, if we were asked to
+		if profile is True:
+			self.profiler.overlay = True
+			self.profiler.enable()
 
 		# true until user quits or w/e
 		self._run = True
@@ -68,7 +104,8 @@ class MazeGame:
 		pygame.display.set_caption("Monster Maze v0.00001 - Bg Greg")
 
 		# create a clock so we can use pygames framerate timing logic
-		self._pygameClock = pygame.time.Clock()
+		# (this is public, since our scenes read the time from it, too)
+		self.clock = GameClock()
 
 		# return dat win
 		return win
@@ -76,21 +113,35 @@ class MazeGame:
 
 	# instantiate our scenes
 	def _setup_scenes(self):
-		"""Constructes the scenes for our game and adds them to our scene manager
+		"""Adds the scenes for our game to our scene manager. Each scene is only built the first time it's switched to
 		"""
 
-		# construct our 3 main scenes, even though we'll only use one-at-a-time
+		# add our 3 main scenes, even though we'll only use one-at-a-time
 		self._sceneMgr.add_scene(
-			TitleScreen(self, self._win)
+			lambda: TitleScreen(self, self._win), TitleScreen.ASSETS
 		)
 		self._sceneMgr.add_scene(
-			GameScreen(self, self._win)
+			self._build_game_screen, GameScreen.ASSETS
 		)
 		self._sceneMgr.add_scene(
-			EndScreen(self, self._win)
+			lambda: EndScreen(self, self._win), EndScreen.ASSETS
 		)
 
 
+	# builds the game screen, the first time we switch to it
+	def _build_game_screen(self):
+		"""Constructs the GameScreen scene & registers it with our profiler
+
+		Returns:
+			GameScreen: the new scene
+		"""
+
+		gameScreen = GameScreen(self, self._win, dirtyRects=self._dirtyRects, fog=True, minimap=True, seed=self._seed)
+		gameScreen.instrument(self.profiler)
+
+		return gameScreen
+
+
 	# check if pygame's windows events includes a quit message, if so, set run false so we can gracefully quit
 	def _check_window_events_for_quit_message(self):
 		"""Loops over pygame events checking for a quit/exit message
@@ -126,6 +177,24 @@ class MazeGame:
 		if keys[pygame.K_q]:
 			self.quit_game()
 
+		# profiler keys, these only act the frame they're first pressed, not while held
+		f3WasDown, f4WasDown = self._profilerKeysWereDown
+		self._profilerKeysWereDown = (keys[pygame.K_F3], keys[pygame.K_F4])
+
+		# toggle profiler & overlay
+		if keys[pygame.K_F3] and not f3WasDown:
+			if self.profiler.enabled:
+				self.profiler.disable()
+			else:
+				self.profiler.overlay = True
+				self.profiler.enable()
+
+		# dump profiler stats
+		if keys[pygame.K_F4] and not f4WasDown:
+			self.profiler.dump_json("./profile.json")
+			self.profiler.dump_csv("./profile.csv")
+			print("Saved frame profile to profile.json & profile.csv")
+
 
 	# public method to let the game be quit
 	def quit_game(self):
@@ -155,7 +224,7 @@ class MazeGame:
 
 			# we'll lock/target our hardcoded FPS
 			# (FYI pygame clocks will automatically sleep the amount required to target a FPS)
-			self._pygameClock.tick(self._targetFPS)
+			self.clock.tick(self._targetFPS)
 
 			# at a top level, handle some debug input
 			# (other scenes will handle input just for that scene)
@@ -167,14 +236,23 @@ class MazeGame:
 			# if we have a current scene
 			if scene is not None:
 
+				# time this frame, if we're profiling
+				profiling = self.profiler.enabled
+				if profiling:
+					self.profiler.begin_frame()
+
 				# update scene logic
 				scene.update()
 
 				# render scene
 				scene.render()
 
+				if profiling:
+					self.profiler.end_frame()
+
 			# check to see if we should keep running:
 			self._check_window_events_for_quit_message()
 
 		# shut down cleanly after main loop quits
+		self.input.close()
 		pygame.quit()
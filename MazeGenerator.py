@@ -0,0 +1,448 @@
+"""
+	MazeGenerator.py
+	----------------
+
+	This file/module provides a class to generate mazes ourselves, rather than exporting them from a website
+	(see levels/readme.txt), so we can make as many fresh, seeded levels as we want.
+
+	Mazes come out in the same layout as our level PNGs, i.e. Map's tile grid:
+		- the maze is a grid of cells, with a wall between each pair of neighbouring cells & around the outside
+		- each cell & each wall is a 2x2 block of tiles, so a maze W cells wide is (2W + 1) * 2 tiles wide
+		- there's a gap in the outside wall at the top (the entrance) and at the bottom (the exit)
+
+	We have three algorithms, all of which make "perfect" mazes (exactly one path between any two cells):
+		- backtracker: recursive backtracker (done with a stack, not recursion), long twisty corridors
+		- kruskal: randomized Kruskal's, using an array-backed union-find, lots of short dead ends
+		- wilson: Wilson's loop-erased random walks, an unbiased sample of every possible maze (slowest)
+
+	While carving, we work on a grid with one byte per cell / wall (a "unit"), and only blow it up to 2x2 tiles
+	at the end, a whole row at a time.
+
+	Big mazes are a million cells or more, so the carving loops are kept as lean as we can make them:
+		- cells are plain ints (their index in the unit grid), neighbours are just +/- an offset
+		- a padded grid marks everything that isn't an unvisited cell (walls, & past the edges) as visited,
+		  so there are no bounds checks
+		- randomness comes in big blocks from randbytes() rather than a call per step (kruskal just shuffles its walls, once)
+
+	Usage, from the root of the repo:
+
+		python MazeGenerator.py WIDTH HEIGHT [--algorithm backtracker] [--seed 0] [--count 1] [--output maze_{seed}.png]
+
+	Output can be a .png (loadable by Map.load_map just like our levels) or a .maze level file (see LevelFormat.py).
+"""
+
+# for our command line
+import argparse
+
+# for our backtracker's direction orders, & wilson's stream of random directions
+import itertools
+
+# seeded randomness
+import random
+
+# we're gonna use pygame for writing PNGs
+import pygame
+
+# tile ids & sizes
+from Map import Map
+
+# for saving .maze level files
+from LevelFormat import LevelFormat
+
+# main maze generator class
+class MazeGenerator:
+
+	# the algorithms we support, see the generate_* methods
+	ALGORITHMS = ["backtracker", "kruskal", "wilson"]
+
+	# how many tiles wide & tall every cell & wall is
+	UNIT_SIZE_IN_TILES = 2
+
+	# constructor
+	def __init__(self, width, height, seed=None):
+		"""Constructs a generator for mazes of a given size
+
+		Args:
+			width (int): width of the maze, in cells
+			height (int): height of the maze, in cells
+			seed (int, optional): seed for the random number generator, so mazes can be made again. Defaults to None.
+		"""
+
+		# save our size
+		self.width = width
+		self.height = height
+
+		# our own random, so we don't disturb (or get disturbed by) anyone else's
+		self.seed = seed
+		self._rng = random.Random(seed)
+
+		# size of our grid of cells & walls
+		self._unitW = (width * 2) + 1
+		self._unitH = (height * 2) + 1
+
+		# the columns of the cells with the entrance above them, and the exit below them
+		self.entranceX = width // 2
+		self.exitX = width // 2
+
+		# None until we generate something, after, one byte per cell / wall, row-major
+		self._units = None
+
+
+	# size of the maze we make, in tiles
+	@property
+	def tile_width(self):
+		return self._unitW * MazeGenerator.UNIT_SIZE_IN_TILES
+
+	@property
+	def tile_height(self):
+		return self._unitH * MazeGenerator.UNIT_SIZE_IN_TILES
+
+
+	# where a player should start, in world pixels
+	@property
+	def spawn(self):
+		"""The middle of the entrance cell, in world pixels
+
+		Returns:
+			Tuple: (x, y)
+		"""
+
+		# the center of a unit is on the corner between its 2x2 tiles
+		unitSize = MazeGenerator.UNIT_SIZE_IN_TILES * Map.TILE_SIZE
+		return (((self.entranceX * 2) + 1) * unitSize + (unitSize // 2), unitSize + (unitSize // 2))
+
+
+	# public method to make a maze
+	def generate(self, algorithm="backtracker"):
+		"""Makes a new maze with one of our algorithms
+
+		Args:
+			algorithm (str, optional): one of ALGORITHMS. Defaults to "backtracker".
+
+		Returns:
+			bytearray: the maze as tile ids, row-major, tile_width x tile_height (see Map.load_grid)
+		"""
+
+		if algorithm not in MazeGenerator.ALGORITHMS:
+			raise ValueError(f"unknown maze algorithm {algorithm}, expected one of {MazeGenerator.ALGORITHMS}")
+
+		# start with nothing but walls & cells, & let the algorithm carve passages between them
+		self._units = bytearray([Map.WALL]) * (self._unitW * self._unitH)
+		self._open_cells()
+		getattr(self, "generate_" + algorithm)()
+
+		# open the entrance & exit in the outside wall
+		self._units[(self.entranceX * 2) + 1] = Map.GROUND
+		self._units[((self._unitH - 1) * self._unitW) + (self.exitX * 2) + 1] = Map.GROUND
+
+		return self._to_tiles()
+
+
+	# opens up every cell, leaving just the walls around them
+	def _open_cells(self):
+		"""Every algorithm ends up with every cell in the maze, so we open them all up front (a row at a time),
+		   & the algorithms only have to knock down walls
+		"""
+
+		unitW = self._unitW
+		cellRow = bytearray([Map.GROUND]) * self.width
+		for cellY in range(0, self.height):
+			rowStart = ((cellY * 2) + 1) * unitW
+			self._units[rowStart + 1:rowStart + unitW:2] = cellRow
+
+
+	# finds a cell's index in our unit grid
+	def _cell_unit(self, cell):
+		return ((((cell // self.width) * 2) + 1) * self._unitW) + ((cell % self.width) * 2) + 1
+
+
+	# a grid to track visited cells with
+	def _unvisited_grid(self):
+		"""Makes a grid the same shape as our units, with 0 for every cell & 1 for everything else, plus a row
+		   of 1s on the end. Stepping off any edge of the maze lands on a 1 (the outside wall, or that extra row),
+		   so walls & edges look just like visited cells & we never have to check bounds
+
+		Returns:
+			bytearray: the grid
+		"""
+
+		unitW = self._unitW
+		grid = bytearray([1]) * ((unitW * self._unitH) + unitW)
+		cellRow = bytes(self.width)
+		for cellY in range(0, self.height):
+			rowStart = ((cellY * 2) + 1) * unitW
+			grid[rowStart + 1:rowStart + unitW:2] = cellRow
+
+		return grid
+
+
+	# recursive backtracker
+	def generate_backtracker(self):
+		"""Carves a maze by walking randomly to unvisited cells, backing up when stuck.
+		   Uses an explicit stack, so big mazes don't blow Python's recursion limit
+		"""
+
+		# local copies for speed in the loop below
+		units = self._units
+		unitW = self._unitW
+		visited = self._unvisited_grid()
+		GROUND = Map.GROUND
+
+		# each cell tries its neighbours in a random order, picked by 2 random bytes per cell up front
+		# (65536 isn't a multiple of 24 orders, but it's close enough that no order is noticeably favoured)
+		orders = list(itertools.permutations((-2, 2, -2 * unitW, 2 * unitW)))
+		orders = (orders * ((65536 // len(orders)) + 1))[:65536]
+		randomOrders = memoryview(self._rng.randbytes(len(units) * 2)).cast("H")
+
+		stack = []
+		push = stack.append
+		pop = stack.pop
+
+		# start from a random cell
+		cell = self._cell_unit(self._rng.randrange(self.width * self.height))
+		visited[cell] = 1
+
+		while True:
+
+			# first unvisited neighbour, in this cell's order
+			a, b, c, d = orders[randomOrders[cell]]
+			if visited[cell + a] == 0:
+				pass
+			elif visited[cell + b] == 0:
+				a = b
+			elif visited[cell + c] == 0:
+				a = c
+			elif visited[cell + d] == 0:
+				a = d
+
+			# nowhere to go, back up
+			else:
+				if len(stack) == 0:
+					break
+				cell = pop()
+				continue
+
+			# knock down the wall half way between us & step through
+			visited[cell + a] = 1
+			units[cell + (a >> 1)] = GROUND
+			push(cell)
+			cell += a
+
+
+	# randomized kruskal's
+	def generate_kruskal(self):
+		"""Carves a maze by knocking down walls in a random order, as long as the cells on either side
+		   aren't already connected. Which cells are connected is tracked with an array-backed union-find
+		"""
+
+		width = self.width
+		height = self.height
+		unitW = self._unitW
+		units = self._units
+		GROUND = Map.GROUND
+
+		# every wall between two cells, as cell * 2 for the wall to its right, or cell * 2 + 1 for the wall below it
+		walls = []
+		for cellY in range(0, height):
+			rowStart = cellY * width
+			walls.extend(range(rowStart * 2, (rowStart + width - 1) * 2, 2))
+			if cellY < height - 1:
+				walls.extend(range((rowStart * 2) + 1, (rowStart + width) * 2, 2))
+
+		# put them in a random order
+		self._rng.shuffle(walls)
+
+		# each cell starts in its own set, ranks keep the trees shallow
+		parents = list(range(0, width * height))
+		ranks = bytearray(width * height)
+
+		for wall in walls:
+			cellA = wall >> 1
+			cellB = cellA + width if wall & 1 else cellA + 1
+
+			# find the root of each set, halving the paths as we go so later finds are quicker
+			rootA = parents[cellA]
+			while parents[rootA] != rootA:
+				parents[rootA] = rootA = parents[parents[rootA]]
+
+			rootB = parents[cellB]
+			while parents[rootB] != rootB:
+				parents[rootB] = rootB = parents[parents[rootB]]
+
+			# already connected, knocking this wall down would make a loop
+			if rootA == rootB:
+				continue
+
+			# hang the shallower tree off the deeper one
+			if ranks[rootA] < ranks[rootB]:
+				parents[rootA] = rootB
+			else:
+				parents[rootB] = rootA
+				if ranks[rootA] == ranks[rootB]:
+					ranks[rootA] += 1
+
+			# the wall's unit is just right of, or just below, cellA's
+			cellY = cellA // width
+			unitA = (((cellY * 2) + 1) * unitW) + ((cellA - (cellY * width)) * 2) + 1
+			units[unitA + unitW if wall & 1 else unitA + 1] = GROUND
+
+
+	# wilson's algorithm
+	def generate_wilson(self):
+		"""Carves a maze from loop-erased random walks: from each cell not yet in the maze, randomly walk until
+		   we hit the maze, then carve the walk's path (minus any loops) into it
+		"""
+
+		# local copies for speed in the loops below
+		units = self._units
+		unitW = self._unitW
+		GROUND = Map.GROUND
+
+		# 1 for anything that isn't a cell (so we never walk onto it), & 1 for cells in the maze (so we know we've
+		# hit it). Unlike cells, "outside" never changes, which is what stops our walks leaving the maze
+		outside = self._unvisited_grid()
+		inMaze = bytearray(outside)
+
+		# the cell we last stepped to from each cell on the current walk. Overwriting it when the walk revisits
+		# a cell is what erases loops, since following it from the start skips everything in between
+		nextCells = [0] * len(units)
+
+		# walks are long (over ten steps per cell, all told), so we read directions from a never ending stream
+		# of random bytes, a big block at a time, each byte turned into a direction (0 to 3) in C
+		offsets = (-2, 2, -2 * unitW, 2 * unitW)
+		toDirection = bytes(value & 3 for value in range(0, 256))
+		randbytes = self._rng.randbytes
+		directions = itertools.chain.from_iterable(
+			randbytes(1 << 20).translate(toDirection) for block in itertools.repeat(None))
+
+		# start the maze with one random cell
+		inMaze[self._cell_unit(self._rng.randrange(self.width * self.height))] = 1
+
+		# & walk from every cell not yet in it, in order
+		start = inMaze.find(0)
+		if start < 0:
+			return
+
+		cell = start
+		for direction in directions:
+
+			# try again if it'd take us off the maze
+			nextCell = cell + offsets[direction]
+			if outside[nextCell] == 1:
+				continue
+
+			nextCells[cell] = nextCell
+			cell = nextCell
+			if inMaze[cell] == 0:
+				continue
+
+			# we bumped into the maze, so follow the walk from the start again, carving it in
+			cell = start
+			while inMaze[cell] == 0:
+				inMaze[cell] = 1
+				nextCell = nextCells[cell]
+
+				# neighbours are 2 units apart, so the wall between them is right in the middle
+				units[(cell + nextCell) >> 1] = GROUND
+				cell = nextCell
+
+			# on to the next cell that's not in the maze, if there are any left
+			start = inMaze.find(0, start)
+			if start < 0:
+				break
+			cell = start
+
+
+	# blows our unit grid up to tiles
+	def _to_tiles(self):
+		"""Converts our grid of cells & walls to tiles, each unit becoming a 2x2 block
+
+		Returns:
+			bytearray: tile ids, row-major
+		"""
+
+		unitW = self._unitW
+		tileW = self.tile_width
+		size = MazeGenerator.UNIT_SIZE_IN_TILES
+
+		tiles = bytearray(tileW * self.tile_height)
+		row = bytearray(tileW)
+
+		for unitY in range(0, self._unitH):
+
+			# stretch the row of units out sideways, one slice per copy, rather than one tile at a time...
+			units = self._units[unitY * unitW:(unitY + 1) * unitW]
+			for offset in range(0, size):
+				row[offset::size] = units
+
+			# ...then repeat it downwards
+			for offset in range(0, size):
+				start = ((unitY * size) + offset) * tileW
+				tiles[start:start + tileW] = row
+
+		return tiles
+
+
+	# saves a maze as a PNG, like our levels
+	def save_png(self, path, tiles):
+		"""Saves tiles we generated as a black (wall) & white (ground) PNG that Map.load_map can load
+
+		Args:
+			path (str): file to write
+			tiles (bytearray): tiles from generate()
+		"""
+
+		# grey value for every tile, then the same value for each of R, G & B
+		tileToGrey = bytes(0 if tile == Map.WALL else 255 for tile in range(0, 256))
+		greys = tiles.translate(tileToGrey)
+
+		pixels = bytearray(len(greys) * 3)
+		for channel in range(0, 3):
+			pixels[channel::3] = greys
+
+		image = pygame.image.frombuffer(pixels, (self.tile_width, self.tile_height), "RGB")
+		pygame.image.save(image, path)
+
+
+	# saves a maze as one of our level files
+	def save_level(self, path, tiles):
+		"""Saves tiles we generated as a .maze level file (see LevelFormat.py), with a spawn at the entrance
+
+		Args:
+			path (str): file to write
+			tiles (bytearray): tiles from generate()
+		"""
+
+		LevelFormat.save(
+			path,
+			self.tile_width,
+			self.tile_height,
+			tiles,
+			[self.spawn],
+			{"generator": "MazeGenerator", "cells": [self.width, self.height], "seed": self.seed})
+
+
+# run from the command line
+if __name__ == "__main__":
+
+	parser = argparse.ArgumentParser(description="Generates seeded mazes as PNGs or .maze level files")
+	parser.add_argument("width", type=int, help="width of the maze, in cells")
+	parser.add_argument("height", type=int, help="height of the maze, in cells")
+	parser.add_argument("--algorithm", default="backtracker", choices=MazeGenerator.ALGORITHMS)
+	parser.add_argument("--seed", type=int, default=0, help="seed of the first maze")
+	parser.add_argument("--count", type=int, default=1, help="how many mazes to make, with seeds counting up from --seed")
+	parser.add_argument("--output", default="maze_{seed}.png", help="file to write, {seed} is replaced with each maze's seed")
+	args = parser.parse_args()
+
+	for seed in range(args.seed, args.seed + args.count):
+
+		generator = MazeGenerator(args.width, args.height, seed)
+		tiles = generator.generate(args.algorithm)
+
+		path = args.output.format(seed=seed)
+		if LevelFormat.is_level_file(path):
+			generator.save_level(path, tiles)
+		else:
+			generator.save_png(path, tiles)
+
+		print(f"Saved {args.width}x{args.height} {args.algorithm} maze to {path}")
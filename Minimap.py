@@ -0,0 +1,285 @@
+"""
+	Minimap.py
+	----------
+
+	This file/module provides a class to draw a small overview of the map in the corner of the screen.
+
+	Looking up & drawing every tile every frame would be way too slow on a big maze, so instead:
+		- once, when we're made, we turn the whole tile grid into a surface with one pixel per tile
+		  (a bytes.translate per color channel, then pygame.image.frombuffer, no per-tile Python loop),
+		  & again only if a different map is loaded, or fog of war is turned on or off
+		- we scale the part of it we show into our own little surface, and only redo that when the part
+		  we show changes (when following the player, that's when they step onto a new tile)
+		- when fog of war reveals tiles (or a tile changes), we just paint those few tiles into both surfaces
+		- every frame, we blit our scaled surface & draw a dot for the player on top
+
+	With fog of war turned on, only explored tiles are shown, the rest are dark.
+"""
+
+# for rounding up
+import math
+
+# for picking out explored tiles
+import itertools
+
+# pygame for surfaces & etc
+import pygame
+
+# tile ids & sizes
+from Map import Map
+
+# main minimap class
+class Minimap:
+
+	# color of each tile id on the minimap
+	COLORS = [
+		(90, 72, 58),
+		(150, 205, 195),
+		(20, 20, 20),
+	]
+
+	# color for anything outside the map
+	OUTSIDE_COLOR = (20, 20, 20)
+
+	# color of the dot for the player
+	PLAYER_COLOR = (230, 60, 40)
+
+	# color of the line around the minimap
+	BORDER_COLOR = (255, 255, 255)
+
+	# constructor
+	def __init__(self, scene, win, size=(160, 160), zoom=4, margin=10):
+		"""Constructs the minimap & renders the map into it
+
+		Args:
+			scene (Scene): the scene we live in
+			win (Surface): pygame window surface we render to
+			size (Tuple, optional): width & height of the minimap on screen, in pixels. Defaults to (160, 160).
+			zoom (Number|None, optional): minimap pixels per tile, centered on the player,
+										  or None to fit the whole map in. Defaults to 4.
+			margin (int, optional): gap between the minimap & the top right corner of the screen. Defaults to 10.
+		"""
+
+		# save reference to the scene we live in & render window
+		self._scene = scene
+		self._win = win
+
+		self.size = size
+		self.zoom = zoom
+		self.margin = margin
+
+		# the map with one pixel per tile, & the part of it we show scaled to our size, made in build()
+		self._base = None
+		self._view = pygame.Surface(size, 0, win)
+
+		# top left of the part of the map we show, in tiles, & its zoom, None until we've scaled it
+		self._viewLeft = None
+		self._viewTop = None
+		self._viewZoom = 1
+
+		# the map's tile grid & fog we were last built from, so we can tell when either changes
+		self._tiles = None
+		self._fog = None
+
+		# keep up with the map (& its fog, which build() listens to)
+		scene.map.events.onTileChanged.add_listener(self.handle_tile_changed)
+
+		self.build()
+
+
+	# renders the map into our one pixel per tile surface
+	def build(self):
+		"""Renders the whole map (or the explored parts of it, with fog of war), one pixel per tile.
+		   draw() calls this again by itself if a different map is loaded, or the map's fog changes
+		"""
+
+		map = self._scene.map
+		tiles = map.tiles
+		mapW = map.width_in_tiles
+		mapH = map.height_in_tiles
+
+		# listen to the map's current fog, rather than whatever it had last time
+		if map.fog is not self._fog:
+			if self._fog is not None:
+				self._fog.events.onExplored.remove_listener(self.handle_explored)
+			if map.fog is not None:
+				map.fog.events.onExplored.add_listener(self.handle_explored)
+			self._fog = map.fog
+
+		self._tiles = tiles
+
+		# streamed maps are too big, so we don't show anything
+		if tiles is None:
+			self._base = None
+			self._viewLeft = None
+			return
+
+		self._base = pygame.Surface((mapW, mapH), 0, self._win)
+
+		if map.fog is None:
+
+			# every tile's red, green & blue, each looked up from its tile id in one go
+			pixels = bytearray(len(tiles) * 3)
+			for channel in range(0, 3):
+				table = bytes(Minimap.COLORS[tile][channel] if tile < len(Minimap.COLORS) else 0 for tile in range(0, 256))
+				pixels[channel::3] = tiles.translate(table)
+
+			self._base.blit(pygame.image.frombuffer(pixels, (mapW, mapH), "RGB"), (0, 0))
+
+		else:
+
+			# everything starts dark, then we fill in what's been explored so far
+			self._base.fill(Minimap.COLORS[Map.DARK])
+			for index in itertools.compress(range(0, len(tiles)), map.fog.get_explored()):
+				self._base.set_at((index % mapW, index // mapW), Minimap.COLORS[tiles[index]])
+
+		# make sure we re-scale next time
+		self._viewLeft = None
+
+
+	# works out which part of the map we show
+	def _get_view(self):
+		"""Gets the part of the map we show
+
+		Returns:
+			Tuple: (left, top, zoom), left & top in tiles, zoom in minimap pixels per tile
+		"""
+
+		map = self._scene.map
+
+		# the whole thing
+		if self.zoom is None:
+			zoom = min(self.size[0] / max(1, map.width_in_tiles), self.size[1] / max(1, map.height_in_tiles))
+			return (0, 0, zoom)
+
+		# as many tiles as fit, with the player's tile in the middle
+		zoom = self.zoom
+		pos = self._scene.player.pos
+		left = int(pos[0] // Map.TILE_SIZE) - int(self.size[0] / zoom / 2)
+		top = int(pos[1] // Map.TILE_SIZE) - int(self.size[1] / zoom / 2)
+		return (left, top, zoom)
+
+
+	# re-scales the part of the map we show into our view surface
+	def _rescale(self, left, top, zoom):
+		"""Scales the part of the map we show into our view surface
+
+		Args:
+			left (int): left of the part we show, in tiles
+			top (int): top of the part we show, in tiles
+			zoom (Number): minimap pixels per tile
+		"""
+
+		self._viewLeft = left
+		self._viewTop = top
+		self._viewZoom = zoom
+
+		self._view.fill(Minimap.OUTSIDE_COLOR)
+		if self._base is None:
+			return
+
+		# only the bit of the part we show that's actually on the map
+		region = pygame.Rect(left, top, math.ceil(self.size[0] / zoom) + 1, math.ceil(self.size[1] / zoom) + 1)
+		region = region.clip(self._base.get_rect())
+		if region.width == 0 or region.height == 0:
+			return
+
+		scaled = pygame.transform.scale(
+			self._base.subsurface(region),
+			(max(1, int(region.width * zoom)), max(1, int(region.height * zoom))))
+		self._view.blit(scaled, (int((region.x - left) * zoom), int((region.y - top) * zoom)))
+
+
+	# paints one tile into both our surfaces
+	def _paint_tile(self, x, y, tile):
+		"""Paints a single tile, rather than re-rendering everything
+
+		Args:
+			x (int): x position on the map, in tiles
+			y (int): y position on the map, in tiles
+			tile (Number): tile id to paint it as
+		"""
+
+		color = Minimap.COLORS[tile]
+		self._base.set_at((x, y), color)
+
+		# if it's in the part we show, fill in its scaled up square too
+		if self._viewLeft is None:
+			return
+
+		zoom = self._viewZoom
+		size = max(1, math.ceil(zoom))
+		self._view.fill(color, (int((x - self._viewLeft) * zoom), int((y - self._viewTop) * zoom), size, size))
+
+
+	# event handler for when fog of war reveals tiles
+	def handle_explored(self, indices):
+		"""Paints in tiles that were just explored
+
+		Args:
+			indices (List): tile indices (y * width + x) that were just explored
+		"""
+
+		# if the map's changed since we were built, we'll be rebuilt with these in next draw anyway
+		map = self._scene.map
+		if self._base is None or map.tiles is not self._tiles:
+			return
+
+		tiles = map.tiles
+		mapW = map.width_in_tiles
+		for index in indices:
+			self._paint_tile(index % mapW, index // mapW, tiles[index])
+
+
+	# event handler for when the map changes
+	def handle_tile_changed(self, x, y, oldTile, newTile):
+		"""Paints in a tile that changed, unless it's still hidden by fog of war
+
+		Args:
+			x (int): x position on the map, in tiles
+			y (int): y position on the map, in tiles
+			oldTile (Number): what it was
+			newTile (Number): what it is now
+		"""
+
+		map = self._scene.map
+		if self._base is None or map.tiles is not self._tiles:
+			return
+
+		if map.fog is not None and map.fog.is_explored(x, y) is False:
+			return
+
+		self._paint_tile(x, y, newTile)
+
+
+	# draws the minimap
+	def draw(self):
+		"""Draws the minimap in the top right corner of the screen, with a dot for the player
+
+		Returns:
+			Rect: the area of the screen drawn to
+		"""
+
+		# start again if we're out of date, like FieldOfView does (see FieldOfView._get_grid)
+		map = self._scene.map
+		if map.tiles is not self._tiles or map.fog is not self._fog:
+			self.build()
+
+		# only re-scale when what we show has moved
+		left, top, zoom = self._get_view()
+		if left != self._viewLeft or top != self._viewTop or zoom != self._viewZoom:
+			self._rescale(left, top, zoom)
+
+		screenX = self._win.get_width() - self.size[0] - self.margin
+		screenY = self.margin
+		self._win.blit(self._view, (screenX, screenY))
+
+		# the player's dot, clamped to our edges so they can't lose it
+		pos = self._scene.player.pos
+		dotX = screenX + (pos[0] / Map.TILE_SIZE - left) * zoom
+		dotY = screenY + (pos[1] / Map.TILE_SIZE - top) * zoom
+		dotX = min(max(dotX, screenX), screenX + self.size[0] - 1)
+		dotY = min(max(dotY, screenY), screenY + self.size[1] - 1)
+		pygame.draw.circle(self._win, Minimap.PLAYER_COLOR, (int(dotX), int(dotY)), 3)
+
+		return pygame.draw.rect(self._win, Minimap.BORDER_COLOR, (screenX - 1, screenY - 1, self.size[0] + 2, self.size[1] + 2), 1)
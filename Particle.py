@@ -37,21 +37,61 @@ class Particle(WorldEntity):
 			customCollision = None,
 			onCollide = None):
 		
+		# call our super constructor
+		super().__init__(scene, win, initialX, initialY, initialRot)
+
+		# keep reference to our particle system we belong to
+		self._system = system
+
+		# everything else is set in reset(), so our particle system can recycle us instead of making new particles
+		self.reset(
+			image,
+			initialX,
+			initialY,
+			initialRot,
+			initialSpeed,
+			cycleCount,
+			cycleLengthInMS,
+			killWhenOOB,
+			onComplete,
+			customUpdate,
+			customCollision,
+			onCollide)
+
+
+	# (re)initializes all our per-particle state, both on construction and when we're pulled out of the pool
+	def reset(
+			self,
+			image,
+			initialX = 0,
+			initialY = 0,
+			initialRot = 0,
+			initialSpeed = 10,
+			cycleCount = 1,
+			cycleLengthInMS = 1000,
+			killWhenOOB = True, 
+			onComplete = None,
+			customUpdate = None,
+			customCollision = None,
+			onCollide = None):
+		"""Sets up this particle as if it was brand new. Same arguments as the constructor, minus the scene/win/system
+		"""
+
 		# give ourself a unique ID for this particle
 		Particle.particleIdCounter += 1
 		self.id = Particle.particleIdCounter
 
+		# true until we're killed, our particle system uses this to clean up after an update
+		self.alive = True
+
 		# should we kill with out of bounds of the screen?
 		# use with caution! combined with cycleCount = 0,
 		# could end up with long running / infinte particles out in the void
 		self.killWhenOOB = killWhenOOB
 
-		# save reference to our system & use it's 
-		# call our super constructor
-		super().__init__(scene, win, initialX, initialY, initialRot)
-
-		# keep reference to our particle system we belong to
-		self._system = system
+		# positional data, updated in place since we may be recycled
+		self.pos.update(initialX, initialY)
+		self.rot = initialRot
 
 		# keep reference of which image we should use for drawing ourself
 		self._img = image
@@ -76,7 +116,7 @@ class Particle(WorldEntity):
 		self._customCollision = customCollision
 
 		# during our construction, let's save the time elapses do we can use delta time later
-		self._timeAtCreation = pygame.time.get_ticks()
+		self._timeAtCreation = self._scene.clock.get_ticks()
 
 
 	# public way to set / update cycle settings after creation
@@ -111,7 +151,7 @@ class Particle(WorldEntity):
 		# regardless if we use a custom update function (see comment block below) we still gotta do time schizz
 		
 		# get the time now, and the deltatime since the particle spawned
-		timeNow = pygame.time.get_ticks()
+		timeNow = self._scene.clock.get_ticks()
 		deltaTime = timeNow - self._timeAtCreation
 
 		# compute how many cycles we've done:
@@ -206,6 +246,6 @@ class Particle(WorldEntity):
 		imageCenter = pygame.Vector2(self._img.get_width()/2, self._img.get_height()/2)
 		screenPos = self._system.cam.get_screen_pos(self.pos) - imageCenter
 
-		# draw the particle		
-		blit_rotate_center_blend(self._win, self._img, screenPos, self.rot, self._blendMode)
+		# draw the particle & let our scene know where, for dirty rect rendering
+		self._scene.mark_dirty(blit_rotate_center_blend(self._win, self._img, screenPos, self.rot, self._blendMode))
 
@@ -0,0 +1,305 @@
+"""
+	ParticleBatch.py
+	----------------
+
+	This file/module hosts the ParticleBatch class, a "batched mode" for our ParticleSystem.
+
+	Our regular Particle objects are flexible (custom update / collision callbacks, etc) but every one of
+	them costs a handful of Python method calls, a trig call and a camera bounds dict per update.
+
+	Most of our particles (flashes, poofs, bullets) don't need any of that flexibility. They just move in a straight
+	line, live for some number of cycles and die when they leave the screen, or (optionally) hit a wall.
+
+	So for those, instead of one object per particle, we store each property in its own list
+	(a "structure of arrays") and update all of them in one tight loop.
+
+	NOTE: particles in here don't have an object you can hold on to. You pick their settings
+	when you spawn them, and that's that. You can still find the ones near somewhere (like bullets
+	near an enemy) with query_radius, which gives you their slot in our lists, good until the batch next changes.
+"""
+
+# for dat geometry
+import math
+
+# yup
+from Util import blit_rotate_center_blend
+
+# for finding particles near somewhere
+from SpatialHash import SpatialHash
+
+# the batched particle class
+class ParticleBatch:
+
+	# constructor
+	def __init__(self, system):
+		"""Constructs an empty batch of particles
+
+		Args:
+			system (ParticleSystem): the particle system we belong to
+		"""
+
+		# keep reference to our particle system we belong to
+		self._system = system
+
+		# parallel lists, one entry per live particle. Index i in each list is the same particle.
+		self._xs = []
+		self._ys = []
+		self._dxs = []
+		self._dys = []
+		self._rots = []
+		self._births = []
+		self._cycleCounts = []
+		self._cycleLengths = []
+		self._types = []
+		self._blendModes = []
+		self._killWhenOOB = []
+		self._collides = []
+
+		# our slots, by where they are. Slots move around whenever particles die, so rather than keep this
+		# up to date every update, we just mark it stale & rebuild it when someone next asks
+		self._spatialHash = SpatialHash()
+		self._spatialHashStale = True
+
+
+	# how many particles are alive in the batch
+	def __len__(self):
+		return len(self._xs)
+
+
+	# adds a particle to the batch
+	def spawn(self, type, x, y, angle, speed, timeNow, cycleCount=0, cycleLengthInMS=1000, blendMode=0, killWhenOOB=True, collides=False):
+		"""Adds a new particle to the batch
+
+		Args:
+			type (Number): the particle type, also the index of the image to draw it with
+			x (Number): x position to spawn at
+			y (Number): y position to spawn at
+			angle (Number): angle to move & draw at, in degrees
+			speed (Number): how far to move per update
+			timeNow (Number): the time in ms the particle was born at
+			cycleCount (int, optional): how many cycles the particle lives for, 0 = infinite. Defaults to 0.
+			cycleLengthInMS (int, optional): cycle length in MS. Defaults to 1000.
+			blendMode (int, optional): pygame blend mode constant to draw with. Defaults to 0.
+			killWhenOOB (bool, optional): kill the particle when it goes off screen. Defaults to True.
+			collides (bool, optional): kill the particle when it hits a wall, and report the hit from update(). Defaults to False.
+		"""
+
+		# our particles only ever move in a straight line, so we can do the trig once, now,
+		# rather than every update (see WorldEntity.move_by_angle_and_magnitude)
+		angleInRadians = angle * (math.pi/180.0)
+
+		self._xs.append(x)
+		self._ys.append(y)
+		self._dxs.append(math.sin(angleInRadians) * speed)
+		self._dys.append(math.cos(angleInRadians) * speed)
+		self._rots.append(angle)
+		self._births.append(timeNow)
+		self._cycleCounts.append(cycleCount)
+		self._cycleLengths.append(cycleLengthInMS)
+		self._types.append(type)
+		self._blendModes.append(blendMode)
+		self._killWhenOOB.append(killWhenOOB)
+		self._collides.append(collides)
+		self._spatialHashStale = True
+
+
+	# removes all particles
+	def clear(self):
+		"""Kills every particle in the batch
+		"""
+
+		for values in self._columns():
+			del values[:]
+		self._spatialHashStale = True
+
+
+	# all our parallel lists, so we can do things to every column at once
+	def _columns(self):
+		return (
+			self._xs, self._ys, self._dxs, self._dys, self._rots, self._births,
+			self._cycleCounts, self._cycleLengths, self._types, self._blendModes, self._killWhenOOB, self._collides
+		)
+
+
+	# moves all the particles, kills expired ones, ones that hit walls & ones off screen
+	def update(self, timeNow, left, top, right, bottom, castSegments=None):
+		"""Updates every particle in the batch.
+
+			Same rules as Particle.update(): particles die once they've done more than their cycle count,
+			move by their speed in the direction of their angle, then die if they hit something or are out of bounds.
+
+			Collision for every colliding particle is resolved with a single call to castSegments, using the line
+			each one moved along this update.
+
+		Args:
+			timeNow (Number): the current time in ms
+			left (Number): left edge of the alive area, in world pixels (i.e. camera bounds plus margin)
+			top (Number): top edge of the alive area
+			right (Number): right edge of the alive area
+			bottom (Number): bottom edge of the alive area
+			castSegments (function, optional): Map.cast_segments, or something like it. Defaults to None (no collision).
+
+		Returns:
+			List: a (type, x, y, tile) tuple for every particle that hit something & died this update
+		"""
+
+		# local copies for speed in the loops below
+		xs = self._xs
+		ys = self._ys
+		dxs = self._dxs
+		dys = self._dys
+		births = self._births
+		cycleCounts = self._cycleCounts
+		cycleLengths = self._cycleLengths
+		killWhenOOB = self._killWhenOOB
+		collides = self._collides
+		columns = self._columns()
+		count = len(xs)
+		self._spatialHashStale = True
+
+		# one flag per particle, set when it dies this update
+		dead = bytearray(count)
+
+		# the segments our colliding particles moved along, and which particle each belongs to
+		collidingIndices = []
+		startXs = []
+		startYs = []
+		endXs = []
+		endYs = []
+
+		# first pass: expire & move
+		for i in range(0, count):
+
+			# have we done all our cycles yet?
+			cycleCount = cycleCounts[i]
+			if cycleCount != 0 and ((timeNow - births[i]) // cycleLengths[i]) > cycleCount:
+				dead[i] = 1
+				continue
+
+			# move
+			x = xs[i]
+			y = ys[i]
+			newX = x - dxs[i]
+			newY = y - dys[i]
+			xs[i] = newX
+			ys[i] = newY
+
+			# remember where we went, if we collide
+			if collides[i] and castSegments is not None:
+				collidingIndices.append(i)
+				startXs.append(x)
+				startYs.append(y)
+				endXs.append(newX)
+				endYs.append(newY)
+
+		# resolve all our collisions in one go
+		hits = []
+		if len(collidingIndices) > 0:
+			results = castSegments(startXs, startYs, endXs, endYs)
+			for n in range(0, len(results)):
+				result = results[n]
+				if result is not None:
+					i = collidingIndices[n]
+					dead[i] = 1
+					hits.append((self._types[i], result[1], result[2], result[0]))
+
+		# second pass: cull out of bounds & compact the lists in place, survivors get copied down to index "keep"
+		keep = 0
+		for i in range(0, count):
+
+			if dead[i]:
+				continue
+
+			# are we out of bounds?
+			if killWhenOOB[i]:
+				x = xs[i]
+				y = ys[i]
+				if x < left or x > right or y < top or y > bottom:
+					continue
+
+			# survived, shuffle this particle down if any died before it
+			if keep != i:
+				for values in columns:
+					values[keep] = values[i]
+			keep += 1
+
+		# chop off the dead particles at the end
+		if keep != count:
+			for values in columns:
+				del values[keep:]
+
+		return hits
+
+
+	# public method to find particles near somewhere
+	def query_radius(self, pos, radius):
+		"""Finds every particle inside a circle, right now. Particles count as points, so add their size
+		   to the radius if you care about that
+
+		Args:
+			pos (Vector2|Tuple): center of the circle, in world pixels
+			radius (Number): radius of the circle
+
+		Returns:
+			List: a (type, index) tuple for each, where index is the particle's slot in our lists.
+				  Slots are only good until the next spawn(), update() or clear()
+		"""
+
+		if self._spatialHashStale is True:
+			self._rebuild_spatial_hash()
+
+		return self._spatialHash.query_radius(pos, radius)
+
+
+	# puts every particle's slot in our spatial hash, where it is now
+	def _rebuild_spatial_hash(self):
+
+		spatialHash = self._spatialHash
+		spatialHash.clear()
+		insert = spatialHash.insert
+
+		for i, (type, x, y) in enumerate(zip(self._types, self._xs, self._ys)):
+			insert((type, i), (x, y))
+
+		self._spatialHashStale = False
+
+
+	# draw all the particles
+	def draw(self, cam, images, markDirty=None):
+		"""Draws every particle in the batch
+
+		Args:
+			cam (Camera): camera to draw relative to
+			images (List): particle images, indexed by particle type
+			markDirty (function, optional): called with the Rect of every particle drawn. Defaults to None.
+		"""
+
+		# nothing to draw
+		if len(self._xs) == 0:
+			return
+
+		# a particle is visible if any of its (rotated) image could be on screen, so allow for our biggest image
+		margin = max(max(img.get_width(), img.get_height()) for img in images)
+
+		# find every particle's screen position, & which are on screen, in one go rather than per particle
+		screenXs, screenYs, visible = cam.get_screen_positions(self._xs, self._ys, margin)
+
+		win = self._system._win
+		rots = self._rots
+		types = self._types
+		blendModes = self._blendModes
+
+		for i in range(0, len(screenXs)):
+
+			# don't bother with particles we wouldn't see
+			if visible[i] is False:
+				continue
+
+			# calclate particle postion, centered on the image
+			img = images[types[i]]
+			screenPos = (screenXs[i] - img.get_width()/2, screenYs[i] - img.get_height()/2)
+
+			# draw the particle
+			rect = blit_rotate_center_blend(win, img, screenPos, rots[i], blendModes[i])
+			if markDirty is not None:
+				markDirty(rect)
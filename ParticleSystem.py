@@ -22,9 +22,21 @@ import pygame
 # sane dictionary access
 from Util import dotdict
 
+# cached rotations for our particle sprites
+from RotationCache import sharedRotationCache
+
+# so others can hear about particles hitting things
+from Events import Events
+
+# shared, pre-converted images
+from AssetManager import sharedAssetManager
+
 # uhh yea, ParticleSystem definately gonna want some Particle
 from Particle import Particle
 
+# batched "structure of arrays" particles for the simple ones that don't need callbacks
+from ParticleBatch import ParticleBatch
+
 # the particle system class
 class ParticleSystem:
 
@@ -35,6 +47,13 @@ class ParticleSystem:
 		"POOF": 2,
 	})
 
+	# images for our particles, indexed by type
+	IMAGE_PATHS = [
+		'./img/particles/space_bullet.png',
+		'./img/particles/flash.png',
+		'./img/particles/poof.png',
+	]
+
 	# constructor
 	def __init__(self, scene, win):
 		"""Constructs the particle system
@@ -54,6 +73,26 @@ class ParticleSystem:
 		# this list will contain our active particles as they're spawned and etc
 		self.particles = []
 
+		# dead particles waiting to be recycled by spawn_particle(), so we don't allocate new ones all the time
+		self._pool = []
+		self.maxPoolSize = 512
+
+		# true while we're looping over our particles in update(), so kills get deferred till the loop is done
+		self._updating = False
+
+		# how many particles were killed since we last cleaned up our list
+		self._deadCount = 0
+
+		# simple particles (no callbacks, no object to hold on to) live in here, updated all at once
+		self.batch = ParticleBatch(self)
+
+		# how far off screen particles can go before they're killed
+		self.oobMargin = 100
+
+		# public events for others to subscribe to
+		# onParticleCollide is fired with (type, pos, tile) when a batched particle that collides hits a wall
+		self.events = Events(["onParticleCollide"])
+
 		# intialize pygame stuff we'll use for particles
 		self._setup_pygame()
 
@@ -64,27 +103,68 @@ class ParticleSystem:
 		"""
 
 		# load the varius kinds of particle sprites we use
-		self._images = [
-			pygame.image.load('./img/particles/space_bullet.png'),
-			pygame.image.load('./img/particles/flash.png'),
-			pygame.image.load('./img/particles/poof.png'),
-		]
+		self._images = [sharedAssetManager.load_image(path) for path in ParticleSystem.IMAGE_PATHS]
+
+		# bullets fly at every angle the player can face, so bake those rotations up front
+		sharedRotationCache.prebake(self._images[ParticleSystem.TYPES.BULLET])
 
 
-	# removes particle from our array, in theory, garabage collecting it eventually
+	# marks a particle dead so it gets removed from our list, & recycled into our pool
 	def kill_particle(self, particle):
 		"""Removes a particle from our list of particles
 
+			Particles are often killed from inside update() while we're looping over our list, so we just mark them
+			dead here, and clean up the list once the loop is done.
+
 		Args:
 			particle (Particle): the particle to remove
 		"""
 
+		# already dead, nothing to do
+		if particle.alive is False:
+			return
+
 		# see ya
-		if particle in self.particles:
-			self.particles.remove(particle)
+		particle.alive = False
+		self._deadCount += 1
+
+		# if we're not in the middle of an update, we can clean up right away
+		if self._updating is False:
+			self._remove_dead_particles()
 
 		# for debug
 		# print(f"Active Particles: {len(self.particles)}")
+
+
+	# removes all particles marked dead from our list in a single pass & puts them in our pool
+	def _remove_dead_particles(self):
+		"""Compacts our particles list, keeping the order of the survivors, and recycles the dead ones
+		"""
+
+		# nothing to do
+		if self._deadCount == 0:
+			return
+
+		# local copies for the loop
+		particles = self.particles
+		pool = self._pool
+
+		# copy survivors down to index "keep" as we go
+		keep = 0
+		for i in range(0, len(particles)):
+			particle = particles[i]
+
+			if particle.alive is True:
+				particles[keep] = particle
+				keep += 1
+
+			# recycle the dead, as long as our pool isn't full
+			elif len(pool) < self.maxPoolSize:
+				pool.append(particle)
+
+		# chop off the leftovers at the end
+		del particles[keep:]
+		self._deadCount = 0
 	
 
 	# updates all particles that are spawned
@@ -92,9 +172,35 @@ class ParticleSystem:
 		"""Basically just calls update on all the parctles spawned and in our particles[] list
 		"""
 
-		# update 'em all
+		# kills during this loop will be cleaned up after it
+		self._updating = True
+
+		# update 'em all (skipping any killed by another particle earlier in this update)
+		# NOTE: particles spawned during this loop are appended to our list & get updated this pass too
 		for particle in self.particles:
-			particle.update()
+			if particle.alive is True:
+				particle.update()
+
+		# clean up anything that was killed
+		self._updating = False
+		self._remove_dead_particles()
+
+		# update our batched particles in one go, if we have any
+		if len(self.batch) > 0:
+
+			# get the area particles are allowed to live in, once for the whole batch
+			left, top, right, bottom = self.cam.get_bounds_with_margin(self.oobMargin)
+			hits = self.batch.update(
+				self._scene.clock.get_ticks(),
+				left,
+				top,
+				right,
+				bottom,
+				self._scene.map.cast_segments)
+
+			# let everyone know about anything that hit a wall
+			for type, x, y, tile in hits:
+				self.events.onParticleCollide.fire(type, pygame.Vector2(x, y), tile)
 
 
 	# draws all our particles
@@ -106,6 +212,9 @@ class ParticleSystem:
 		for particle in self.particles:
 			particle.draw()
 
+		# then all our batched particles
+		self.batch.draw(self.cam, self._images, self._scene.mark_dirty)
+
 	
 	# spawns particles
 	def spawn_particle(self, type, pos, angle, speed,
@@ -116,6 +225,10 @@ class ParticleSystem:
 
 		"""Spawns a new particle
 
+			NOTE: dead particles are recycled, so the particle we return may be handed out again by a later
+			spawn_particle() once it dies. Only hold on to it while particle.alive is True, or save its
+			particle.id too (every spawn gets a new one) and check it still matches before touching it.
+
 		Args:
 			type (Number): the ty pe tto spawn
 			pos (Vector2): postion to spawn in
@@ -123,18 +236,14 @@ class ParticleSystem:
 			speed (Number): how quick should move per update
 
 		Returns:
-			Paricle: the newly instiated particle
+			Paricle: the newly instiated (or recycled) particle
 		"""
 
 		# get image via type
 		particleImage = self._images[type]
 
-		# spawn the particle
-		newParticle = Particle(
-			self._scene,
-			self._win,
-			self,
-			particleImage,
+		# settings for the particle, in the order both Particle() & Particle.reset() take them (after the image)
+		settings = (
 			int(pos.x),
 			int(pos.y),
 			angle,
@@ -147,8 +256,53 @@ class ParticleSystem:
 			customCollision,
 			onCollide)
 
+		# recycle a dead particle if we have one, otherwise spawn a new particle
+		if len(self._pool) > 0:
+			newParticle = self._pool.pop()
+			newParticle.reset(particleImage, *settings)
+		else:
+			newParticle = Particle(self._scene, self._win, self, particleImage, *settings)
+
 		# particle exists, just add it to our list
 		self.particles.append(newParticle)
 
 		# return reference to the new particle, for extra customization
 		return newParticle
+
+
+	# spawns a simple particle in our batch
+	def spawn_batched_particle(self, type, pos, angle, speed,
+			cycleCount = 0,
+			cycleLengthInMS = 1000,
+			blendMode = 0,
+			killWhenOOB = True,
+			collides = False):
+
+		"""Spawns a new particle in our batch. These are much cheaper than spawn_particle(), but you don't get
+		   a Particle back to customize, so all the settings are picked here.
+
+		Args:
+			type (Number): the type to spawn
+			pos (Vector2): postion to spawn in
+			angle (Number): angle to move in degrees
+			speed (Number): how quick should move per update
+			cycleCount (int, optional): how many times particle should "loop" before it dies, 0 = infinite. Defaults to 0.
+			cycleLengthInMS (int, optional): cycle length in MS. Defaults to 1000.
+			blendMode (int, optional): one of pygames blend mode constants. Defaults to 0.
+			killWhenOOB (bool, optional): kill the particle when it goes off screen. Defaults to True.
+			collides (bool, optional): kill the particle when it hits a wall & fire onParticleCollide. Defaults to False.
+		"""
+
+		# add it to the batch
+		self.batch.spawn(
+			type,
+			int(pos.x),
+			int(pos.y),
+			angle,
+			speed,
+			self._scene.clock.get_ticks(),
+			cycleCount,
+			cycleLengthInMS,
+			blendMode,
+			killWhenOOB,
+			collides)
@@ -0,0 +1,590 @@
+"""
+	Pathfinding.py
+	--------------
+
+	This file/module provides a class to find routes through the map, for enemies & "show me the way out" hints.
+
+	Everything here works on the map's tile grid (see Map.tiles), where only GROUND tiles can be walked on,
+	and moves are up/down/left/right (our mazes are all right angles anyway). Positions are (x, y) tile tuples,
+	see tile_at_pixel_pos() & path_to_pixels() for going to & from world pixels.
+
+	We have three ways to find our way:
+		- A*: the classic, for one route from A to B
+		- Jump Point Search: A* that skips along straight corridors rather than adding every tile to its queue,
+		  which pays off most in open areas (in our narrow corridors it's roughly even with A*). Finds routes just as short
+		- flow fields: the distance from every tile to one goal (a "Dijkstra map"). Expensive to make,
+		  but then any number of chasers can find their next step towards the goal with a few lookups,
+		  rather than each running their own A* every frame
+
+	Routes & flow fields are cached, and when a tile changes (Map.set_tile) we only throw away (or fix up)
+	what the change actually affects.
+"""
+
+# for our least-recently-used book keeping
+from collections import OrderedDict
+
+# priority queue for A*, JPS & repairing flow fields
+import heapq
+
+# tile ids & sizes
+from Map import Map
+
+# main pathfinding class
+class Pathfinder:
+
+	# ways we can find a route, see find_path
+	METHODS = ["astar", "jps"]
+
+	# distance we give tiles that can't reach the goal, in flow fields
+	UNREACHABLE = -1
+
+	# constructor
+	def __init__(self, map, maxPaths=256, maxFlowFields=8):
+		"""Constructs the pathfinder
+
+		Args:
+			map (Map): the map to find routes on
+			maxPaths (int, optional): how many routes to keep cached. Defaults to 256.
+			maxFlowFields (int, optional): how many flow fields to keep cached (each is one int per tile). Defaults to 8.
+		"""
+
+		# save reference to our map
+		self._map = map
+
+		# save our cache sizes
+		self.maxPaths = maxPaths
+		self.maxFlowFields = maxFlowFields
+
+		# maps (method, start, goal) to a route, ordered from least to most recently used
+		self._paths = OrderedDict()
+
+		# maps goal to a list of distances, one per tile, ordered from least to most recently used
+		self._flowFields = OrderedDict()
+
+		# the grid our caches were made for, so we notice when a new map is loaded
+		self._tiles = None
+
+		# hear about tiles changing, so we can keep our caches right
+		map.events.onTileChanged.add_listener(self.handle_tile_changed)
+
+
+	# converts a world position to a tile
+	@staticmethod
+	def tile_at_pixel_pos(pos):
+		return (int(pos[0] // Map.TILE_SIZE), int(pos[1] // Map.TILE_SIZE))
+
+
+	# converts a route to world positions
+	@staticmethod
+	def path_to_pixels(path):
+		"""Converts a route in tiles to world pixel positions, in the middle of each tile
+
+		Args:
+			path (List): (x, y) tiles
+
+		Returns:
+			List: (x, y) world pixel positions
+		"""
+
+		half = Map.TILE_SIZE // 2
+		return [((x * Map.TILE_SIZE) + half, (y * Map.TILE_SIZE) + half) for x, y in path]
+
+
+	# makes sure our caches are for the map that's loaded now
+	def _get_grid(self):
+		"""Gets the map's tile grid, throwing away all our caches if it's not the one they were made for
+
+		Returns:
+			bytearray: the map's tiles
+		"""
+
+		tiles = self._map.tiles
+		if tiles is None:
+			raise ValueError("pathfinding needs a map loaded into memory")
+
+		if tiles is not self._tiles:
+			self.clear()
+			self._tiles = tiles
+
+		return tiles
+
+
+	# throws everything away
+	def clear(self):
+		"""Removes all cached routes & flow fields
+		"""
+
+		self._paths.clear()
+		self._flowFields.clear()
+
+
+	# public method to find a route
+	def find_path(self, start, goal, method="jps"):
+		"""Finds the shortest route between two tiles
+
+		Args:
+			start (Tuple): (x, y) tile to start from
+			goal (Tuple): (x, y) tile to get to
+			method (str, optional): one of METHODS. Defaults to "jps".
+
+		Returns:
+			List|None: every (x, y) tile along the way, including start & goal, or None if there's no way there
+		"""
+
+		if method not in Pathfinder.METHODS:
+			raise ValueError(f"unknown pathfinding method {method}, expected one of {Pathfinder.METHODS}")
+
+		tiles = self._get_grid()
+		start = (int(start[0]), int(start[1]))
+		goal = (int(goal[0]), int(goal[1]))
+
+		# already know this one
+		key = (method, start, goal)
+		if key in self._paths:
+			self._paths.move_to_end(key)
+			return self._paths[key]
+
+		if method == "jps":
+			path = self._jps(tiles, start, goal)
+		else:
+			path = self._astar(tiles, start, goal)
+
+		self._paths[key] = path
+		if len(self._paths) > self.maxPaths:
+			self._paths.popitem(last=False)
+
+		return path
+
+
+	# plain A*
+	def _astar(self, tiles, start, goal):
+		"""A* search over the tile grid, with manhattan distance as our heuristic
+
+		Args:
+			tiles (bytearray): the map's tiles
+			start (Tuple): (x, y) tile to start from
+			goal (Tuple): (x, y) tile to get to
+
+		Returns:
+			List|None: the route, or None
+		"""
+
+		mapW = self._map.width_in_tiles
+		mapH = self._map.height_in_tiles
+		GROUND = Map.GROUND
+
+		if not self._walkable(tiles, start[0], start[1]) or not self._walkable(tiles, goal[0], goal[1]):
+			return None
+
+		# we work with tile indices, rather than tuples, in here
+		startIndex = start[1] * mapW + start[0]
+		goalIndex = goal[1] * mapW + goal[0]
+		goalX, goalY = goal
+
+		# cost so far & where we came from, for every tile we've reached
+		costs = {startIndex: 0}
+		cameFrom = {startIndex: None}
+
+		# (estimated total cost, cost so far, tile index)
+		open = [(abs(goalX - start[0]) + abs(goalY - start[1]), 0, startIndex)]
+
+		while open:
+			estimate, cost, index = heapq.heappop(open)
+
+			if index == goalIndex:
+				return self._rebuild_path(cameFrom, goalIndex, mapW)
+
+			# an out of date entry, we found a cheaper way here since it was pushed
+			if cost > costs[index]:
+				continue
+
+			x = index % mapW
+			y = index // mapW
+			nextCost = cost + 1
+
+			for neighbourX, neighbourY in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+
+				if neighbourX < 0 or neighbourX >= mapW or neighbourY < 0 or neighbourY >= mapH:
+					continue
+
+				neighbour = neighbourY * mapW + neighbourX
+				if tiles[neighbour] != GROUND:
+					continue
+
+				if nextCost < costs.get(neighbour, nextCost + 1):
+					costs[neighbour] = nextCost
+					cameFrom[neighbour] = index
+					heuristic = abs(goalX - neighbourX) + abs(goalY - neighbourY)
+					heapq.heappush(open, (nextCost + heuristic, nextCost, neighbour))
+
+		# ran out of places to look
+		return None
+
+
+	# jump point search
+	def _jps(self, tiles, start, goal):
+		"""Jump Point Search (the up/down/left/right only variant) over the tile grid.
+
+			Rather than pushing every tile onto the open list like A*, we "jump" in a straight line until something
+			interesting happens (the goal, or an opening to the side that we couldn't have reached any quicker
+			another way), and only push those jump points. Routes are then filled back in between jump points.
+
+		Args:
+			tiles (bytearray): the map's tiles
+			start (Tuple): (x, y) tile to start from
+			goal (Tuple): (x, y) tile to get to
+
+		Returns:
+			List|None: the route, or None
+		"""
+
+		mapW = self._map.width_in_tiles
+		mapH = self._map.height_in_tiles
+		GROUND = Map.GROUND
+		goalX, goalY = goal
+
+		def walkable(x, y):
+			return 0 <= x < mapW and 0 <= y < mapH and tiles[y * mapW + x] == GROUND
+
+		# follows a direction from x, y until we find a jump point, or hit a wall
+		def jump(x, y, dx, dy):
+			while True:
+				if not walkable(x, y):
+					return None
+
+				if x == goalX and y == goalY:
+					return (x, y)
+
+				if dx != 0:
+
+					# an opening above or below, that wasn't open on the tile we came from
+					if (walkable(x, y - 1) and not walkable(x - dx, y - 1)) or (walkable(x, y + 1) and not walkable(x - dx, y + 1)):
+						return (x, y)
+
+				else:
+
+					# same, to the left or right
+					if (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or (walkable(x + 1, y) and not walkable(x + 1, y - dy)):
+						return (x, y)
+
+					# when moving vertically, a jump point off to either side makes this one too
+					if jump(x + 1, y, 1, 0) is not None or jump(x - 1, y, -1, 0) is not None:
+						return (x, y)
+
+				x += dx
+				y += dy
+
+		if not walkable(start[0], start[1]) or not walkable(goalX, goalY):
+			return None
+
+		# cost so far & the jump point we came from, for every jump point we've reached
+		costs = {start: 0}
+		cameFrom = {start: None}
+
+		# (estimated total cost, cost so far, jump point)
+		open = [(abs(goalX - start[0]) + abs(goalY - start[1]), 0, start)]
+
+		while open:
+			estimate, cost, point = heapq.heappop(open)
+
+			if point == goal:
+				return self._fill_in_jumps(cameFrom, goal)
+
+			if cost > costs[point]:
+				continue
+
+			x, y = point
+			parent = cameFrom[point]
+
+			# work out which directions are worth trying from here
+			if parent is None:
+				directions = ((-1, 0), (1, 0), (0, -1), (0, 1))
+			else:
+				dx = (x > parent[0]) - (x < parent[0])
+				dy = (y > parent[1]) - (y < parent[1])
+
+				# carry on the way we were going, or turn off to the sides
+				if dx != 0:
+					directions = ((dx, 0), (0, -1), (0, 1))
+				else:
+					directions = ((0, dy), (-1, 0), (1, 0))
+
+			for dx, dy in directions:
+				jumpPoint = jump(x + dx, y + dy, dx, dy)
+				if jumpPoint is None:
+					continue
+
+				# jump points are always in a straight line from us
+				nextCost = cost + abs(jumpPoint[0] - x) + abs(jumpPoint[1] - y)
+				if nextCost < costs.get(jumpPoint, nextCost + 1):
+					costs[jumpPoint] = nextCost
+					cameFrom[jumpPoint] = point
+					heuristic = abs(goalX - jumpPoint[0]) + abs(goalY - jumpPoint[1])
+					heapq.heappush(open, (nextCost + heuristic, nextCost, jumpPoint))
+
+		return None
+
+
+	# checks a single tile
+	def _walkable(self, tiles, x, y):
+		mapW = self._map.width_in_tiles
+		return 0 <= x < mapW and 0 <= y < self._map.height_in_tiles and tiles[y * mapW + x] == Map.GROUND
+
+
+	# follows cameFrom back from the goal, for A*
+	@staticmethod
+	def _rebuild_path(cameFrom, goalIndex, mapW):
+		path = []
+		index = goalIndex
+		while index is not None:
+			path.append((index % mapW, index // mapW))
+			index = cameFrom[index]
+		path.reverse()
+		return path
+
+
+	# follows cameFrom back from the goal for JPS, filling in the straight lines between jump points
+	@staticmethod
+	def _fill_in_jumps(cameFrom, goal):
+		path = [goal]
+		point = goal
+		while cameFrom[point] is not None:
+			parent = cameFrom[point]
+			dx = (parent[0] > point[0]) - (parent[0] < point[0])
+			dy = (parent[1] > point[1]) - (parent[1] < point[1])
+
+			x, y = point
+			while (x, y) != parent:
+				x += dx
+				y += dy
+				path.append((x, y))
+
+			point = parent
+
+		path.reverse()
+		return path
+
+
+	# public method to get the distance from every tile to a goal
+	def get_flow_field(self, goal):
+		"""Gets (making it if we need to) the flow field for a goal: how many steps every tile is from it
+
+		Args:
+			goal (Tuple): (x, y) tile everyone's heading to
+
+		Returns:
+			List: one distance per tile, row-major like Map.tiles, UNREACHABLE for tiles that can't get there
+		"""
+
+		tiles = self._get_grid()
+		goal = (int(goal[0]), int(goal[1]))
+
+		field = self._flowFields.get(goal)
+		if field is not None:
+			self._flowFields.move_to_end(goal)
+			return field
+
+		mapW = self._map.width_in_tiles
+		field = [Pathfinder.UNREACHABLE] * len(tiles)
+		if self._walkable(tiles, goal[0], goal[1]):
+			goalIndex = goal[1] * mapW + goal[0]
+			field[goalIndex] = 0
+			self._spread(tiles, field, [(0, goalIndex)])
+
+		self._flowFields[goal] = field
+		if len(self._flowFields) > self.maxFlowFields:
+			self._flowFields.popitem(last=False)
+
+		return field
+
+
+	# fills in a flow field outwards from some tiles we know the distance of
+	def _spread(self, tiles, field, frontier):
+		"""Dijkstra outwards from some tiles, lowering the distance of any tile we find a shorter way to
+
+		Args:
+			tiles (bytearray): the map's tiles
+			field (List): the flow field to fill in
+			frontier (List): (distance, tile index) pairs to spread from
+		"""
+
+		mapW = self._map.width_in_tiles
+		mapSize = len(tiles)
+		GROUND = Map.GROUND
+		UNREACHABLE = Pathfinder.UNREACHABLE
+
+		heapq.heapify(frontier)
+		while frontier:
+			distance, index = heapq.heappop(frontier)
+			if distance > field[index]:
+				continue
+
+			x = index % mapW
+			nextDistance = distance + 1
+
+			# up, down, & left/right if we're not on the edge of the map
+			for neighbour in (index - mapW, index + mapW, index - 1 if x > 0 else -1, index + 1 if x < mapW - 1 else -1):
+				if neighbour < 0 or neighbour >= mapSize or tiles[neighbour] != GROUND:
+					continue
+
+				if field[neighbour] == UNREACHABLE or nextDistance < field[neighbour]:
+					field[neighbour] = nextDistance
+					heapq.heappush(frontier, (nextDistance, neighbour))
+
+
+	# public method for chasers
+	def next_step(self, pos, goal):
+		"""Gets the next tile to step to, to get from pos to goal, using goal's flow field
+
+		Args:
+			pos (Tuple): (x, y) tile we're on
+			goal (Tuple): (x, y) tile we want to get to
+
+		Returns:
+			Tuple|None: the (x, y) tile to step to, pos itself if we're already at the goal,
+						or None if we can't get there from here
+		"""
+
+		field = self.get_flow_field(goal)
+		mapW = self._map.width_in_tiles
+		mapH = self._map.height_in_tiles
+
+		x = int(pos[0])
+		y = int(pos[1])
+		if x < 0 or x >= mapW or y < 0 or y >= mapH:
+			return None
+
+		distance = field[y * mapW + x]
+		if distance == Pathfinder.UNREACHABLE:
+			return None
+		if distance == 0:
+			return (x, y)
+
+		# any neighbour one step closer will do
+		for neighbourX, neighbourY in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+			if 0 <= neighbourX < mapW and 0 <= neighbourY < mapH and field[neighbourY * mapW + neighbourX] == distance - 1:
+				return (neighbourX, neighbourY)
+
+		return None
+
+
+	# event handler for when the map changes
+	def handle_tile_changed(self, x, y, oldTile, newTile):
+		"""Fixes up our caches when a tile changes
+
+		Args:
+			x (int): x position of the tile, in tiles
+			y (int): y position of the tile, in tiles
+			oldTile (Number): what it was
+			newTile (Number): what it is now
+		"""
+
+		# our caches are for a different grid anyway, they'll be thrown away on the next query
+		if self._map.tiles is not self._tiles:
+			return
+
+		wasWalkable = oldTile == Map.GROUND
+		isWalkable = newTile == Map.GROUND
+
+		# one kind of wall became another, nothing changes for us
+		if wasWalkable == isWalkable:
+			return
+
+		tiles = self._tiles
+		mapW = self._map.width_in_tiles
+		index = y * mapW + x
+
+		if isWalkable:
+
+			# a new opening could make any route shorter, so routes have to go...
+			self._paths.clear()
+
+			# ...but flow fields just need to spread out from the new tile, if it's next to somewhere reachable
+			# (unless it's the goal itself, which will need making from scratch)
+			self._flowFields.pop((x, y), None)
+			for field in self._flowFields.values():
+				neighbourDistances = [
+					field[neighbour]
+					for neighbour in self._neighbours(x, y)
+					if field[neighbour] != Pathfinder.UNREACHABLE
+				]
+				if len(neighbourDistances) > 0:
+					field[index] = min(neighbourDistances) + 1
+					self._spread(tiles, field, [(field[index], index)])
+
+		else:
+
+			# a new wall only breaks the routes that went through it
+			broken = [key for key, path in self._paths.items() if path is not None and (x, y) in path]
+			for key in broken:
+				del self._paths[key]
+
+			# and for flow fields, only the tiles whose shortest way to the goal went through it
+			for goal in list(self._flowFields.keys()):
+				if goal == (x, y):
+					del self._flowFields[goal]
+				else:
+					self._repair_flow_field(tiles, self._flowFields[goal], index)
+
+
+	# fixes a flow field after a tile on it became a wall
+	def _repair_flow_field(self, tiles, field, index):
+		"""Recomputes only the part of a flow field "downstream" of a tile that became a wall.
+
+			Any tile whose distance isn't counting up from the wall tile can still get to the goal
+			without going through it, so its distance is still right. The rest we forget, and then spread
+			back into from the tiles around them that we still know.
+
+		Args:
+			tiles (bytearray): the map's tiles (with the new wall already in it)
+			field (List): the flow field to fix
+			index (int): index of the tile that became a wall
+		"""
+
+		mapW = self._map.width_in_tiles
+		UNREACHABLE = Pathfinder.UNREACHABLE
+
+		# nothing went through it
+		wallDistance = field[index]
+		if wallDistance == UNREACHABLE:
+			return
+
+		# find everything counting up from the wall tile, & forget it
+		field[index] = UNREACHABLE
+		affected = [(index, wallDistance)]
+		stack = [(index, wallDistance)]
+		while stack:
+			tile, distance = stack.pop()
+			for neighbour in self._neighbours(tile % mapW, tile // mapW):
+				if field[neighbour] == distance + 1:
+					field[neighbour] = UNREACHABLE
+					affected.append((neighbour, distance + 1))
+					stack.append((neighbour, distance + 1))
+
+		# then spread back in from whatever still has a distance, next to what we forgot
+		frontier = []
+		for tile, distance in affected:
+			for neighbour in self._neighbours(tile % mapW, tile // mapW):
+				if field[neighbour] != UNREACHABLE:
+					frontier.append((field[neighbour], neighbour))
+
+		self._spread(tiles, field, frontier)
+
+
+	# gets the indices of the tiles up/down/left/right of a tile that are on the map
+	def _neighbours(self, x, y):
+		mapW = self._map.width_in_tiles
+		mapH = self._map.height_in_tiles
+		index = y * mapW + x
+
+		neighbours = []
+		if x > 0:
+			neighbours.append(index - 1)
+		if x < mapW - 1:
+			neighbours.append(index + 1)
+		if y > 0:
+			neighbours.append(index - mapW)
+		if y < mapH - 1:
+			neighbours.append(index + mapW)
+
+		return neighbours
@@ -4,10 +4,21 @@
 
 	This will be the main entrypoint to the game, to kick everything off, but otherwise,
 	not do much. Everything else will be OOP baby.
+
+	Pass --record some_file.input to save everything you press, so it can be played back later
+	(see InputSource.py & Benchmarks.py --replay).
 """
 
+# for our (tiny) command line
+import argparse
+
 # import our main class, and just insantiate it.
 from MazeGame import MazeGame
 
+parser = argparse.ArgumentParser(description="Plays MazeGame")
+parser.add_argument("--record", default=None, help="file to record your input to, for replaying later")
+parser.add_argument("--seed", type=int, default=None, help="seed for the game's randomness, random if not given")
+args = parser.parse_args()
+
 # let's-a-go
-game = MazeGame()
+game = MazeGame(recordInputPath=args.record, seed=args.seed)
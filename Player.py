@@ -25,12 +25,30 @@ from Map import Map
 # useful simple events system for others to subscribe to
 from Events import Events
 
+# the actions our input source tells us about
+from InputSource import InputSource
+
 # we gonna extend this
 from WorldEntity import WorldEntity
 
+# cached rotations for drawing our sprites
+from Util import blit_rotate_center
+from RotationCache import sharedRotationCache
+
+# shared, pre-converted images
+from AssetManager import sharedAssetManager
+
 # main player Class
 class Player(WorldEntity):
 
+	# images for the pieces of our character
+	IMAGE_PATHS = {
+		"head": './img/player/char_head.png',
+		"torso": './img/player/char_torso.png',
+		"feet": './img/player/char_lower.png',
+		"gun": './img/player/space_gun.png',
+	}
+
 	# constructor
 	def __init__(self, scene, win, initialX=0, initialY=0, initialRot=0):
 		"""Constructs our player character
@@ -60,6 +78,9 @@ class Player(WorldEntity):
 		self.ROT_SPEED_IN_DEGREES = 5
 		self.MOVE_SPEED = 4
 
+		# radius of the circle we collide with walls as
+		self.COLLISION_RADIUS = 24
+
 		# animation settings
 		self._animationWalkCycleBlend = 0
 
@@ -76,12 +97,7 @@ class Player(WorldEntity):
 		"""
 
 		# load in our player images
-		self._images =  {
-			"head": pygame.image.load('./img/player/char_head.png'),
-			"torso": pygame.image.load('./img/player/char_torso.png'),
-			"feet": pygame.image.load('./img/player/char_lower.png'),
-			"gun": pygame.image.load('./img/player/space_gun.png'),			
-		}
+		self._images = {name: sharedAssetManager.load_image(path) for name, path in Player.IMAGE_PATHS.items()}
 
 		leadOffset = 0
 
@@ -91,6 +107,9 @@ class Player(WorldEntity):
 		self._feetOffset = pygame.Vector2(39, 39 + leadOffset)
 		self._gunOffset = pygame.Vector2(19, 19 + leadOffset)
 
+		# the gun is only ever drawn at the player's rotation, so bake all its rotations up front
+		sharedRotationCache.prebake(self._images["gun"])
+
 
 	# our animation timer for walk cycle is set on (max)
 	def _enable_walk_cycle_animation(self):
@@ -147,79 +166,33 @@ class Player(WorldEntity):
 		# get radius for movement, which is direction * our movement speed constant
 		movementRadius = direction * self.MOVE_SPEED
 
-		# make vector 2 with new heading
-		newPosComponent = pygame.Vector2(math.sin(rotInRadians) * movementRadius, math.cos(rotInRadians) * movementRadius)
-
-		# add to our position and get temporary new position
-		newPos = self.pos - newPosComponent
+		# how far we're moving on each axis (forward is towards -sin/-cos of our rotation)
+		moveX = -math.sin(rotInRadians) * movementRadius
+		moveY = -math.cos(rotInRadians) * movementRadius
 
-		# collision check pos
-		self.pos = self._check_wall_collision(self.pos, newPos)
-
-		# print(self.pos)
+		# move & collide
+		self._move_and_collide(moveX, moveY)
 
 	
-	# checks cardinal directions around player to see if he touched a wall and revert old coodinate if so
-	def _check_wall_collision(self, oldPos, newPos):
-		"""Checks if player collided with a wall tile. This collision will be separate from enemey / particles, etc
+	# moves us, sliding along (and never through) walls
+	def _move_and_collide(self, moveX, moveY):
+		"""Moves the player by some amount, pushing them back out of any walls they touch
+		   (see Map.move_circle, which sub-steps long moves so we can't go through walls).
 
 		Args:
-			oldPos (Vector2): original position of player before we attempted to move
-			newPos (Vector2): the new position we're attempting to move into
-
-		Returns:
-			Vector2: the position after adjusted for potential collisions with walls
+			moveX (Number): how far to move on x, in world pixels
+			moveY (Number): how far to move on y, in world pixels
 		"""
 
-		# get temporary local reference to map for easier readability
-		map = self._scene.map
-
-		# we will use px and py as "push x" and "push y"
-		# we wll push by the delta, but if delta is 0 we'll use a constant
-		# the reason we do this:
-		# if we use the delta in movement, we'll just push the player back to where they started,
-		# which will visually look like a perfect collision.
-		# however, if the delta is 0, the collider can get stuck in the wall and wont "push" the player out
-		# so instead we'll used a hard coded value incase no delta. This will push the player out, opposite
-		# the direction of the collision point
-		dx = abs(int(newPos.x) - int(oldPos.x))
-		dy = abs(int(newPos.y) - int(oldPos.y))
-		px = dx if (dx!=0) else 10
-		py = dy if (dy!=0) else 10
-
-		# radius to use for collision around the player
-		colisionRadius = 24
-
-		# if either of these are not ground, reset x pos
-
-		# check just a bit left of the player	
-		left = newPos + pygame.Vector2(-colisionRadius, 0)
-		if map.get_tile_at_pixel_pos(left) != Map.GROUND:
-			self.colPoints.append(left.copy())
-			newPos.x += px
-
-		# check just right of the player
-		right = newPos + pygame.Vector2( colisionRadius, 0)
-		if map.get_tile_at_pixel_pos(right) != Map.GROUND:
-			self.colPoints.append(right.copy())
-			newPos.x -= px
-
-		# if either of these are not ground, reset y pos
-
-		# check just above the player
-		top = newPos + pygame.Vector2(0, -colisionRadius)
-		if map.get_tile_at_pixel_pos(top) != Map.GROUND:
-			self.colPoints.append(top.copy())
-			newPos.y += py
-
-		# check just below the player
-		bottom = newPos + pygame.Vector2(0,  colisionRadius)
-		if map.get_tile_at_pixel_pos(bottom) != Map.GROUND:
-			self.colPoints.append(bottom.copy())
-			newPos.y -= py
-
-		# return adjusted pos
-		return newPos
+		# work in plain numbers, & only touch our Vector2 once at the end
+		x, y, hitWall = self._scene.map.move_circle(
+			self.pos.x, self.pos.y, moveX, moveY, self.COLLISION_RADIUS, self.colPoints)
+
+		self.pos.update(x, y)
+
+		# let anyone who cares know we bumped into something
+		if hitWall is True:
+			self.events.onHitWall.fire(self)
 
 
 	# strafe, like move but p e r p e n d i c u l a r
@@ -248,43 +221,43 @@ class Player(WorldEntity):
 		"""Checks input relevant to player
 		"""
 
-		# while it's true we're passed in keydown events, we only care about that for firing
-		# we'll use the active keys for rotation and movement
-		activeKeys = pygame.key.get_pressed()
+		# rather than reading keys, we ask our game's input source which actions are held
+		# (the keyboard when playing, or a recording when replaying, see InputSource.py)
+		input = self._scene.input
 
 		# if shift is not held, we rotate (as opposed to strafe)
-		if activeKeys[pygame.K_LSHIFT] is False and activeKeys[pygame.K_RSHIFT] is False:
+		if not input.is_down(InputSource.STRAFE):
 
 			# left/a is rotate left:
-			if activeKeys[pygame.K_LEFT] or activeKeys[pygame.K_a]:
+			if input.is_down(InputSource.LEFT):
 				self.rotate(1)
 
 			# right/d is rotate right:
-			if activeKeys[pygame.K_RIGHT] or activeKeys[pygame.K_d]:
+			if input.is_down(InputSource.RIGHT):
 				self.rotate(-1)
 
 		# otherwise, one of the shifts was held, so maybe strafe instead:
 		else:
 
 			# left/a is strafe left:
-			if activeKeys[pygame.K_LEFT] or activeKeys[pygame.K_a]:
+			if input.is_down(InputSource.LEFT):
 				self.strafe(1)
 
 			# right/d is strafe right:
-			if activeKeys[pygame.K_RIGHT] or activeKeys[pygame.K_d]:
+			if input.is_down(InputSource.RIGHT):
 				self.strafe(-1)
 			
 
 		# up/w is walk forward
-		if activeKeys[pygame.K_UP] or activeKeys[pygame.K_w]:
+		if input.is_down(InputSource.UP):
 			self.move(1)
 
 		# down/s is walk backward
-		if activeKeys[pygame.K_DOWN] or activeKeys[pygame.K_s]:
+		if input.is_down(InputSource.DOWN):
 			self.move(-1)
 
 		# space is fire / auto fire
-		if activeKeys[pygame.K_SPACE]:
+		if input.is_down(InputSource.FIRE):
 
 			# fire if molulo is 0:
 			if (self._autoFireTimer % self._autoFireRate) == 0:
@@ -297,27 +270,30 @@ class Player(WorldEntity):
 		else:
 			self._autoFireTimer = 0
 
+		# always decrease this over time, till we hit 0
+		# (here rather than in draw(), so our animation, & so where our gun is, doesn't depend on being drawn)
+		if self._animationWalkCycleBlend > 0:
+			self._animationWalkCycleBlend -= 1
+
 
 
 	# copied from SO, easy rotate on center script	
-	def blit_rotate_center(self, surface, image, topleft, angle):
-		"""Rotates pygame image surface on center
+	def blit_rotate_center(self, surface, image, topleft, angle, scale=1.0):
+		"""Rotates pygame image surface on center. Just a wrapper for Util.blit_rotate_center (& its rotation cache)
 
 		Args:
 			surface (Surface): target pygame surface
 			image (Surface): source pygame surface image
 			topleft (Tuple): top left pos tuple
 			angle (Number): rotation angle
-		"""
-
-		# rotate the images
-		rotated_image = pygame.transform.rotate(image, angle)
-		new_rect = rotated_image.get_rect(center = image.get_rect(topleft = topleft).center)
+			scale (Number, optional): scale to apply to image before rotating. Defaults to 1.0.
 
-		# new_new_rect = (new_rect[0] - (rotated_image.get_width()//2), new_rect[1] - (rotated_image.get_height()//2))
+		Returns:
+			Rect: the area of the surface that was drawn to
+		"""
 
-		# copy rotated image to surface
-		surface.blit(rotated_image, new_rect)
+		# rotate the images (cached)
+		return blit_rotate_center(surface, image, topleft, angle, scale)
 
 
 	# debug function to show collisions as red dots
@@ -328,23 +304,19 @@ class Player(WorldEntity):
 		# loop over our list of colision point vectors & draw 'em on screen as red circles
 		for colPoint in self.colPoints:
 			sp = self._scene.camera.get_screen_pos(colPoint)
-			pygame.draw.circle(self._win, (255,0,0), (int(sp[0]), int(sp[1])), 5)
+			self._scene.mark_dirty(pygame.draw.circle(self._win, (255,0,0), (int(sp[0]), int(sp[1])), 5))
 
 		# reset array of colisions till next frame
 		self.colPoints = []
 
 
-	# draws player to screen
-	def draw(self):
-		"""Draws the player's character on screen, with animations and all.
-		"""
+	# works out how our body parts are animated right now
+	def _get_animation_offsets(self):
+		"""Works out the walk cycle & breathing animation for this moment
 
-		# find where on screen we should be relative to the camera
-		screenPos = self._scene.camera.get_screen_pos(self.pos)
-		
-		# always decrease this over time, till we hit 0
-		if self._animationWalkCycleBlend > 0:
-			self._animationWalkCycleBlend -= 1
+		Returns:
+			Tuple: (feetRotOffset, torsoRotOffset, headRotOffset, torsoScalar), rotations in degrees
+		"""
 
 		# normalize walk cycle blend value
 		# this will result in a float between 1.0 and 0.0 (which decreses towards 0 over time)
@@ -352,36 +324,62 @@ class Player(WorldEntity):
 		aniWalkCycleBlendNormalised = (self._animationWalkCycleBlend/10.0)
 
 		# use the games time in miliseconds as basis for input to a sine curve eq
-		sineTime = pygame.time.get_ticks() * .01
+		sineTime = self._scene.clock.get_ticks() * .01
 
 		# calculate rotational offsets for feet, torso and head in degrees
 		feetRotOffset = math.sin(sineTime) * 10 * aniWalkCycleBlendNormalised
 		torsoRotOffset = math.sin(sineTime) * -10 * aniWalkCycleBlendNormalised
 		headRotOffset = math.cos(sineTime) * 7 * aniWalkCycleBlendNormalised +(math.sin(sineTime*0.1) * 5)
-		
+
 		# we'll also always scale the torso on a mild sine curve to imply breathing
 		torsoScalar = 1.0 + (math.sin(sineTime * 0.17) * 0.05)
-		newTorsoOffset = self._torsoOffset * torsoScalar
-		newSizeVector2 = newTorsoOffset * 2
-		imgTorsoScaled = pygame.transform.scale(self._images["torso"], newSizeVector2)
 
-		# while the gun is rotated facing the same direction as the player
-		# it also needs it's own rotated X/Y offset, so lets calculate that before we draw everying else
-		# (this is because the gun is its own sprite in the players hand, so its X/Y is the hand-pos)
+		return (feetRotOffset, torsoRotOffset, headRotOffset, torsoScalar)
+
+
+	# works out where our gun hand is, relative to us
+	def _get_gun_offset(self, torsoRotOffset, torsoScalar):
+		"""Works out the gun's offset from our position. It faces the same direction as us,
+		   but swings round with our torso
+
+		Args:
+			torsoRotOffset (Number): our torso's animated rotation, in degrees
+			torsoScalar (Number): our torso's animated scale
+
+		Returns:
+			Vector2: offset from our position to our gun hand
+		"""
+
 		gunRadius = 60 * torsoScalar
 		gunRotationFromPlayer = (self.rot + torsoRotOffset + 140) * (math.pi / 180)
-		self._gunPos = pygame.Vector2(math.sin(gunRotationFromPlayer) * gunRadius, math.cos(gunRotationFromPlayer) * gunRadius)
-		gunPos = screenPos + self._gunPos
+		return pygame.Vector2(math.sin(gunRotationFromPlayer) * gunRadius, math.cos(gunRotationFromPlayer) * gunRadius)
+
+
+	# draws player to screen
+	def draw(self):
+		"""Draws the player's character on screen, with animations and all.
+		"""
+
+		# find where on screen we should be relative to the camera
+		screenPos = self._scene.camera.get_screen_pos(self.pos)
+		
+		# how our feet, torso & head are swaying this frame
+		feetRotOffset, torsoRotOffset, headRotOffset, torsoScalar = self._get_animation_offsets()
+
+		# (the torso is drawn at twice its offset in size, so work out how much to scale the image to get there)
+		newTorsoOffset = self._torsoOffset * torsoScalar
+		torsoImageScale = (newTorsoOffset.x * 2) / self._images["torso"].get_width()
 
-		# NOTE: the above "self._gunPos" is absolute filthy.
-		# It should be refactored out into it's own method, but that's kinda complicated rn
-		# since we're gonna draw the player every frame, we'll just store it there for now
+		# the gun is its own sprite in the players hand, so its X/Y is the hand-pos
+		gunPos = screenPos + self._get_gun_offset(torsoRotOffset, torsoScalar)
 
 		# rotate bit to screen. ORDER MATTERS! bottom-to-top
-		self.blit_rotate_center(self._win, self._images["feet"], screenPos-self._feetOffset, self.rot+feetRotOffset)
-		self.blit_rotate_center(self._win, imgTorsoScaled, screenPos-newTorsoOffset, self.rot+torsoRotOffset)
-		self.blit_rotate_center(self._win, self._images["head"], screenPos-self._headOffset, self.rot+headRotOffset)
-		self.blit_rotate_center(self._win, self._images["gun"], gunPos-self._gunOffset, self.rot)
+		# (& let our scene know where we drew, for dirty rect rendering)
+		markDirty = self._scene.mark_dirty
+		markDirty(self.blit_rotate_center(self._win, self._images["feet"], screenPos-self._feetOffset, self.rot+feetRotOffset))
+		markDirty(self.blit_rotate_center(self._win, self._images["torso"], screenPos-newTorsoOffset, self.rot+torsoRotOffset, torsoImageScale))
+		markDirty(self.blit_rotate_center(self._win, self._images["head"], screenPos-self._headOffset, self.rot+headRotOffset))
+		markDirty(self.blit_rotate_center(self._win, self._images["gun"], gunPos-self._gunOffset, self.rot))
 
 		self.draw_collisions()
 
@@ -395,9 +393,9 @@ class Player(WorldEntity):
 			Vector2: the place in 2d space where the gun hand is
 		"""
 
-		# handle the first frame where _gunPos might not exist yet
-		gunPos = self._gunPos or pygame.Vector2(0, 0)
+		# worked out from scratch, the same way draw() does, so it's right even when we're never drawn (i.e. headless)
+		feetRotOffset, torsoRotOffset, headRotOffset, torsoScalar = self._get_animation_offsets()
 
 		# return place where hand should be
-		return self.pos + gunPos
+		return self.pos + self._get_gun_offset(torsoRotOffset, torsoScalar)
 		
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+	RotationCache.py
+	----------------
+
+	This file/module provides a cache for rotated (and optionally scaled) copies of images.
+
+	pygame.transform.rotate is the most expensive thing we do in a frame, and we were calling it for
+	every piece of the player and every particle, every frame.
+
+	But, most of the time we're drawing the same handful of images at the same handful of angles.
+	So instead, we round the angle to the nearest couple of degrees (which is impossible to notice)
+	and keep the rotated images around, so we only ever rotate an image at a given angle once.
+
+	To keep memory in check we keep a rough count of the bytes we're holding and throw away
+	whichever rotated image was used least recently when we go over budget.
+"""
+
+# for our least-recently-used book keeping
+from collections import OrderedDict
+
+# pygame for transforms
+import pygame
+
+# main rotation cache class
+class RotationCache:
+
+	# constructor
+	def __init__(self, angleStep=2, scaleStep=0.01, maxBytes=48 * 1024 * 1024):
+		"""Constructs the rotation cache
+
+		Args:
+			angleStep (int, optional): angles are rounded to the nearest multiple of this, in degrees. Defaults to 2.
+			scaleStep (float, optional): scales are rounded to the nearest multiple of this. Defaults to 0.01.
+			maxBytes (int, optional): rough memory budget for cached images, in bytes. Defaults to 48MB.
+		"""
+
+		# save our settings
+		self.angleStep = angleStep
+		self.scaleStep = scaleStep
+		self.maxBytes = maxBytes
+
+		# how many angle steps make a full circle
+		self._stepsPerCircle = int(round(360 / angleStep))
+
+		# maps (image, angleIndex, scaleIndex) to a rotated surface, ordered from least to most recently used
+		self._images = OrderedDict()
+
+		# rough count of how many bytes of images we're holding on to
+		self._bytes = 0
+
+
+	# throws away everything we've cached
+	def clear(self):
+		"""Removes all rotated images from the cache
+		"""
+
+		# see ya
+		self._images.clear()
+		self._bytes = 0
+
+
+	# gets a rotated & scaled copy of an image
+	def get(self, image, angle, scale=1.0):
+		"""Gets a copy of image, scaled and then rotated, with the angle and scale rounded to our steps
+
+		Args:
+			image (Surface): source pygame surface image
+			angle (Number): rotation angle in degrees
+			scale (Number, optional): how much to scale the image before rotating. Defaults to 1.0.
+
+		Returns:
+			Surface: the rotated image
+		"""
+
+		# round our angle & scale to the nearest step
+		angleIndex = int(round(angle / self.angleStep)) % self._stepsPerCircle
+		scaleIndex = int(round(scale / self.scaleStep))
+
+		# if we already have it, mark it as most recently used and return it
+		key = (image, angleIndex, scaleIndex)
+		rotated = self._images.get(key)
+		if rotated is not None:
+			self._images.move_to_end(key)
+			return rotated
+
+		# otherwise we gotta make it
+		rotated = self._transform(image, angleIndex * self.angleStep, scaleIndex * self.scaleStep)
+		self._store(key, rotated)
+
+		return rotated
+
+
+	# pre-rotates an image at every angle step, so we never pay for it mid-game
+	def prebake(self, image, scale=1.0):
+		"""Fills the cache with every rotation of an image, typically when the image is loaded
+
+		Args:
+			image (Surface): source pygame surface image
+			scale (Number, optional): scale to bake rotations at. Defaults to 1.0.
+		"""
+
+		# just ask for every angle, get() will make & store the ones we don't have yet
+		for angleIndex in range(0, self._stepsPerCircle):
+			self.get(image, angleIndex * self.angleStep, scale)
+
+
+	# does the actual scaling & rotating
+	def _transform(self, image, angle, scale):
+		"""Scales then rotates an image
+
+		Args:
+			image (Surface): source pygame surface image
+			angle (Number): rotation angle in degrees
+			scale (Number): scale factor
+
+		Returns:
+			Surface: the transformed image
+		"""
+
+		# scale first, if we need to
+		if scale != 1.0:
+			newSize = (max(1, int(round(image.get_width() * scale))), max(1, int(round(image.get_height() * scale))))
+			image = pygame.transform.scale(image, newSize)
+
+		# no need to rotate by nothing
+		if angle == 0:
+			return image
+
+		return pygame.transform.rotate(image, angle)
+
+
+	# adds an image to the cache, evicting old ones if we're over budget
+	def _store(self, key, rotated):
+		"""Adds an image to the cache, then evicts the least recently used images until we're in budget
+
+		Args:
+			key (Tuple): the cache key
+			rotated (Surface): the rotated image
+		"""
+
+		self._images[key] = rotated
+		self._bytes += RotationCache._size_in_bytes(rotated)
+
+		# always keep at least the one we just added
+		while self._bytes > self.maxBytes and len(self._images) > 1:
+			oldKey, oldImage = self._images.popitem(last=False)
+			self._bytes -= RotationCache._size_in_bytes(oldImage)
+
+
+	# roughly how much memory a surface uses
+	@staticmethod
+	def _size_in_bytes(surface):
+		return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+# one cache shared by everything that draws rotated images
+sharedRotationCache = RotationCache()
@@ -17,6 +17,9 @@
 # the Scene base class
 class Scene:
 
+	# images (& other files) this scene loads, so they can be preloaded in the background. Overloaded by child classes
+	ASSETS = []
+
 	# constructor
 	def __init__(self, game, win, name):
 		"""Builds the Scene base class
@@ -35,6 +38,30 @@ class Scene:
 		self.name = name
 
 
+	# getter to expose our game's clock, so things in our scene don't have to ask pygame what time it is
+	@property
+	def clock(self):
+		"""The clock our game runs on, either real-time or simulated
+
+		Returns:
+			GameClock|SimulatedClock: the clock to read the time from
+		"""
+
+		return self._game.clock
+
+
+	# getter to expose our game's input, so things in our scene don't have to read the keyboard themselves
+	@property
+	def input(self):
+		"""Where our game's input comes from, either the keyboard or a recording
+
+		Returns:
+			InputSource: the input source to check actions on
+		"""
+
+		return self._game.input
+
+
 	# method called when we enter this scene
 	def scene_enter(self):
 		"""Called when we enter this scene (the scene that extends this base class)
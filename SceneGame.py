@@ -21,19 +21,43 @@ from ParticleSystem import ParticleSystem
 from Camera import Camera
 from Map import Map
 from Player import Player
+from EntityRegistry import EntityRegistry
+from FieldOfView import FieldOfView
+from Minimap import Minimap
 
 # Game screen scene, extends Scene
 class GameScreen(Scene):
 
+	# everything our scene's objects load, so it can be preloaded
+	ASSETS = (
+		Map.IMAGE_PATHS
+		+ list(Player.IMAGE_PATHS.values())
+		+ ParticleSystem.IMAGE_PATHS
+		+ ['./levels/level_02/map.png']
+	)
+
 	# constructor
-	def __init__(self, game, win):
+	def __init__(self, game, win, levelPath='./levels/level_02/map.png', dirtyRects=False, fog=False, minimap=False, seed=0):
 		"""Builds GameScreen scene
 
 		Args:
 			game (MazeGame): reference to our main game isntance
 			win (Surface): pygame surface for rendering
+			levelPath (str, optional): path to the map image (or .maze level file) of the level to play. Defaults to level 02.
+			dirtyRects (bool, optional): set true to only push changed areas of the screen while the camera is still. Defaults to False.
+			fog (bool, optional): set true to hide the parts of the map we haven't explored yet. Defaults to False.
+			minimap (bool, optional): set true to show a minimap in the corner. Defaults to False.
+			seed (int, optional): seed for our own randomness (like which way poofs face), so replays of the same
+								  input look the same. Defaults to 0.
 		"""
 
+		# we'll hard code title in this file, we dont need to pass it in
+		# (we call this first, so the things we create below can get at our game's clock)
+		super().__init__(game, win, "Game Play Screen")
+
+		# our own random numbers, rather than the shared (unseeded) ones
+		self.rng = random.Random(seed)
+
 		# make our camera we'll use for moving around our world
 		self.camera = Camera(self, win)
 
@@ -46,12 +70,42 @@ class GameScreen(Scene):
 		# move camera to player:
 		self.camera.move_to(self.player.pos)
 
-		# create new map renderer & load level one map
+		# create new map renderer & load our level's map
 		self.map = Map(self, win)
-		self.map.load_map('./levels/level_02/map.png')
+		self.map.load_map(levelPath)
 
-		# we'll hard code title in this file, we dont need to pass it in
-		super().__init__(game, win, "Game Play Screen")
+		# everything else in the level (enemies, pickups, etc), updated & drawn a type at a time
+		self.entities = EntityRegistry(self, win)
+
+		# level files can say where we start, otherwise we keep our default spot
+		if len(self.map.spawns) > 0:
+			self.player.pos = pygame.Vector2(self.map.spawns[0])
+			self.camera.move_to(self.player.pos)
+
+		# fog of war, hides what we haven't seen yet (only for maps in memory, streamed ones are too big to track)
+		self.fieldOfView = None
+		if fog is True and self.map.tiles is not None:
+			self.fieldOfView = FieldOfView(self.map)
+			self.map.set_fog(self.fieldOfView)
+			self.fieldOfView.update(self.player.pos)
+
+		# overview of the map in the corner (made after the fog, so it knows what's been explored)
+		self.minimap = Minimap(self, win) if minimap is True else None
+
+		# dirty rectangle rendering: while the camera sits still, only the areas things were drawn to
+		# (this frame and last frame, to erase them) need redrawing & pushing to the display
+		self.useDirtyRects = dirtyRects
+		self.maxDirtyRects = 64
+
+		# areas drawn to this frame, and last frame. None for last frame means redraw everything
+		self._dirtyRects = []
+		self._lastDirtyRects = None
+
+		# where the camera was last frame, so we know if it moved
+		self._lastCameraPos = None
+
+		# true if this frame is being drawn in full
+		self._fullRedraw = True
 
 		# subscribe to various events we might care about
 		self.subscribe_events()
@@ -65,6 +119,13 @@ class GameScreen(Scene):
 		# player has event for firing...
 		self.player.events.onFire.add_listener(self.shoot)
 
+		# ...and our particle system has one for bullets hitting walls
+		self.particles.events.onParticleCollide.add_listener(self.handle_particle_collision)
+
+		# ...and newly explored bits of the map need drawing, even if the camera hasn't moved
+		if self.fieldOfView is not None:
+			self.fieldOfView.events.onExplored.add_listener(self.handle_explored)
+
 
 	# event handler for when player fires his gun
 	def shoot(self, player):
@@ -74,44 +135,61 @@ class GameScreen(Scene):
 			player (Player): the player that fired
 		"""
 
-		# function to handle collision with paricle
-		def handleBulletCollision(particle, collisionResults):
-
-			# kill the existing particle
-			particle.kill()
-			
-			# make new particle that auto deletes
-			newParticle = self.particles.spawn_particle(
-				ParticleSystem.TYPES.POOF,
-				particle.pos,
-				random.random()*360,
-				0)
-
-			# will auto kill after 1 second
-			newParticle.set_cycle_settings(1, 15)
-			newParticle.set_blend_mode(pygame.BLEND_ADD)
-
 		# spawns bullets that collide with walls & kill selves after collision
-		self.particles.spawn_particle(
+		# (see handle_particle_collision for what happens when they do)
+		self.particles.spawn_batched_particle(
 			ParticleSystem.TYPES.BULLET,
 			self.player.handPos,
-			self.player.rot, 
+			self.player.rot,
 			20,
-			None, 
-			None,
-			lambda p : None if self.map.get_tile_at_pixel_pos(p.pos) == Map.GROUND else True,
-			handleBulletCollision
-			)
-
-		# also spawn a flash around our gun
-		flash = self.particles.spawn_particle(
+			0,
+			1000,
+			0,
+			True,
+			True)
+
+		# also spawn a flash around our gun, that auto deletes after 1 cycle
+		self.particles.spawn_batched_particle(
 			ParticleSystem.TYPES.FLASH,
 			self.player.handPos,
 			0,
-			0)
-		flash.set_cycle_settings(1,  15)
-		flash.set_blend_mode(pygame.BLEND_ADD)
-		
+			0,
+			1,
+			15,
+			pygame.BLEND_ADD)
+
+
+	# event handler for when a batched particle hits a wall
+	def handle_particle_collision(self, type, pos, tile):
+		"""Handle event when a particle (i.e. a bullet) hits a wall
+
+		Args:
+			type (Number): the ParticleSystem.TYPES type of particle that hit
+			pos (Vector2): where it hit
+			tile (Number): the Map tile it hit
+		"""
+
+		# make new particle that auto deletes after 1 cycle
+		self.particles.spawn_batched_particle(
+			ParticleSystem.TYPES.POOF,
+			pos,
+			self.rng.random()*360,
+			0,
+			1,
+			15,
+			pygame.BLEND_ADD)
+
+
+	# event handler for when we see more of the map
+	def handle_explored(self, indices):
+		"""Handle event when fog of war reveals new tiles
+
+		Args:
+			indices (List): the tile indices that were revealed
+		"""
+
+		# the map's chunks have changed under us, so redraw the whole thing next frame
+		self._lastDirtyRects = None
 
 
 	# method called when we enter this scene
@@ -122,6 +200,9 @@ class GameScreen(Scene):
 		# do super stuffs, if any
 		super().scene_enter()
 
+		# whatever was on screen before belonged to another scene, so start with a full redraw
+		self._lastDirtyRects = None
+
 		# for debug and whatnot
 		print(f"Doing game play screen business...")
 
@@ -151,12 +232,27 @@ class GameScreen(Scene):
 		# NOTE: 2) havnt each object loop over them is stupid, will need better event dispatch later
 		recentEvents = pygame.event.get(pygame.KEYDOWN)
 
-		# update our player:
+		# read this frame's input, then update our player with it:
+		self.input.poll()
 		self.player.check_player_input()
 
+		# see what we can see from where we are now
+		if self.fieldOfView is not None:
+			self.fieldOfView.update(self.player.pos)
+
 		# update our particles
 		self.particles.update()
 
+		# keep the parts of the map around us loaded, if it's streamed
+		self.map.update()
+
+		# update everything else in the level
+		self.entities.update()
+
+		# dispatch the entity events that were queued up this frame
+		# (player & particle events aren't queued, their listeners run as soon as they fire)
+		self.entities.events.drain()
+
 		# move camera to player:
 		self.camera.move_to(self.player.pos)
 
@@ -169,18 +265,102 @@ class GameScreen(Scene):
 		# do super stuffs, if any
 		super().render()
 
-		# draw our background of the title screen
-		self._win.fill((0, 0, 0))
+		# if we can, only redraw the bits of the map that things were drawn on last frame
+		cameraPos = self.camera.pos
+		self._fullRedraw = (
+			self.useDirtyRects is False
+			or self._lastDirtyRects is None
+			or self._lastCameraPos != cameraPos)
+		self._lastCameraPos = pygame.Vector2(cameraPos)
+
+		if self._fullRedraw is True:
 
-		# draw map before player & other stuff on top
-		self.map.draw_map()
+			# draw our background
+			self._win.fill((0, 0, 0))
+
+			# draw map before player & other stuff on top
+			self.map.draw_map()
+
+		else:
+
+			# same as above, but just the areas that need erasing (& only the chunks under them)
+			for rect in self._lastDirtyRects:
+				self._win.fill((0, 0, 0), rect)
+				self.map.draw_map(rect)
+
+		# draw everything else in the level, under the player
+		self.entities.draw()
 
 		# draw our player
 		self.player.draw()
 
 		# draw our particles
 		self.particles.draw()
+
+		# draw our minimap over the top of the world
+		if self.minimap is not None:
+			self.mark_dirty(self.minimap.draw())
+
+		# draw our profiler's stats on top of everything, if it's turned on
+		profiler = self._game.profiler
+		if profiler.enabled is True and profiler.overlay is True:
+			self.mark_dirty(profiler.draw_overlay(self._win))
 				
 		# update the display
-		pygame.display.update()
+		self.present()
+
+
+	# pushes what we've rendered to the window
+	def present(self):
+		"""Updates the display with whatever we rendered this frame
+		"""
+
+		# lots of little rects are slower than one big one, so merge them if we have too many
+		if len(self._dirtyRects) > self.maxDirtyRects:
+			self._dirtyRects = [self._dirtyRects[0].unionall(self._dirtyRects)]
+
+		# push either the whole frame, or just what changed since last frame
+		if self._fullRedraw is True:
+			pygame.display.update()
+		else:
+			pygame.display.update(self._lastDirtyRects + self._dirtyRects)
+
+		# this frame's rects need erasing next frame
+		self._lastDirtyRects = self._dirtyRects
+		self._dirtyRects = []
+
+
+	# things we draw tell us where they drew, so we can only update those parts of the screen
+	def mark_dirty(self, rect):
+		"""Marks an area of the screen as drawn to this frame, for dirty rectangle rendering
+
+		Args:
+			rect (Rect|None): the area drawn to, None is ignored
+		"""
+
+		if self.useDirtyRects is True and rect is not None:
+			self._dirtyRects.append(rect)
+
+
+	# registers our hot paths with a profiler
+	def instrument(self, profiler):
+		"""Registers the methods that make up most of our frame with a FrameProfiler, so they can be timed
+
+		Args:
+			profiler (FrameProfiler): the profiler to register with
+		"""
+
+		profiler.instrument(self, "update", "GameScreen.update")
+		profiler.instrument(self.player, "check_player_input", "Player.check_player_input")
+		profiler.instrument(self.particles, "update", "ParticleSystem.update")
+		profiler.instrument(self.entities, "update", "EntityRegistry.update")
+		if self.fieldOfView is not None:
+			profiler.instrument(self.fieldOfView, "update", "FieldOfView.update")
+		profiler.instrument(self.map, "draw_map", "Map.draw_map")
+		profiler.instrument(self.player, "draw", "Player.draw")
+		profiler.instrument(self.particles, "draw", "ParticleSystem.draw")
+		profiler.instrument(self.entities, "draw", "EntityRegistry.draw")
+		if self.minimap is not None:
+			profiler.instrument(self.minimap, "draw", "Minimap.draw")
+		profiler.instrument(self, "present", "pygame.display.update")
 
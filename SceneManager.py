@@ -16,47 +16,115 @@
 # import Scene since we finna use that
 from Scene import Scene
 
+# so we can load a scene's images in the background before it's built
+from AssetManager import sharedAssetManager
+
 # the main Scene Manager class:
 class SceneManager:
 
 	# constructor:
-	def __init__(self, game):
+	def __init__(self, game, startScene=0):
 		"""Builds the SceneManager
 
 		Args:
 			game (MazeGame): reference to our main game object
+			startScene (int, optional): index of the scene to switch to as soon as it's added. Defaults to 0, the first.
 		"""
 
 		# keep reference to the game that instantiated us
 		self._game = game
 
-		# empty list of scenes we'll manager
+		# list of scenes we'll manage, entries are None for scenes that haven't been built yet
 		self._scenes = []
 
+		# list of functions that build our scenes, for scenes that are built on first use (None for ones that were added built)
+		self._factories = []
+
+		# list of the assets each scene loads, so we can preload them
+		self._assets = []
+
+		# set true to start loading the next scene's assets in the background whenever we switch scenes
+		# (our scenes mostly go in order: title, game, ending)
+		self.preloadNext = True
+
 		# our current scene, which is non until we pick one
 		self._currentScene = None
+
+		# the scene we start on, once it's added (scenes before it aren't built till they're switched to)
+		self._startScene = startScene
 	
 
 	# adds a scene for us to manage, returns the index
-	def add_scene(self, scene):
+	def add_scene(self, sceneOrFactory, assets=None):
 		"""Adds a scene to this SceneManager to manage
 
 		Args:
-			scene (Scene): the scecen to add
+			sceneOrFactory (Scene|function): the scecen to add, or a function that builds it,
+											 which won't be called until the scene is first switched to
+			assets (List, optional): paths of the assets the scene loads, for preloading. Defaults to the scene's ASSETS.
 
 		Returns:
 			Number: the index of the added scene
 		"""
 
-		# append to our list of scenes
-		self._scenes.append(scene)
+		# append to our lists of scenes
+		if isinstance(sceneOrFactory, Scene):
+			self._scenes.append(sceneOrFactory)
+			self._factories.append(None)
+		else:
+			self._scenes.append(None)
+			self._factories.append(sceneOrFactory)
 
-		# if we dont have a scene yet, add the first one we find
-		if self._currentScene is None:
-			self.switch_scene(scene)
+		# if we weren't told the assets, see if the scene (or scene class) knows
+		self._assets.append(assets if assets is not None else getattr(sceneOrFactory, "ASSETS", []))
 
 		# the new length -1 is it's index
-		return (len(self._scenes) - 1)
+		index = (len(self._scenes) - 1)
+
+		# if we dont have a scene yet, & this is the one we start on, switch to it
+		if self._currentScene is None:
+			if index == self._startScene:
+				self.switch_scene(index)
+
+		# if we're sitting on the scene just before this one, this one's probably next, so get a head start
+		elif self.preloadNext is True and index > 0 and self._scenes[index - 1] is self._currentScene:
+			self.preload_scene(index)
+
+		return index
+
+
+	# gets a scene by index, building it if it hasn't been yet
+	def get_scene(self, index):
+		"""Gets one of our scenes by index, calling its factory first if it hasn't been built yet
+
+		Args:
+			index (Number): index of the scene
+
+		Returns:
+			Scene: the scene
+		"""
+
+		# build it on first use
+		if self._scenes[index] is None:
+			self._scenes[index] = self._factories[index]()
+
+		return self._scenes[index]
+
+
+	# starts loading a scene's assets on a background thread
+	def preload_scene(self, index):
+		"""Starts decoding a scene's assets on a background thread, so building it later doesn't hitch.
+		   The scene itself is still built on the main thread, on first switch_scene().
+
+		Args:
+			index (Number): index of the scene to preload
+		"""
+
+		# out of range, or already built
+		if index < 0 or index >= len(self._scenes) or self._scenes[index] is not None:
+			return
+
+		sharedAssetManager.preload_async(self._assets[index])
 	
 
 	# lets user switch scene
@@ -71,7 +139,7 @@ class SceneManager:
 		"""
 
 		# if our arg is of type int, we'll treat it as an index and convert the var to a reference to the scene with that index
-		scene = self._scenes[sceneOrSceneIndex] if isinstance(sceneOrSceneIndex, int) else sceneOrSceneIndex
+		scene = self.get_scene(sceneOrSceneIndex) if isinstance(sceneOrSceneIndex, int) else sceneOrSceneIndex
 			
 		# if our scene is already this scene, just gtfo
 		if self._currentScene is scene:
@@ -88,6 +156,10 @@ class SceneManager:
 		# call enter method on current scene
 		self._currentScene.scene_enter()
 
+		# get a head start on whatever scene probably comes next
+		if self.preloadNext is True and scene in self._scenes:
+			self.preload_scene(self._scenes.index(scene) + 1)
+
 		# Just for fun, return the old scene incase caller wants it
 		return oldScene
 
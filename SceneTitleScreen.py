@@ -26,12 +26,18 @@ from enum import Enum
 # for dat sin curve. mmm nice
 import math
 
+# shared, pre-converted images & fonts
+from AssetManager import sharedAssetManager
+
 # Title screen scene, extends Scene
 class TitleScreen(Scene):
 
 	# static enum for title screen option integers
 	Options = Enum('Options', ["START", "QUIT"])
 
+	# our background image, so it can be preloaded
+	ASSETS = ['./img/TitleScreen_BG.png']
+
 	# constructor
 	def __init__(self, game, win):
 		"""Builds TitleScreen scene
@@ -61,7 +67,7 @@ class TitleScreen(Scene):
 
 		# well load our just the picture for the title screen here, in this scene
 		self._images = {
-			"bg": pygame.image.load('./img/TitleScreen_BG.png')
+			"bg": sharedAssetManager.load_image('./img/TitleScreen_BG.png', False)
 		}
 
 		# some reusable color tuples
@@ -70,11 +76,8 @@ class TitleScreen(Scene):
 			"green": (0, 255, 0)
 		}
 
-		# inint font support (can be called more than once)
-		pygame.font.init()
-
 		# set up our font and some rendered text
-		self._font = pygame.font.Font("./fonts/framd.ttf", self._menuTextFontSize)
+		self._font = sharedAssetManager.load_font("./fonts/framd.ttf", self._menuTextFontSize)
 
 		# make sure we render our text surfaces at least once on init, etc
 		self._render_option_text()
@@ -193,7 +196,7 @@ class TitleScreen(Scene):
 			Dictionary: a dict containing both images for rendering
 		"""
 		# use sine curve with time elapsed as theta, to get some fraction to multiply by
-		timeElapsed = pygame.time.get_ticks() * 0.01
+		timeElapsed = self.clock.get_ticks() * 0.01
 		scaleAmountFloat = 1.0 + (math.sin(timeElapsed) * 0.15)
 		if self._selectedOption==TitleScreen.Options.START:
 
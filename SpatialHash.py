@@ -0,0 +1,251 @@
+"""
+	SpatialHash.py
+	--------------
+
+	This file/module provides a class to quickly find the things near a point.
+
+	Without it, "what's near here?" means checking every thing there is, so bullets vs enemies, for instance,
+	costs bullets * enemies checks a frame.
+
+	Instead, we split the world into a grid of square cells (the same size as our map tiles by default),
+	and remember which things overlap which cells. Then a query only has to look at the things in
+	the few cells it covers.
+
+	Things are stored as circles (a position & a radius, 0 for points), and can be anything hashable:
+	WorldEntities, Particles, EntityRegistry ids, (type, slot) for ParticleBatch particles, etc.
+	If they have a .pos (like WorldEntity & Particle do), that's used when no position is given.
+
+	Moving a thing that stays in the same cells (which is most moves, since cells are big) is just a couple
+	of comparisons.
+"""
+
+# tile size, which we size our cells to
+from Map import Map
+
+# main spatial hash class
+class SpatialHash:
+
+	# constructor
+	def __init__(self, cellSize=Map.TILE_SIZE):
+		"""Constructs an empty spatial hash
+
+		Args:
+			cellSize (Number, optional): width & height of a cell, in world pixels. Defaults to Map.TILE_SIZE.
+		"""
+
+		self.cellSize = cellSize
+
+		# maps (cellX, cellY) to the set of things overlapping that cell
+		self._cells = {}
+
+		# maps thing to [x, y, radius, minCellX, minCellY, maxCellX, maxCellY]
+		self._items = {}
+
+
+	# how many things we have
+	def __len__(self):
+		return len(self._items)
+
+
+	# check if we have a thing
+	def __contains__(self, item):
+		return item in self._items
+
+
+	# forget everything
+	def clear(self):
+		"""Removes everything
+		"""
+
+		self._cells.clear()
+		self._items.clear()
+
+
+	# public method to add a thing
+	def insert(self, item, pos=None, radius=0):
+		"""Adds a thing. If it's already here, it's moved instead
+
+		Args:
+			item (Object): the thing, anything hashable
+			pos (Vector2|Tuple, optional): where it is, in world pixels. Defaults to None, to use item.pos.
+			radius (Number, optional): its size. Defaults to 0, for a point.
+		"""
+
+		if item in self._items:
+			self.move(item, pos, radius)
+			return
+
+		if pos is None:
+			pos = item.pos
+
+		x = pos[0]
+		y = pos[1]
+		cellSize = self.cellSize
+		record = [
+			x, y, radius,
+			int((x - radius) // cellSize), int((y - radius) // cellSize),
+			int((x + radius) // cellSize), int((y + radius) // cellSize),
+		]
+
+		self._items[item] = record
+		self._add_to_cells(item, record)
+
+
+	# public method to move a thing
+	def move(self, item, pos=None, radius=None):
+		"""Updates where a thing is
+
+		Args:
+			item (Object): the thing, which must have been inserted
+			pos (Vector2|Tuple, optional): where it is now. Defaults to None, to use item.pos.
+			radius (Number, optional): its new size. Defaults to None, to keep its size.
+		"""
+
+		if pos is None:
+			pos = item.pos
+
+		record = self._items[item]
+		x = pos[0]
+		y = pos[1]
+		if radius is None:
+			radius = record[2]
+
+		cellSize = self.cellSize
+		minCellX = int((x - radius) // cellSize)
+		minCellY = int((y - radius) // cellSize)
+		maxCellX = int((x + radius) // cellSize)
+		maxCellY = int((y + radius) // cellSize)
+
+		# most of the time, we're still in the same cells, so only our position changes
+		if minCellX != record[3] or minCellY != record[4] or maxCellX != record[5] or maxCellY != record[6]:
+			self._remove_from_cells(item, record)
+			record[3] = minCellX
+			record[4] = minCellY
+			record[5] = maxCellX
+			record[6] = maxCellY
+			self._add_to_cells(item, record)
+
+		record[0] = x
+		record[1] = y
+		record[2] = radius
+
+
+	# public method to remove a thing
+	def remove(self, item):
+		"""Removes a thing. Does nothing if we don't have it
+
+		Args:
+			item (Object): the thing
+		"""
+
+		record = self._items.pop(item, None)
+		if record is not None:
+			self._remove_from_cells(item, record)
+
+
+	# adds a thing to every cell its record covers
+	def _add_to_cells(self, item, record):
+		cells = self._cells
+		for cellY in range(record[4], record[6] + 1):
+			for cellX in range(record[3], record[5] + 1):
+				cell = cells.get((cellX, cellY))
+				if cell is None:
+					cell = set()
+					cells[(cellX, cellY)] = cell
+				cell.add(item)
+
+
+	# removes a thing from every cell its record covers, dropping cells that end up empty
+	def _remove_from_cells(self, item, record):
+		cells = self._cells
+		for cellY in range(record[4], record[6] + 1):
+			for cellX in range(record[3], record[5] + 1):
+				cell = cells[(cellX, cellY)]
+				cell.discard(item)
+				if len(cell) == 0:
+					del cells[(cellX, cellY)]
+
+
+	# public method to find things near a point
+	def query_radius(self, pos, radius):
+		"""Finds every thing overlapping a circle
+
+		Args:
+			pos (Vector2|Tuple): center of the circle, in world pixels
+			radius (Number): radius of the circle
+
+		Returns:
+			List: the things whose circles overlap it
+		"""
+
+		x = pos[0]
+		y = pos[1]
+		cellSize = self.cellSize
+		cells = self._cells
+		items = self._items
+
+		found = []
+		seen = set()
+		for cellY in range(int((y - radius) // cellSize), int((y + radius) // cellSize) + 1):
+			for cellX in range(int((x - radius) // cellSize), int((x + radius) // cellSize) + 1):
+
+				cell = cells.get((cellX, cellY))
+				if cell is None:
+					continue
+
+				for item in cell:
+					if item in seen:
+						continue
+					seen.add(item)
+
+					# touching if our centers are closer than our radii added up
+					record = items[item]
+					dx = record[0] - x
+					dy = record[1] - y
+					reach = radius + record[2]
+					if (dx * dx) + (dy * dy) <= reach * reach:
+						found.append(item)
+
+		return found
+
+
+	# public method to find things in a box
+	def query_aabb(self, left, top, right, bottom):
+		"""Finds every thing overlapping an axis aligned box
+
+		Args:
+			left (Number): left edge of the box, in world pixels
+			top (Number): top edge of the box
+			right (Number): right edge of the box
+			bottom (Number): bottom edge of the box
+
+		Returns:
+			List: the things whose circles overlap it
+		"""
+
+		cellSize = self.cellSize
+		cells = self._cells
+		items = self._items
+
+		found = []
+		seen = set()
+		for cellY in range(int(top // cellSize), int(bottom // cellSize) + 1):
+			for cellX in range(int(left // cellSize), int(right // cellSize) + 1):
+
+				cell = cells.get((cellX, cellY))
+				if cell is None:
+					continue
+
+				for item in cell:
+					if item in seen:
+						continue
+					seen.add(item)
+
+					# closest point in the box to the thing's center, is it within its radius?
+					record = items[item]
+					dx = record[0] - min(max(record[0], left), right)
+					dy = record[1] - min(max(record[1], top), bottom)
+					if (dx * dx) + (dy * dy) <= record[2] * record[2]:
+						found.append(item)
+
+		return found
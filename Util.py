@@ -8,6 +8,9 @@
 # imports
 import pygame
 
+# rotating images is expensive, so we share a cache of rotated images
+from RotationCache import sharedRotationCache
+
 
 # copied from:
 # https://stackoverflow.com/questions/2352181/how-to-use-a-dot-to-access-members-of-dictionary
@@ -21,44 +24,66 @@ class dotdict(dict):
 
 
 # copied from SO, easy rotate on center script	
-def blit_rotate_center(surface, image, topleft, angle):
+def blit_rotate_center(surface, image, topleft, angle, scale=1.0):
 	"""Rotates pygame image surface on center
 
+		Rotated images come from our shared RotationCache, so the angle (and scale) are rounded a little.
+
 	Args:
 		surafe (Surface): target pygame surface
 		image (Surface): source pygame surface image
-		topleft (Tuple): top left pos tuple
+		topleft (Tuple): top left pos tuple (of the image after scaling)
 		angle (Number): rotation angle
+		scale (Number, optional): scale to apply to image before rotating. Defaults to 1.0.
+
+	Returns:
+		Rect: the area of the surface that was drawn to
 	"""
 
 	# rotate the images
-	rotated_image = pygame.transform.rotate(image, angle)
-	new_rect = rotated_image.get_rect(center = image.get_rect(topleft = topleft).center)
-
-	# new_new_rect = (new_rect[0] - (rotated_image.get_width()//2), new_rect[1] - (rotated_image.get_height()//2))
+	rotated_image = sharedRotationCache.get(image, angle, scale)
+	new_rect = rotated_image.get_rect(center = _scaled_center(image, topleft, scale))
 
 	# copy rotated image to surface
-	surface.blit(rotated_image, new_rect)
+	return surface.blit(rotated_image, new_rect)
 
 
 # copied from SO, easy rotate on center script	
 def blit_rotate_center_blend(surface, image, topleft, angle, blendMode):
 	"""Rotates pygame image surface on center
 
+		Rotated images come from our shared RotationCache, so the angle is rounded a little.
+
 	Args:
 		surafe (Surface): target pygame surface
 		image (Surface): source pygame surface image
 		topleft (Tuple): top left pos tuple
 		angle (Number): rotation angle
 		blendMode (Number): pygame blend mode constant
+
+	Returns:
+		Rect: the area of the surface that was drawn to
 	"""
 
 	# rotate the images
-	rotated_image = pygame.transform.rotate(image, angle)
-	new_rect = rotated_image.get_rect(center = image.get_rect(topleft = topleft).center)
-
-	# new_new_rect = (new_rect[0] - (rotated_image.get_width()//2), new_rect[1] - (rotated_image.get_height()//2))
+	rotated_image = sharedRotationCache.get(image, angle)
+	new_rect = rotated_image.get_rect(center = _scaled_center(image, topleft, 1.0))
 
 	# copy rotated image to surface
-	surface.blit(rotated_image, new_rect, None, blendMode)
-	
\ No newline at end of file
+	return surface.blit(rotated_image, new_rect, None, blendMode)
+
+
+# where the center of an image would be, if it were scaled & had its top left at some point
+def _scaled_center(image, topleft, scale):
+	"""Gets the center of an image with it's top left corner at topleft, after scaling
+
+	Args:
+		image (Surface): source pygame surface image
+		topleft (Tuple): top left pos tuple
+		scale (Number): scale factor
+
+	Returns:
+		Tuple: center position
+	"""
+
+	return (topleft[0] + (image.get_width() * scale) / 2, topleft[1] + (image.get_height() * scale) / 2)
@@ -0,0 +1,20 @@
+"""
+	conftest.py
+	-----------
+
+	Shared pytest set up: our modules live at the root of the repo & load assets by relative path,
+	so tests run from there, with no window (see HeadlessGame.py).
+"""
+
+import os
+import sys
+
+# the root of the repo
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# no window needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# import our modules by name, & find our assets
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
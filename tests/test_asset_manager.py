@@ -0,0 +1,66 @@
+"""
+	test_asset_manager.py
+	---------------------
+
+	Tests that AssetManager doesn't hold on to more surfaces than it needs to.
+"""
+
+import pygame
+
+from AssetManager import AssetManager
+from Map import Map
+
+
+# something to convert for
+def setup_module():
+	pygame.display.init()
+	pygame.display.set_mode((64, 64))
+
+
+# once converted, the raw surface is let go of
+def test_raw_is_dropped_after_converting():
+	assets = AssetManager()
+	path = Map.IMAGE_PATHS[0]
+
+	image = assets.load_image(path)
+	assert len(assets._raw) == 0
+	assert assets.load_image(path) is image
+
+	# the non-alpha version can still be made, from the alpha one
+	opaque = assets.load_image(path, False)
+	assert opaque.get_size() == image.get_size()
+	assert len(assets._raw) == 0
+
+
+# unload forgets everything about an image
+def test_unload_forgets_image():
+	assets = AssetManager()
+	path = './levels/level_01/map.png'
+
+	raw = assets.load_image(path, convert=False)
+	assert len(assets._raw) == 1
+	assets.load_image(path)
+
+	assets.unload(path)
+	assert len(assets._raw) == 0
+	assert len(assets._converted) == 0
+
+	# & it can be loaded again afterwards
+	assert assets.load_image(path, convert=False).get_size() == raw.get_size()
+
+
+# preloading something already loaded & converted doesn't read it from disk again
+def test_preload_skips_converted(monkeypatch):
+	assets = AssetManager()
+	path = Map.IMAGE_PATHS[0]
+	image = assets.load_image(path)
+
+	reads = []
+	load = pygame.image.load
+	monkeypatch.setattr(pygame.image, "load", lambda path: reads.append(path) or load(path))
+
+	assets.preload_async([path]).join()
+
+	assert reads == []
+	assert len(assets._raw) == 0
+	assert assets.load_image(path) is image
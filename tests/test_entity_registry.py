@@ -0,0 +1,49 @@
+"""
+	test_entity_registry.py
+	-----------------------
+
+	Tests EntityRegistry's systems against a real level.
+"""
+
+from HeadlessGame import HeadlessMazeGame
+from EntityRegistry import Entity
+from Map import Map
+
+
+# something fast, that stops when it hits a wall
+class Dart(Entity):
+	RADIUS = 16
+
+
+# an entity moving further than a wall is thick in one frame still stops at the wall
+def test_fast_entities_do_not_tunnel():
+	game = HeadlessMazeGame("./levels/level_01/map.png")
+	scene = game.scene
+	tileAt = scene.map.get_tile_at_map_pos
+
+	# along the player's row, find ground with a wall below it & ground again on the far side
+	tileY = int(scene.player.pos.y // Map.TILE_SIZE)
+	for tileX in range(0, scene.map._mapW):
+		below = [tileAt((tileX, y)) for y in range(tileY, tileY + 4)]
+		if below == [Map.GROUND, Map.WALL, Map.WALL, Map.GROUND]:
+			break
+	else:
+		assert False, "no wall to test against"
+
+	x = (tileX + 0.5) * Map.TILE_SIZE
+	y = (tileY + 0.5) * Map.TILE_SIZE
+	wallTop = (tileY + 1) * Map.TILE_SIZE
+
+	# heading down (180 degrees), fast enough to land in the middle of the far side's ground in a single frame
+	hits = []
+	scene.entities.events.onEntityHitWall.add_listener(lambda entityType, id: hits.append(id))
+	id = scene.entities.spawn(Dart, (x, y), 180, 3 * Map.TILE_SIZE)
+
+	scene.entities.update()
+	scene.entities.events.drain()
+
+	group, index = scene.entities.find(id)
+	assert group.ys[index] <= wallTop - Dart.RADIUS + 0.001
+	assert hits == [id]
+	assert (group.dxs[index], group.dys[index]) == (0, 0)
+	game.close()
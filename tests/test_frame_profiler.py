@@ -0,0 +1,58 @@
+"""
+	test_frame_profiler.py
+	----------------------
+
+	Tests FrameProfiler's on screen overlay.
+"""
+
+import time
+
+import pygame
+
+from FrameProfiler import FrameProfiler
+
+
+# a profiler with a few frames of samples
+def make_profiler():
+	pygame.init()
+	profiler = FrameProfiler()
+	profiler.enable()
+	for i in range(0, 5):
+		profiler.begin_frame()
+		profiler.end_frame()
+	return profiler
+
+
+# the table is only re-rendered every overlayRefreshInMS
+def test_overlay_is_cached_between_refreshes():
+	profiler = make_profiler()
+	surface = pygame.Surface((640, 480))
+
+	profiler.overlayRefreshInMS = 60 * 1000
+	assert profiler.draw_overlay(surface) is not None
+	table = profiler._overlaySurface
+	profiler.draw_overlay(surface)
+	assert profiler._overlaySurface is table
+
+	profiler.overlayRefreshInMS = 0
+	profiler.draw_overlay(surface)
+	assert profiler._overlaySurface is not table
+
+
+# drawing the overlay doesn't count towards the frame's time
+def test_overlay_time_is_left_out_of_frame():
+	profiler = make_profiler()
+	surface = pygame.Surface((640, 480))
+
+	# make drawing the overlay take a while
+	def slow_render(surface):
+		time.sleep(0.05)
+		return None
+	profiler._render_overlay = slow_render
+	profiler.overlayRefreshInMS = 0
+
+	profiler.begin_frame()
+	profiler.draw_overlay(surface)
+	profiler.end_frame()
+
+	assert profiler._samples[FrameProfiler.FRAME][-1] < 25
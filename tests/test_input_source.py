@@ -0,0 +1,67 @@
+"""
+	test_input_source.py
+	--------------------
+
+	Tests recording & playing back input (InputRecorder & InputPlayback), & that replays come out the same.
+"""
+
+from HeadlessGame import HeadlessMazeGame
+from InputSource import InputSource, InputRecorder, InputPlayback
+
+
+# turns & fires every frame
+class SpinAndFire(InputSource):
+	def _read(self):
+		return InputSource.RIGHT | InputSource.FIRE
+
+
+# records a few seconds of spinning & firing
+def record(path, seed, frames=240):
+	recorder = InputRecorder(SpinAndFire(), path, 60, seed)
+	for frame in range(0, frames):
+		recorder.poll()
+	recorder.close()
+
+
+# which way every poof faced, playing a recording back
+def replay_poofs(path):
+	playback = InputPlayback(path)
+	game = HeadlessMazeGame("./levels/level_01/map.png", targetFPS=playback.fps, inputSource=playback, seed=playback.seed)
+	particles = game.scene.particles
+
+	# the scene spawns a poof when a bullet hits, so it's the latest batched particle by the time we hear about it
+	poofs = []
+	particles.events.onParticleCollide.add_listener(lambda *hit: poofs.append(particles.batch._rots[-1]))
+
+	game.run(len(playback))
+	game.close()
+	return poofs
+
+
+# the seed survives the round trip, & old recordings without one still load
+def test_recording_keeps_seed(tmp_path):
+	path = str(tmp_path / "spin.input")
+	record(path, 1234, 10)
+
+	playback = InputPlayback(path)
+	assert (playback.fps, playback.seed, len(playback)) == (60, 1234, 10)
+
+	oldPath = str(tmp_path / "old.input")
+	with open(oldPath, "wb") as file:
+		file.write(InputRecorder.HEADER_V1.pack(InputRecorder.MAGIC, 1, 30, 2) + bytes((InputSource.FIRE, 0)))
+
+	playback = InputPlayback(oldPath)
+	assert (playback.fps, playback.seed, len(playback)) == (30, 0, 2)
+
+
+# replaying the same recording twice looks the same, down to which way the poofs face
+def test_replays_are_deterministic(tmp_path):
+	path = str(tmp_path / "spin.input")
+	record(path, 99)
+
+	first = replay_poofs(path)
+	assert len(first) > 0
+	assert replay_poofs(path) == first
+
+	record(path, 100)
+	assert replay_poofs(path) != first
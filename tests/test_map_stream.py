@@ -0,0 +1,27 @@
+"""
+	test_map_stream.py
+	------------------
+
+	Tests TileStream's least-recently-used chunk cache.
+"""
+
+from MapStream import TileStream
+
+
+# reading a tile from a chunk keeps it from being thrown away next
+def test_hits_refresh_recency(tmp_path):
+	path = str(tmp_path / "tiles.bin")
+	width = 32
+	height = 8
+	TileStream.save(path, bytes(range(0, width * height)))
+
+	stream = TileStream(path, width, height, chunkSizeInTiles=8, maxChunks=2)
+	assert stream.get_tile(0, 0) == 0
+	assert stream.get_tile(8, 0) == 8
+
+	# touch the first chunk again, then page in a third, which should evict the second, not the first
+	assert stream.get_tile(1, 0) == 1
+	assert stream.get_tile(16, 0) == 16
+	assert list(stream._chunks) == [(0, 0), (2, 0)]
+
+	stream.close()
@@ -0,0 +1,53 @@
+"""
+	test_maze_generator.py
+	----------------------
+
+	Tests that MazeGenerator makes perfect mazes (every cell reachable, no loops), the same for the same seed.
+"""
+
+import pytest
+
+from MazeGenerator import MazeGenerator
+
+
+# counts the cells reachable from the first one, & the walls knocked down between cells
+def walk_maze(generator):
+	units = generator._units
+	unitW = generator._unitW
+
+	seen = {unitW + 1}
+	todo = [unitW + 1]
+	while len(todo) > 0:
+		unit = todo.pop()
+		for offset in (-1, 1, -unitW, unitW):
+
+			# the entrance & exit lead out of the grid, so stay inside it
+			neighbour = unit + (offset * 2)
+			if 0 <= neighbour < len(units) and units[unit + offset] == 0 and neighbour not in seen:
+				seen.add(neighbour)
+				todo.append(neighbour)
+
+	# open units that aren't cells, less the entrance & exit
+	passages = units.count(0) - (generator.width * generator.height) - 2
+	return len(seen), passages
+
+
+# every cell is reachable, & a cells - 1 passages means there are no loops
+@pytest.mark.parametrize("algorithm", MazeGenerator.ALGORITHMS)
+@pytest.mark.parametrize("size", [(1, 1), (1, 7), (9, 1), (23, 17)])
+def test_mazes_are_perfect(algorithm, size):
+	for seed in range(0, 5):
+		generator = MazeGenerator(size[0], size[1], seed)
+		generator.generate(algorithm)
+
+		cells, passages = walk_maze(generator)
+		assert cells == size[0] * size[1]
+		assert passages == cells - 1
+
+
+# the same seed always makes the same maze
+@pytest.mark.parametrize("algorithm", MazeGenerator.ALGORITHMS)
+def test_mazes_are_seeded(algorithm):
+	first = MazeGenerator(31, 19, 7).generate(algorithm)
+	assert MazeGenerator(31, 19, 7).generate(algorithm) == first
+	assert MazeGenerator(31, 19, 8).generate(algorithm) != first
@@ -0,0 +1,63 @@
+"""
+	test_minimap.py
+	---------------
+
+	Tests that the Minimap keeps up when the map or its fog of war change after it was made.
+"""
+
+from HeadlessGame import HeadlessMazeGame
+from FieldOfView import FieldOfView
+from Minimap import Minimap
+from Map import Map
+
+
+# the color the minimap has a tile as
+def minimap_color(minimap, x, y):
+	return tuple(minimap._base.get_at((x, y)))[:3]
+
+
+# loading another level re-renders the minimap from it
+def test_rebuilds_on_map_load():
+	game = HeadlessMazeGame("./levels/level_01/map.png", minimap=True)
+	map = game.scene.map
+	minimap = game.scene.minimap
+	assert minimap._base.get_size() == (map.width_in_tiles, map.height_in_tiles)
+
+	map.load_map("./levels/level_02/map.png")
+	minimap.draw()
+
+	assert minimap._base.get_size() == (map.width_in_tiles, map.height_in_tiles)
+	for (x, y) in [(0, 0), (map.width_in_tiles // 2, map.height_in_tiles // 2)]:
+		assert minimap_color(minimap, x, y) == Minimap.COLORS[map.get_tile_at_map_pos((x, y))]
+	game.close()
+
+
+# turning fog on afterwards hides the unexplored map, & exploring shows it again
+def test_follows_fog_set_later():
+	game = HeadlessMazeGame("./levels/level_01/map.png", minimap=True)
+	scene = game.scene
+	map = scene.map
+	minimap = scene.minimap
+
+	playerX = int(scene.player.pos.x // Map.TILE_SIZE)
+	playerY = int(scene.player.pos.y // Map.TILE_SIZE)
+	playerColor = Minimap.COLORS[map.get_tile_at_map_pos((playerX, playerY))]
+	assert minimap_color(minimap, playerX, playerY) == playerColor
+
+	# nothing's explored yet
+	fog = FieldOfView(map)
+	map.set_fog(fog)
+	minimap.draw()
+	assert minimap_color(minimap, playerX, playerY) == Minimap.COLORS[Map.DARK]
+
+	# the minimap hears about what's explored from the new fog
+	fog.update(scene.player.pos)
+	assert minimap_color(minimap, playerX, playerY) == playerColor
+
+	# & with fog off again, everything's back
+	map.set_fog(None)
+	minimap.draw()
+	assert minimap.handle_explored not in [listener["func"] for listener in fog.events.onExplored.listeners]
+	for (x, y) in [(0, 0), (map.width_in_tiles - 1, map.height_in_tiles - 1)]:
+		assert minimap_color(minimap, x, y) == Minimap.COLORS[map.get_tile_at_map_pos((x, y))]
+	game.close()
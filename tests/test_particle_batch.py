@@ -0,0 +1,48 @@
+"""
+	test_particle_batch.py
+	----------------------
+
+	Tests finding batched particles (like bullets) near somewhere with ParticleBatch.query_radius.
+"""
+
+from ParticleBatch import ParticleBatch
+
+
+# a few particles, standing still unless they're told to move
+def make_batch():
+	batch = ParticleBatch(None)
+	batch.spawn(1, 100, 100, 0, 0, 0)
+	batch.spawn(2, 110, 100, 0, 0, 0)
+	batch.spawn(1, 1000, 1000, 0, 0, 0)
+	return batch
+
+
+# queries give (type, slot) for each particle inside the circle
+def test_query_finds_nearby_slots():
+	batch = make_batch()
+
+	assert sorted(batch.query_radius((105, 100), 10)) == [(1, 0), (2, 1)]
+	assert batch.query_radius((1000, 1005), 5) == [(1, 2)]
+	assert batch.query_radius((500, 500), 50) == []
+
+
+# slots shuffle down as particles die & everything moves, so queries always reflect the batch as it is now
+def test_query_follows_updates():
+	batch = make_batch()
+	assert len(batch.query_radius((100, 100), 1)) == 1
+
+	# the first particle expires, the last one moves up (angle 0) by 50
+	batch._cycleCounts[0] = 1
+	batch._dys[2] = 50
+	batch.update(5000, -10000, -10000, 10000, 10000)
+
+	assert batch.query_radius((100, 100), 1) == []
+	assert batch.query_radius((110, 100), 1) == [(2, 0)]
+	assert batch.query_radius((1000, 1000), 1) == []
+	assert batch.query_radius((1000, 950), 1) == [(1, 1)]
+
+	# new particles show up straight away, & clear() empties it
+	batch.spawn(3, 100, 100, 0, 0, 0)
+	assert batch.query_radius((100, 100), 1) == [(3, 2)]
+	batch.clear()
+	assert batch.query_radius((110, 100), 1000) == []
@@ -0,0 +1,64 @@
+"""
+	test_particle_pool.py
+	---------------------
+
+	Tests ParticleSystem's recycling of dead Particles (spawn_particle & kill_particle).
+"""
+
+import pygame
+
+from HeadlessGame import HeadlessMazeGame
+from ParticleSystem import ParticleSystem
+
+
+# a game with its particle system, & nothing in it yet
+def make_particles():
+	game = HeadlessMazeGame("./levels/level_01/map.png")
+	return game.scene.particles
+
+
+# dead particles get handed back out, as brand new ones
+def test_dead_particles_are_recycled():
+	particles = make_particles()
+
+	first = particles.spawn_particle(ParticleSystem.TYPES.POOF, pygame.Vector2(10, 20), 45, 3)
+	firstId = first.id
+	first.kill()
+	assert first.alive is False
+	assert first not in particles.particles
+
+	second = particles.spawn_particle(ParticleSystem.TYPES.BULLET, pygame.Vector2(30, 40), 90, 5)
+
+	# same object, but reset, with a new id so old references can tell it's not theirs any more
+	assert second is first
+	assert second.alive is True
+	assert second.id != firstId
+	assert (second.pos.x, second.pos.y, second.rot, second.speed) == (30, 40, 90, 5)
+	assert particles.particles == [second]
+
+
+# killing while updating is deferred till the loop is done, & nothing is recycled twice
+def test_kills_during_update_recycle_once():
+	particles = make_particles()
+
+	spawned = [particles.spawn_particle(ParticleSystem.TYPES.POOF, particles._scene.player.pos + pygame.Vector2(i, 0), 0, 0) for i in range(0, 4)]
+	for particle in spawned[:2]:
+		particle._customUpdate = lambda particle, *cycle: particle.kill() or particle.kill() or False
+
+	particles.update()
+
+	assert particles.particles == spawned[2:]
+	assert len(particles._pool) == 2
+	assert len(set(map(id, particles._pool))) == 2
+
+
+# the pool doesn't grow past its limit
+def test_pool_is_capped():
+	particles = make_particles()
+	particles.maxPoolSize = 3
+
+	for particle in [particles.spawn_particle(ParticleSystem.TYPES.POOF, pygame.Vector2(0, 0), 0, 0) for i in range(0, 10)]:
+		particle.kill()
+
+	assert len(particles._pool) == 3
+	assert len(particles.particles) == 0
@@ -0,0 +1,38 @@
+"""
+	test_player.py
+	--------------
+
+	Tests Player behaviour that headless sessions (HeadlessGame.py, BatchRunner.py) rely on.
+"""
+
+from HeadlessGame import HeadlessMazeGame
+
+
+# records where every shot was fired from, over a scripted session
+def fire_positions(render):
+	game = HeadlessMazeGame("./levels/level_01/map.png", render=render)
+	player = game.scene.player
+
+	hands = []
+	player.events.onFire.add_listener(lambda player: hands.append((tuple(player.pos), tuple(player.handPos))))
+
+	def script(frameIndex, scene):
+		scene.player.rotate(2)
+		if frameIndex % 3 == 0:
+			scene.player.move(1)
+		if frameIndex % 4 == 0:
+			scene.player.fire()
+
+	game.run(120, script)
+	game.close()
+	return hands
+
+
+# bullets come out of the gun, not the middle of the player, whether or not we're drawn
+def test_hand_pos_does_not_depend_on_rendering():
+	headless = fire_positions(False)
+
+	assert len(headless) > 0
+	assert headless == fire_positions(True)
+	for pos, hand in headless:
+		assert hand != pos
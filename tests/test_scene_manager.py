@@ -0,0 +1,41 @@
+"""
+	test_scene_manager.py
+	---------------------
+
+	Tests that SceneManager only builds scenes when they're needed.
+"""
+
+from Scene import Scene
+from SceneManager import SceneManager
+
+
+# adds three scenes that remember when they're built, returns the names in build order
+def add_scenes(manager):
+	built = []
+
+	def factory(name):
+		def build():
+			built.append(name)
+			return Scene(None, None, name)
+		return build
+
+	for name in ["title", "game", "end"]:
+		manager.add_scene(factory(name), [])
+
+	return built
+
+
+# by default we start on (& only build) the first scene
+def test_builds_only_first_scene():
+	manager = SceneManager(None)
+	assert add_scenes(manager) == ["title"]
+
+
+# starting somewhere else doesn't build the scenes before it
+def test_builds_only_start_scene():
+	manager = SceneManager(None, startScene=1)
+	built = add_scenes(manager)
+	assert built == ["game"]
+
+	manager.switch_scene(0)
+	assert built == ["game", "title"]